@@ -20,6 +20,12 @@ urlpatterns = [
     path("users/", include("plasticityhub.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
     # Your stuff: custom urls includes go here
+    path("api/sessions/", include("plasticityhub.scans.urls", namespace="scans")),
+    path("api/subjects/", include("plasticityhub.subjects.urls", namespace="subjects")),
+    path(
+        "api/procedures/",
+        include("plasticityhub.procedures.urls", namespace="procedures"),
+    ),
     # ...
     # Media files
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
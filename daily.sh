@@ -7,18 +7,7 @@ cd /home/galkepler/Projects/plasticityhub
 source /home/galkepler/Projects/plasticityhub/.venv/bin/activate
 echo "Running daily.sh"
 
-## Update the database
-echo "Updating database"
-python manage.py update_database
-
-## Update the derivatives
-echo "Updating derivatives"
-python manage.py update_derivatives
-
-## populate the procedures
-## echo "Populating procedures"
-## python manage.py populate_procedures --overwrite
-
-## aggregate the parcellations
-## echo "Aggregating parcellations"
-## python manage.py aggregate_kepost_parcellations --destination /media/storage/yalab-dev/plasticityhub --metrics adc --overwrite
+## Run the whole daily pipeline in a single process: the ingest, the exports,
+## and the procedures (when QNAP_PATH is set) whose sessions or kepost outputs changed
+echo "Running the daily pipeline"
+python manage.py run_daily --destination /media/storage/yalab-dev/plasticityhub
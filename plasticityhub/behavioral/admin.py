@@ -1,3 +1,23 @@
 from django.contrib import admin
 
-# Register your models here.
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.seca import SECAMeasurement
+from plasticityhub.utils.admin import LargeTableAdmin
+
+
+@admin.register(QuestionnaireResponse)
+class QuestionnaireResponseAdmin(LargeTableAdmin):
+    list_display = ["id", "subject"]
+    list_select_related = ["subject"]
+    # exact lookups on indexed columns
+    search_fields = ["=subject__subject_id", "=subject__subject_code"]
+    raw_id_fields = ["subject"]
+
+
+@admin.register(SECAMeasurement)
+class SECAMeasurementAdmin(LargeTableAdmin):
+    list_display = ["subject", "date", "weight", "height", "bmi"]
+    list_select_related = ["subject"]
+    # exact lookups on indexed columns
+    search_fields = ["=subject__subject_id", "=subject__subject_code"]
+    raw_id_fields = ["subject"]
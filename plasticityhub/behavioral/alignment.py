@@ -0,0 +1,155 @@
+import datetime
+
+import pandas as pd
+from django.utils import timezone
+
+from plasticityhub.scans.models import Session
+
+BULK_BATCH_SIZE = 1000
+SESSION_COLUMNS = ["session_pk", "subject_pk", "timestamp"]
+EVENT_COLUMNS = ["event_pk", "subject_pk", "event_timestamp"]
+
+
+def localize(timestamps: pd.Series) -> pd.Series:
+    """
+    Make naive timestamps (e.g. parsed from a sheet) aware in the current time zone,
+    the same way the behavioral models infer their timestamps.
+
+    Parameters
+    ----------
+    timestamps : pd.Series
+        The naive timestamps.
+
+    Returns
+    -------
+    pd.Series
+        The timestamps, in UTC.
+    """
+    return (
+        pd.to_datetime(timestamps)
+        .dt.tz_localize(
+            timezone.get_current_timezone(), ambiguous="NaT", nonexistent="NaT"
+        )
+        .dt.tz_convert("UTC")
+    )
+
+
+def nearest_events(
+    sessions: pd.DataFrame,
+    events: pd.DataFrame,
+    tolerance: datetime.timedelta | None = None,
+) -> pd.DataFrame:
+    """
+    Find the event (e.g. a questionnaire response or a SECA measurement)
+    closest in time to every session of the same subject.
+
+    Parameters
+    ----------
+    sessions : pd.DataFrame
+        The sessions, with ``SESSION_COLUMNS``.
+    events : pd.DataFrame
+        The events, with ``EVENT_COLUMNS``.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its event.
+        Sessions without an event within the tolerance are left unmatched.
+
+    Returns
+    -------
+    pd.DataFrame
+        The sessions, with the ``event_pk`` and ``event_timestamp`` of their
+        nearest event (null when unmatched) and the ``delta`` between the
+        session and the event.
+    """
+    sessions = sessions.assign(
+        timestamp=pd.to_datetime(sessions["timestamp"], utc=True)
+    ).dropna(subset=["timestamp"])
+    events = events.assign(
+        event_timestamp=pd.to_datetime(events["event_timestamp"], utc=True)
+    ).dropna(subset=["event_timestamp"])
+    if events.empty:
+        nearest = sessions.assign(event_pk=None, event_timestamp=pd.NaT)
+    else:
+        nearest = pd.merge_asof(
+            sessions.sort_values("timestamp"),
+            events.astype({"subject_pk": sessions["subject_pk"].dtype}).sort_values(
+                "event_timestamp"
+            ),
+            left_on="timestamp",
+            right_on="event_timestamp",
+            by="subject_pk",
+            direction="nearest",
+            tolerance=pd.Timedelta(tolerance) if tolerance is not None else None,
+        )
+    nearest["event_timestamp"] = pd.to_datetime(nearest["event_timestamp"], utc=True)
+    nearest["delta"] = nearest["timestamp"] - nearest["event_timestamp"]
+    return nearest
+
+
+def _differs(current: pd.Series, new: pd.Series) -> pd.Series:
+    """
+    Element-wise inequality, where two nulls are equal.
+    """
+    return ~((current == new) | (current.isna() & new.isna()))
+
+
+def align_sessions(
+    events: pd.DataFrame,
+    field: str,
+    delta_field: str,
+    subject_ids,
+    tolerance: datetime.timedelta | None = None,
+) -> int:
+    """
+    Link every session of the given subjects to its nearest event
+    and store the time between them, with a single bulk update.
+
+    Parameters
+    ----------
+    events : pd.DataFrame
+        The events of the subjects, with ``EVENT_COLUMNS``.
+    field : str
+        The session's foreign key to the event (e.g. "seca_measurement").
+    delta_field : str
+        The session's duration field to store the time between the session
+        and the event in (e.g. "time_between_scan_and_seca").
+    subject_ids : Iterable[int]
+        The primary keys of the subjects whose sessions to update.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its event.
+        Sessions without an event within the tolerance are unlinked.
+
+    Returns
+    -------
+    int
+        The number of sessions that changed.
+    """
+    sessions = pd.DataFrame.from_records(
+        Session.objects.filter(
+            subject_id__in=subject_ids, timestamp__isnull=False
+        ).values_list("pk", "subject_id", "timestamp", f"{field}_id", delta_field),
+        columns=[*SESSION_COLUMNS, "current_pk", "current_delta"],
+    )
+    if sessions.empty:
+        return 0
+    nearest = nearest_events(sessions, events, tolerance)
+    changed = nearest[
+        _differs(nearest["current_pk"], nearest["event_pk"])
+        | _differs(pd.to_timedelta(nearest["current_delta"]), nearest["delta"])
+    ]
+    Session.objects.bulk_update(
+        [
+            Session(
+                pk=row.session_pk,
+                **{
+                    f"{field}_id": None if pd.isna(row.event_pk) else int(row.event_pk),
+                    delta_field: (
+                        None if pd.isna(row.delta) else row.delta.to_pytimedelta()
+                    ),
+                },
+            )
+            for row in changed.itertuples()
+        ],
+        [field, delta_field],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    return len(changed)
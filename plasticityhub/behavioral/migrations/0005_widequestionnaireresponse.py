@@ -0,0 +1,375 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0004_alter_secameasurement_subject_code"),
+        ("subjects", "0009_subject_conditions_subject_groups_subject_studies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WideQuestionnaireResponse",
+            fields=[
+                (
+                    "response",
+                    models.OneToOneField(
+                        help_text="The questionnaire response this row was built from",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="wide",
+                        serialize=False,
+                        to="behavioral.questionnaireresponse",
+                    ),
+                ),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        help_text="The timestamp of the questionnaire response",
+                        null=True,
+                    ),
+                ),
+                (
+                    "sex",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Gender" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "version",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "version" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "handedness",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "DominantHand" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "weight",
+                    models.FloatField(help_text='The "Weight (kg)" answer', null=True),
+                ),
+                (
+                    "height",
+                    models.FloatField(help_text='The "Height (cm)" answer', null=True),
+                ),
+                (
+                    "gender",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Gender Indentity" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "sexual_orientation",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Sexual Orientation" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "living_environment",
+                    models.TextField(
+                        blank=True,
+                        help_text='The "Living environment" answer',
+                        null=True,
+                    ),
+                ),
+                (
+                    "years_in_residence",
+                    models.FloatField(
+                        help_text='The "Years in Residence" answer', null=True
+                    ),
+                ),
+                (
+                    "marital_status",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Marital Status" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "relationship_duration",
+                    models.FloatField(
+                        help_text='The "Years in relationship" answer', null=True
+                    ),
+                ),
+                (
+                    "number_of_children",
+                    models.FloatField(
+                        help_text='The "Number of Children" answer', null=True
+                    ),
+                ),
+                (
+                    "number_of_siblings",
+                    models.FloatField(
+                        help_text='The "Number of Sibling" answer', null=True
+                    ),
+                ),
+                (
+                    "sibling_order",
+                    models.FloatField(
+                        help_text='The "Your Sibling Order" answer', null=True
+                    ),
+                ),
+                (
+                    "twins",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Twins" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "ethnic_identity",
+                    models.TextField(
+                        blank=True, help_text='The "EthnicalIdentity" answer', null=True
+                    ),
+                ),
+                (
+                    "political_orientation",
+                    models.TextField(
+                        blank=True,
+                        help_text='The "PoliticalOrientation" answer',
+                        null=True,
+                    ),
+                ),
+                (
+                    "religion",
+                    models.TextField(
+                        blank=True, help_text='The "Religion" answer', null=True
+                    ),
+                ),
+                (
+                    "religion_degree",
+                    models.TextField(
+                        blank=True, help_text='The "ReligionDegree" answer', null=True
+                    ),
+                ),
+                (
+                    "family_history",
+                    models.TextField(
+                        blank=True, help_text='The "FamilyHistory" answer', null=True
+                    ),
+                ),
+                (
+                    "blood_sugar",
+                    models.TextField(
+                        blank=True, help_text='The "BloodSuger" answer', null=True
+                    ),
+                ),
+                (
+                    "blood_pressure",
+                    models.TextField(
+                        blank=True, help_text='The "BloodPressure" answer', null=True
+                    ),
+                ),
+                (
+                    "thyroids",
+                    models.TextField(
+                        blank=True, help_text='The "Thyroids" answer', null=True
+                    ),
+                ),
+                (
+                    "lipids",
+                    models.TextField(
+                        blank=True, help_text='The "Lipids" answer', null=True
+                    ),
+                ),
+                (
+                    "severe_health_conditions",
+                    models.TextField(
+                        blank=True,
+                        help_text='The "SevereHealthConditions" answer',
+                        null=True,
+                    ),
+                ),
+                (
+                    "major_health_conditions",
+                    models.TextField(
+                        blank=True,
+                        help_text='The "MajorHealthConditions" answer',
+                        null=True,
+                    ),
+                ),
+                (
+                    "minor_health_conditions",
+                    models.TextField(
+                        blank=True,
+                        help_text='The "MinorHealthConditions" answer',
+                        null=True,
+                    ),
+                ),
+                (
+                    "brain_health",
+                    models.TextField(
+                        blank=True, help_text='The "BrainHealth" answer', null=True
+                    ),
+                ),
+                (
+                    "depression",
+                    models.BooleanField(help_text='The "Depression" answer', null=True),
+                ),
+                (
+                    "anxiety",
+                    models.BooleanField(help_text='The "Anxiety" answer', null=True),
+                ),
+                (
+                    "communication_disorders",
+                    models.BooleanField(
+                        help_text='The "CommunicationDisorders" answer', null=True
+                    ),
+                ),
+                (
+                    "attention_disorders",
+                    models.BooleanField(
+                        help_text='The "AttentionDisorders" answer', null=True
+                    ),
+                ),
+                (
+                    "visual_aid",
+                    models.BooleanField(help_text='The "VisualAid" answer', null=True),
+                ),
+                (
+                    "hearing_aid",
+                    models.BooleanField(help_text='The "HearingAid" answer', null=True),
+                ),
+                ("psqi", models.FloatField(help_text='The "PSQI" answer', null=True)),
+                (
+                    "long_covid",
+                    models.BooleanField(help_text='The "LongCovid" answer', null=True),
+                ),
+                ("oasis", models.FloatField(help_text='The "OASIS" answer', null=True)),
+                ("pcl5", models.FloatField(help_text='The "PCL-5" answer', null=True)),
+                ("gad7", models.FloatField(help_text='The "GAD-7" answer', null=True)),
+                ("phq9", models.FloatField(help_text='The "PHQ9" answer', null=True)),
+                (
+                    "b5_extraversion",
+                    models.FloatField(
+                        help_text='The "B5 Extraversion" answer', null=True
+                    ),
+                ),
+                (
+                    "b5_agreeableness",
+                    models.FloatField(
+                        help_text='The "B5 Agreeableness" answer', null=True
+                    ),
+                ),
+                (
+                    "b5_conscientiousness",
+                    models.FloatField(
+                        help_text='The "B5 Conscientiousness" answer', null=True
+                    ),
+                ),
+                (
+                    "b5_emotional_stability",
+                    models.FloatField(
+                        help_text='The "B5 EmotionalStability" answer', null=True
+                    ),
+                ),
+                (
+                    "b5_openness",
+                    models.FloatField(help_text='The "B5 Openness" answer', null=True),
+                ),
+                (
+                    "hli",
+                    models.FloatField(
+                        help_text='The "SubjectiveHappiness" answer', null=True
+                    ),
+                ),
+                ("swls", models.FloatField(help_text='The "SWLS" answer', null=True)),
+                (
+                    "education_level",
+                    models.CharField(
+                        blank=True,
+                        help_text='The "Education" answer',
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "salary",
+                    models.TextField(
+                        blank=True, help_text='The "Salary" answer', null=True
+                    ),
+                ),
+                (
+                    "psychometric_score",
+                    models.FloatField(
+                        help_text='The "PsychometricScore" answer', null=True
+                    ),
+                ),
+                (
+                    "main_hobby",
+                    models.TextField(
+                        blank=True, help_text='The "MainHobby" answer', null=True
+                    ),
+                ),
+                (
+                    "hobby_time",
+                    models.TextField(
+                        blank=True, help_text='The "HobbyTime" answer', null=True
+                    ),
+                ),
+                (
+                    "weekly_workouts",
+                    models.FloatField(
+                        help_text='The "TimesTrainingPerWeek" answer', null=True
+                    ),
+                ),
+                (
+                    "training_alone",
+                    models.BooleanField(
+                        help_text='The "TrainingGroup" answer', null=True
+                    ),
+                ),
+                (
+                    "caffeine",
+                    models.TextField(
+                        blank=True, help_text='The "Caffeine" answer', null=True
+                    ),
+                ),
+                (
+                    "nutrition",
+                    models.TextField(
+                        blank=True, help_text='The "Nutrition" answer', null=True
+                    ),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        help_text="The subject associated with this questionnaire response",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="wide_questionnaire_responses",
+                        to="subjects.subject",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Wide Questionnaire Response",
+                "verbose_name_plural": "Wide Questionnaire Responses",
+            },
+        ),
+    ]
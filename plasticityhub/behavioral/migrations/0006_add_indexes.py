@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:09
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0005_widequestionnaireresponse"),
+        ("subjects", "0010_add_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="questionnaireresponse",
+            index=models.Index(
+                models.F("subject"),
+                django.db.models.fields.json.KeyTextTransform(
+                    "QTimeStamp", "full_response"
+                ),
+                name="questionnaire_subject_time_idx",
+            ),
+        ),
+    ]
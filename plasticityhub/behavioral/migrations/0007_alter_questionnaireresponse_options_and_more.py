@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0006_add_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="questionnaireresponse",
+            options={
+                "base_manager_name": "objects",
+                "verbose_name": "Questionnaire Response",
+                "verbose_name_plural": "Questionnaire Responses",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="secameasurement",
+            options={
+                "base_manager_name": "objects",
+                "verbose_name": "SECA Measurement",
+                "verbose_name_plural": "SECA Measurements",
+            },
+        ),
+    ]
@@ -0,0 +1,134 @@
+import pandas as pd
+from django.db import migrations
+from django.utils import timezone
+
+BULK_BATCH_SIZE = 1000
+# a frozen copy of the questionnaire mapping (key: (column, dtype)) as of this
+# migration, so later changes to the mapping do not change what it does
+QUESTIONNAIRE_COLUMNS = {
+    "Gender": ("sex", "category"),
+    "version": ("version", "category"),
+    "DominantHand": ("handedness", "category"),
+    "Weight (kg)": ("weight", "float"),
+    "Height (cm)": ("height", "float"),
+    "Gender Indentity": ("gender", "category"),
+    "Sexual Orientation": ("sexual_orientation", "category"),
+    "Living environment": ("living_environment", "text"),
+    "Years in Residence": ("years_in_residence", "float"),
+    "Marital Status": ("marital_status", "category"),
+    "Years in relationship": ("relationship_duration", "float"),
+    "Number of Children": ("number_of_children", "float"),
+    "Number of Sibling": ("number_of_siblings", "float"),
+    "Your Sibling Order": ("sibling_order", "float"),
+    "Twins": ("twins", "category"),
+    "EthnicalIdentity": ("ethnic_identity", "text"),
+    "PoliticalOrientation": ("political_orientation", "text"),
+    "Religion": ("religion", "text"),
+    "ReligionDegree": ("religion_degree", "text"),
+    "FamilyHistory": ("family_history", "text"),
+    "BloodSuger": ("blood_sugar", "text"),
+    "BloodPressure": ("blood_pressure", "text"),
+    "Thyroids": ("thyroids", "text"),
+    "Lipids": ("lipids", "text"),
+    "SevereHealthConditions": ("severe_health_conditions", "text"),
+    "MajorHealthConditions": ("major_health_conditions", "text"),
+    "MinorHealthConditions": ("minor_health_conditions", "text"),
+    "BrainHealth": ("brain_health", "text"),
+    "Depression": ("depression", "bool"),
+    "Anxiety": ("anxiety", "bool"),
+    "CommunicationDisorders": ("communication_disorders", "bool"),
+    "AttentionDisorders": ("attention_disorders", "bool"),
+    "VisualAid": ("visual_aid", "bool"),
+    "HearingAid": ("hearing_aid", "bool"),
+    "PSQI": ("psqi", "float"),
+    "LongCovid": ("long_covid", "bool"),
+    "OASIS": ("oasis", "float"),
+    "PCL-5": ("pcl5", "float"),
+    "GAD-7": ("gad7", "float"),
+    "PHQ9": ("phq9", "float"),
+    "B5 Extraversion": ("b5_extraversion", "float"),
+    "B5 Agreeableness": ("b5_agreeableness", "float"),
+    "B5 Conscientiousness": ("b5_conscientiousness", "float"),
+    "B5 EmotionalStability": ("b5_emotional_stability", "float"),
+    "B5 Openness": ("b5_openness", "float"),
+    "SubjectiveHappiness": ("hli", "float"),
+    "SWLS": ("swls", "float"),
+    "Education": ("education_level", "category"),
+    "Salary": ("salary", "text"),
+    "PsychometricScore": ("psychometric_score", "float"),
+    "MainHobby": ("main_hobby", "text"),
+    "HobbyTime": ("hobby_time", "text"),
+    "TimesTrainingPerWeek": ("weekly_workouts", "float"),
+    "TrainingGroup": ("training_alone", "bool"),
+    "Caffeine": ("caffeine", "text"),
+    "Nutrition": ("nutrition", "text"),
+}
+BOOLEAN_VALUES = {True: True, False: False, "True": True, "False": False}
+
+
+def cast_column(values: pd.Series, dtype: str) -> pd.Series:
+    """
+    Cast a questionnaire column to the type of its wide table column.
+    """
+    if dtype == "float":
+        values = pd.to_numeric(values, errors="coerce")
+    elif dtype == "bool":
+        values = values.map(lambda value: BOOLEAN_VALUES.get(value))
+    else:
+        values = values.where(values.notna() & (values != ""))
+        values = values.map(str, na_action="ignore")
+    return values.astype(object).where(values.notna(), None)
+
+
+def build_wide_rows(responses: pd.DataFrame) -> list[dict]:
+    """
+    Build the wide table rows of questionnaire responses.
+    """
+    answers = pd.DataFrame.from_records(
+        responses["full_response"].tolist(), index=responses.index
+    ).reindex(columns=[*QUESTIONNAIRE_COLUMNS, "QTimeStamp"])
+    wide = responses[["response_id", "subject_id"]].copy()
+    timestamps = (
+        pd.to_datetime(answers["QTimeStamp"], format="%m/%d/%Y", errors="coerce")
+        .dt.tz_localize(
+            timezone.get_current_timezone(), ambiguous="NaT", nonexistent="NaT"
+        )
+        .dt.tz_convert("UTC")
+    )
+    wide["timestamp"] = timestamps.astype(object).where(timestamps.notna(), None)
+    for key, (column, dtype) in QUESTIONNAIRE_COLUMNS.items():
+        wide[column] = cast_column(answers[key], dtype)
+    return wide.to_dict("records")
+
+
+def populate_wide_responses(apps, schema_editor):
+    """
+    Build the wide rows of the questionnaire responses stored before the table existed.
+    """
+    QuestionnaireResponse = apps.get_model("behavioral", "QuestionnaireResponse")
+    WideQuestionnaireResponse = apps.get_model(
+        "behavioral", "WideQuestionnaireResponse"
+    )
+    responses = QuestionnaireResponse.objects.exclude(full_response__Questionnaire="No")
+    frame = pd.DataFrame.from_records(
+        responses.values_list("pk", "subject_id", "full_response"),
+        columns=["response_id", "subject_id", "full_response"],
+    )
+    if frame.empty:
+        return
+    WideQuestionnaireResponse.objects.all().delete()
+    WideQuestionnaireResponse.objects.bulk_create(
+        [WideQuestionnaireResponse(**row) for row in build_wide_rows(frame)],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0007_alter_questionnaireresponse_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_wide_responses, migrations.RunPython.noop),
+    ]
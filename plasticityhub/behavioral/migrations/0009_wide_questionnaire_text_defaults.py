@@ -0,0 +1,217 @@
+# Generated by Django 5.1.1 on 2026-10-19 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0008_populate_widequestionnaireresponse"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="blood_pressure",
+            field=models.TextField(
+                blank=True, default="", help_text='The "BloodPressure" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="blood_sugar",
+            field=models.TextField(
+                blank=True, default="", help_text='The "BloodSuger" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="brain_health",
+            field=models.TextField(
+                blank=True, default="", help_text='The "BrainHealth" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="caffeine",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Caffeine" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="education_level",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text='The "Education" answer',
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="ethnic_identity",
+            field=models.TextField(
+                blank=True, default="", help_text='The "EthnicalIdentity" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="family_history",
+            field=models.TextField(
+                blank=True, default="", help_text='The "FamilyHistory" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="gender",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text='The "Gender Indentity" answer',
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="handedness",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text='The "DominantHand" answer',
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="hobby_time",
+            field=models.TextField(
+                blank=True, default="", help_text='The "HobbyTime" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="lipids",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Lipids" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="living_environment",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Living environment" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="main_hobby",
+            field=models.TextField(
+                blank=True, default="", help_text='The "MainHobby" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="major_health_conditions",
+            field=models.TextField(
+                blank=True, default="", help_text='The "MajorHealthConditions" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="marital_status",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text='The "Marital Status" answer',
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="minor_health_conditions",
+            field=models.TextField(
+                blank=True, default="", help_text='The "MinorHealthConditions" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="nutrition",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Nutrition" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="political_orientation",
+            field=models.TextField(
+                blank=True, default="", help_text='The "PoliticalOrientation" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="religion",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Religion" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="religion_degree",
+            field=models.TextField(
+                blank=True, default="", help_text='The "ReligionDegree" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="salary",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Salary" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="severe_health_conditions",
+            field=models.TextField(
+                blank=True, default="", help_text='The "SevereHealthConditions" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="sex",
+            field=models.CharField(
+                blank=True, default="", help_text='The "Gender" answer', max_length=64
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="sexual_orientation",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text='The "Sexual Orientation" answer',
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="thyroids",
+            field=models.TextField(
+                blank=True, default="", help_text='The "Thyroids" answer'
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="twins",
+            field=models.CharField(
+                blank=True, default="", help_text='The "Twins" answer', max_length=64
+            ),
+        ),
+        migrations.AlterField(
+            model_name="widequestionnaireresponse",
+            name="version",
+            field=models.CharField(
+                blank=True, default="", help_text='The "version" answer', max_length=64
+            ),
+        ),
+    ]
@@ -0,0 +1 @@
+from plasticityhub.behavioral.wide import WideQuestionnaireResponse  # noqa: F401
@@ -2,8 +2,24 @@ import datetime
 
 import pandas as pd
 from django.db import models
+from django.db.models.fields.json import KT
 
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.managers import DeferredFieldsManager, DeferredFieldsQuerySet
+
+
+class QuestionnaireResponseQuerySet(DeferredFieldsQuerySet):
+    def with_full_response(self):
+        """
+        Load the full responses with the rows.
+        """
+        return self.undefer("full_response")
+
+
+class QuestionnaireResponseManager(
+    DeferredFieldsManager.from_queryset(QuestionnaireResponseQuerySet)
+):
+    deferred_fields = ["full_response"]
 
 
 class QuestionnaireResponse(models.Model):
@@ -17,12 +33,24 @@ class QuestionnaireResponse(models.Model):
         help_text="The response to the questionnaire",
     )
 
+    objects = QuestionnaireResponseManager()
+
     def __str__(self):
         return f"{self.subject} - Questionnaire"
 
     class Meta:
         verbose_name = "Questionnaire Response"
         verbose_name_plural = "Questionnaire Responses"
+        # related lookups (e.g. session.questionnaire_response) defer it too
+        base_manager_name = "objects"
+        indexes = [
+            # responses are upserted on (subject, QTimeStamp)
+            models.Index(
+                "subject",
+                KT("full_response__QTimeStamp"),
+                name="questionnaire_subject_time_idx",
+            ),
+        ]
 
     @property
     def timestamp(self):
@@ -4,6 +4,21 @@ import pandas as pd
 from django.db import models
 
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.managers import DeferredFieldsManager, DeferredFieldsQuerySet
+
+
+class SECAMeasurementQuerySet(DeferredFieldsQuerySet):
+    def with_full_measurement(self):
+        """
+        Load the full measurements with the rows.
+        """
+        return self.undefer("full_measurement")
+
+
+class SECAMeasurementManager(
+    DeferredFieldsManager.from_queryset(SECAMeasurementQuerySet)
+):
+    deferred_fields = ["full_measurement"]
 
 
 class SECAMeasurement(models.Model):
@@ -65,14 +80,27 @@ class SECAMeasurement(models.Model):
         null=True,
     )
 
+    objects = SECAMeasurementManager()
+
     def __str__(self):
         return f"{self.subject} - SECA Measurement"
 
     class Meta:
         verbose_name = "SECA Measurement"
         verbose_name_plural = "SECA Measurements"
+        # related lookups (e.g. session.seca_measurement) defer it too
+        base_manager_name = "objects"
 
     def save(self, *args, **kwargs):
+        if "full_measurement" not in self.get_deferred_fields():
+            # the derived fields only change with the full measurement
+            self.infer_fields()
+        super().save(*args, **kwargs)
+
+    def infer_fields(self):
+        """
+        Infer the derived fields from the full measurement data.
+        """
         self.timestamp = self.infer_timestamp()
         self.date = self.timestamp.date()
         self.time = self.timestamp.time()
@@ -82,7 +110,6 @@ class SECAMeasurement(models.Model):
         self.bmi = self.infer_bmi()
         self.weight = self.infer_weight()
         self.height = self.infer_height()
-        super().save(*args, **kwargs)
 
     def infer_timestamp(self) -> datetime.datetime:
         """
@@ -0,0 +1,425 @@
+import pandas as pd
+from django.db import models, transaction
+
+from plasticityhub.behavioral.alignment import localize
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.static.questionnaire_mapping import (
+    QUESTIONNAIRE_MAPPING,
+)
+
+BULK_BATCH_SIZE = 1000
+QUESTIONNAIRE_FIELDS = {
+    key: mapping["field"] for key, mapping in QUESTIONNAIRE_MAPPING.items()
+}
+BOOLEAN_VALUES = {True: True, False: False, "True": True, "False": False}
+
+
+class WideQuestionnaireResponse(models.Model):
+    """
+    A typed, one-column-per-field copy of a questionnaire response,
+    materialized from ``QUESTIONNAIRE_MAPPING`` so exports and analyses
+    can select fields with SQL instead of deserializing ``full_response``.
+    """
+
+    response = models.OneToOneField(
+        QuestionnaireResponse,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="wide",
+        help_text="The questionnaire response this row was built from",
+    )
+    subject = models.ForeignKey(
+        Subject,
+        on_delete=models.CASCADE,
+        related_name="wide_questionnaire_responses",
+        help_text="The subject associated with this questionnaire response",
+    )
+    timestamp = models.DateTimeField(
+        null=True,
+        help_text="The timestamp of the questionnaire response",
+    )
+    sex = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Gender" answer',
+    )
+    version = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "version" answer',
+    )
+    handedness = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "DominantHand" answer',
+    )
+    weight = models.FloatField(
+        null=True,
+        help_text='The "Weight (kg)" answer',
+    )
+    height = models.FloatField(
+        null=True,
+        help_text='The "Height (cm)" answer',
+    )
+    gender = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Gender Indentity" answer',
+    )
+    sexual_orientation = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Sexual Orientation" answer',
+    )
+    living_environment = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Living environment" answer',
+    )
+    years_in_residence = models.FloatField(
+        null=True,
+        help_text='The "Years in Residence" answer',
+    )
+    marital_status = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Marital Status" answer',
+    )
+    relationship_duration = models.FloatField(
+        null=True,
+        help_text='The "Years in relationship" answer',
+    )
+    number_of_children = models.FloatField(
+        null=True,
+        help_text='The "Number of Children" answer',
+    )
+    number_of_siblings = models.FloatField(
+        null=True,
+        help_text='The "Number of Sibling" answer',
+    )
+    sibling_order = models.FloatField(
+        null=True,
+        help_text='The "Your Sibling Order" answer',
+    )
+    twins = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Twins" answer',
+    )
+    ethnic_identity = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "EthnicalIdentity" answer',
+    )
+    political_orientation = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "PoliticalOrientation" answer',
+    )
+    religion = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Religion" answer',
+    )
+    religion_degree = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "ReligionDegree" answer',
+    )
+    family_history = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "FamilyHistory" answer',
+    )
+    blood_sugar = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "BloodSuger" answer',
+    )
+    blood_pressure = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "BloodPressure" answer',
+    )
+    thyroids = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Thyroids" answer',
+    )
+    lipids = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Lipids" answer',
+    )
+    severe_health_conditions = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "SevereHealthConditions" answer',
+    )
+    major_health_conditions = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "MajorHealthConditions" answer',
+    )
+    minor_health_conditions = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "MinorHealthConditions" answer',
+    )
+    brain_health = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "BrainHealth" answer',
+    )
+    depression = models.BooleanField(
+        null=True,
+        help_text='The "Depression" answer',
+    )
+    anxiety = models.BooleanField(
+        null=True,
+        help_text='The "Anxiety" answer',
+    )
+    communication_disorders = models.BooleanField(
+        null=True,
+        help_text='The "CommunicationDisorders" answer',
+    )
+    attention_disorders = models.BooleanField(
+        null=True,
+        help_text='The "AttentionDisorders" answer',
+    )
+    visual_aid = models.BooleanField(
+        null=True,
+        help_text='The "VisualAid" answer',
+    )
+    hearing_aid = models.BooleanField(
+        null=True,
+        help_text='The "HearingAid" answer',
+    )
+    psqi = models.FloatField(
+        null=True,
+        help_text='The "PSQI" answer',
+    )
+    long_covid = models.BooleanField(
+        null=True,
+        help_text='The "LongCovid" answer',
+    )
+    oasis = models.FloatField(
+        null=True,
+        help_text='The "OASIS" answer',
+    )
+    pcl5 = models.FloatField(
+        null=True,
+        help_text='The "PCL-5" answer',
+    )
+    gad7 = models.FloatField(
+        null=True,
+        help_text='The "GAD-7" answer',
+    )
+    phq9 = models.FloatField(
+        null=True,
+        help_text='The "PHQ9" answer',
+    )
+    b5_extraversion = models.FloatField(
+        null=True,
+        help_text='The "B5 Extraversion" answer',
+    )
+    b5_agreeableness = models.FloatField(
+        null=True,
+        help_text='The "B5 Agreeableness" answer',
+    )
+    b5_conscientiousness = models.FloatField(
+        null=True,
+        help_text='The "B5 Conscientiousness" answer',
+    )
+    b5_emotional_stability = models.FloatField(
+        null=True,
+        help_text='The "B5 EmotionalStability" answer',
+    )
+    b5_openness = models.FloatField(
+        null=True,
+        help_text='The "B5 Openness" answer',
+    )
+    hli = models.FloatField(
+        null=True,
+        help_text='The "SubjectiveHappiness" answer',
+    )
+    swls = models.FloatField(
+        null=True,
+        help_text='The "SWLS" answer',
+    )
+    education_level = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text='The "Education" answer',
+    )
+    salary = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Salary" answer',
+    )
+    psychometric_score = models.FloatField(
+        null=True,
+        help_text='The "PsychometricScore" answer',
+    )
+    main_hobby = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "MainHobby" answer',
+    )
+    hobby_time = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "HobbyTime" answer',
+    )
+    weekly_workouts = models.FloatField(
+        null=True,
+        help_text='The "TimesTrainingPerWeek" answer',
+    )
+    training_alone = models.BooleanField(
+        null=True,
+        help_text='The "TrainingGroup" answer',
+    )
+    caffeine = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Caffeine" answer',
+    )
+    nutrition = models.TextField(
+        blank=True,
+        default="",
+        help_text='The "Nutrition" answer',
+    )
+
+    def __str__(self):
+        return f"{self.subject} - Questionnaire (wide)"
+
+    class Meta:
+        verbose_name = "Wide Questionnaire Response"
+        verbose_name_plural = "Wide Questionnaire Responses"
+
+
+def cast_column(values: pd.Series, dtype: str) -> pd.Series:
+    """
+    Cast a questionnaire column to the type of its wide table column.
+
+    Parameters
+    ----------
+    values : pd.Series
+        The (mapped) answers, as stored in ``full_response``.
+    dtype : str
+        The column's dtype hint in ``QUESTIONNAIRE_MAPPING``
+        ("float", "bool", "category" or "text").
+
+    Returns
+    -------
+    pd.Series
+        The typed answers, with None for missing or invalid numbers and booleans,
+        and an empty string for missing text.
+    """
+    if dtype == "float":
+        values = pd.to_numeric(values, errors="coerce")
+    elif dtype == "bool":
+        values = values.map(lambda value: BOOLEAN_VALUES.get(value))
+    else:
+        # unanswered text is stored as an empty string
+        values = values.where(values.notna() & (values != ""))
+        return values.map(str, na_action="ignore").fillna("").astype(object)
+    return values.astype(object).where(values.notna(), None)
+
+
+def build_wide_frame(responses: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the wide table rows of questionnaire responses.
+
+    Parameters
+    ----------
+    responses : pd.DataFrame
+        The responses, with ``response_id``, ``subject_id`` and ``full_response`` columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per response, with a typed column per field of ``QUESTIONNAIRE_MAPPING``.
+    """
+    answers = pd.DataFrame.from_records(
+        responses["full_response"].tolist(), index=responses.index
+    ).reindex(columns=[*QUESTIONNAIRE_FIELDS, "QTimeStamp"])
+    wide = responses[["response_id", "subject_id"]].copy()
+    wide["timestamp"] = localize(
+        pd.to_datetime(answers["QTimeStamp"], format="%m/%d/%Y", errors="coerce")
+    )
+    wide["timestamp"] = (
+        wide["timestamp"].astype(object).where(wide["timestamp"].notna(), None)
+    )
+    for key, field in QUESTIONNAIRE_FIELDS.items():
+        wide[field] = cast_column(answers[key], QUESTIONNAIRE_MAPPING[key]["dtype"])
+    return wide
+
+
+def refresh_wide_responses(response_ids=None) -> int:
+    """
+    Rebuild the wide table rows of the given questionnaire responses.
+
+    Parameters
+    ----------
+    response_ids : Iterable[int], optional
+        The primary keys of the responses to refresh (defaults to all responses).
+
+    Returns
+    -------
+    int
+        The number of rows written.
+    """
+    responses = QuestionnaireResponse.objects.exclude(full_response__Questionnaire="No")
+    stale = WideQuestionnaireResponse.objects.all()
+    if response_ids is not None:
+        response_ids = list(response_ids)
+        responses = responses.filter(pk__in=response_ids)
+        stale = stale.filter(response_id__in=response_ids)
+    frame = pd.DataFrame.from_records(
+        responses.values_list("pk", "subject_id", "full_response"),
+        columns=["response_id", "subject_id", "full_response"],
+    )
+    rows = build_wide_frame(frame) if not frame.empty else frame
+    with transaction.atomic():
+        stale.delete()
+        WideQuestionnaireResponse.objects.bulk_create(
+            [WideQuestionnaireResponse(**row) for row in rows.to_dict("records")],
+            batch_size=BULK_BATCH_SIZE,
+        )
+    return len(rows)
+
+
+def load_wide_frame(subject_ids=None, fields=None) -> pd.DataFrame:
+    """
+    Load the wide questionnaire table into a DataFrame with a single query.
+
+    Parameters
+    ----------
+    subject_ids : Iterable[int], optional
+        Only load the responses of these subjects.
+    fields : list[str], optional
+        The questionnaire fields to load (defaults to all of them).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per response, with ``response_id``, ``subject_id``,
+        ``timestamp`` and the requested fields.
+    """
+    columns = ["response_id", "subject_id", "timestamp"] + list(
+        fields or QUESTIONNAIRE_FIELDS.values()
+    )
+    queryset = WideQuestionnaireResponse.objects.order_by("response_id")
+    if subject_ids is not None:
+        queryset = queryset.filter(subject_id__in=subject_ids)
+    return pd.DataFrame.from_records(queryset.values_list(*columns), columns=columns)
@@ -1,7 +1,9 @@
 import pytest
+from django.db import connection, transaction
 
 from plasticityhub.users.models import User
 from plasticityhub.users.tests.factories import UserFactory
+from plasticityhub.utils.tests.synthetic import make_cohort, make_kepost_tree
 
 
 @pytest.fixture(autouse=True)
@@ -12,3 +14,36 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def query_plan(db):
+    """
+    Explain querysets with sequential scans disabled, so the planner picks
+    any usable index even when the test tables are tiny.
+    """
+
+    def explain(queryset) -> str:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+
+    return explain
+
+
+@pytest.fixture
+def synthetic_cohort(db) -> list:
+    """
+    The sessions of a small synthetic cohort, with their behavioral data.
+    """
+    return make_cohort(n_subjects=4, sessions_per_subject=2)
+
+
+@pytest.fixture
+def kepost_tree(tmp_path, synthetic_cohort) -> tuple:
+    """
+    A fake QNAP root with the kepost outputs (and procedures) of the synthetic cohort.
+    """
+    qnap_path = tmp_path / "qnap"
+    make_kepost_tree(qnap_path, synthetic_cohort, n_regions=10, with_procedures=True)
+    return qnap_path, synthetic_cohort
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.utils.admin import LargeTableAdmin
+
+
+@admin.register(Procedure)
+class ProcedureAdmin(LargeTableAdmin):
+    list_display = ["name", "status", "session", "created_at", "updated_at"]
+    # Procedure.__str__ and Session.__str__ read the session and its subject
+    list_select_related = ["session__subject"]
+    list_filter = ["name", "status"]
+    # exact lookups on indexed columns
+    search_fields = ["=name", "=session__origin_session_id"]
+    raw_id_fields = ["session"]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("procedures", "0002_procedure_path"),
+        ("scans", "0017_add_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="procedure",
+            index=models.Index(
+                fields=["name", "session"], name="procedure_name_session_idx"
+            ),
+        ),
+    ]
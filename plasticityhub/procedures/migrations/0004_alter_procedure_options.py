@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("procedures", "0003_add_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="procedure",
+            options={
+                "base_manager_name": "objects",
+                "verbose_name": "Procedure",
+                "verbose_name_plural": "Procedures",
+            },
+        ),
+    ]
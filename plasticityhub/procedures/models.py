@@ -4,6 +4,19 @@ from django.db import models
 
 from plasticityhub.scans.models import Session
 from plasticityhub.utils.management.static.procedures.utils import parse_session
+from plasticityhub.utils.managers import DeferredFieldsManager, DeferredFieldsQuerySet
+
+
+class ProcedureQuerySet(DeferredFieldsQuerySet):
+    def with_outputs(self):
+        """
+        Load the (large) outputs with the procedures.
+        """
+        return self.undefer("outputs")
+
+
+class ProcedureManager(DeferredFieldsManager.from_queryset(ProcedureQuerySet)):
+    deferred_fields = ["outputs"]
 
 
 class Procedure(models.Model):
@@ -51,9 +64,17 @@ class Procedure(models.Model):
         help_text="The date and time when the procedure was last updated",
     )
 
+    objects = ProcedureManager()
+
     class Meta:
         verbose_name = "Procedure"
         verbose_name_plural = "Procedures"
+        # related lookups (e.g. procedure.session.procedures) defer outputs too
+        base_manager_name = "objects"
+        indexes = [
+            # aggregations filter procedures by name (and session)
+            models.Index(fields=["name", "session"], name="procedure_name_session_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.status} for Session {self.session.session_id}"
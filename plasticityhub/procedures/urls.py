@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import procedure_list_view
+
+app_name = "procedures"
+urlpatterns = [
+    path("", view=procedure_list_view, name="list"),
+]
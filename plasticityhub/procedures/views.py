@@ -1,3 +1,32 @@
-from django.shortcuts import render
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.views import SESSION_FILTERS
+from plasticityhub.utils.api import JSONListView
 
-# Create your views here.
+
+class ProcedureListView(JSONListView):
+    """
+    The processing procedures of the sessions.
+    """
+
+    queryset = Procedure.objects.all()
+    fields = {
+        "id": "id",
+        "name": "name",
+        "status": "status",
+        "path": "path",
+        "session_id": "session__session_id",
+        "subject_code": "session__subject__subject_code",
+        "outputs": "outputs",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+    default_fields = ["id", "name", "status", "session_id", "subject_code"]
+    filters = {
+        "name": "name",
+        "status": "status",
+        **{param: f"session__{lookup}" for param, lookup in SESSION_FILTERS.items()},
+    }
+    ordering = ["id"]
+
+
+procedure_list_view = ProcedureListView.as_view()
@@ -1 +1,31 @@
-# Register your models here.
+from django.contrib import admin
+
+from plasticityhub.scans.models import Session
+from plasticityhub.utils.admin import LargeTableAdmin
+
+
+@admin.register(Session)
+class SessionAdmin(LargeTableAdmin):
+    list_display = [
+        "session_id",
+        "subject",
+        "study",
+        "group",
+        "condition",
+        "lab",
+        "scan_tag",
+        "date",
+        "age_at_scan",
+    ]
+    # Session.__str__ and the list columns read all of these
+    list_select_related = ["subject", "study", "group", "condition", "lab"]
+    list_filter = ["study", "scan_tag", "lab"]
+    # exact lookups on indexed columns
+    search_fields = [
+        "=origin_session_id",
+        "=subject__subject_id",
+        "=subject__subject_code",
+    ]
+    raw_id_fields = ["subject", "questionnaire_response", "seca_measurement"]
+    readonly_fields = ["session_id", "timestamp", "date", "time", "age_at_scan"]
+    date_hierarchy = "timestamp"
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class ScansConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "plasticityhub.scans"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import plasticityhub.scans.signals  # noqa: F401
@@ -0,0 +1,164 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+
+# the tables a cohort query reads; each has a version counter in the cache
+COHORT_TABLES = ["sessions", "subjects", "procedures", "studies"]
+# filter name -> ORM lookup
+COHORT_FILTERS = {
+    "study": "study__name",
+    "group": "group__name",
+    "condition": "condition__name",
+    "lab": "lab__name",
+    "scan_tag": "scan_tag",
+    "sex": "subject__sex",
+}
+COHORT_FIELDS = {
+    "session_id": "session_id",
+    "timestamp": "timestamp",
+    "subject_code": "subject__subject_code",
+    "sex": "subject__sex",
+    "age_at_scan": "age_at_scan",
+    "study": "study__name",
+    "group": "group__name",
+    "condition": "condition__name",
+    "scan_tag": "scan_tag",
+}
+COHORT_TIMEOUT = 60 * 60 * 24
+
+
+def version_key(table: str) -> str:
+    return f"cohorts:version:{table}"
+
+
+def table_versions() -> list[int]:
+    """
+    Return the current version of each of the ``COHORT_TABLES``.
+    """
+    keys = [version_key(table) for table in COHORT_TABLES]
+    versions = cache.get_many(keys)
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_versions(*tables: str):
+    """
+    Invalidate the cached cohorts that read the given tables (defaults to all of them).
+
+    Parameters
+    ----------
+    *tables : str
+        The changed tables (see ``COHORT_TABLES``).
+    """
+    for table in tables or COHORT_TABLES:
+        key = version_key(table)
+        # add() is a no-op for existing keys, so concurrent bumps are not lost
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # the key was evicted in between
+            cache.set(key, 1, timeout=None)
+
+
+def normalize_filter(**filters) -> dict:
+    """
+    Normalize a cohort filter, so equivalent filters share a cache entry.
+
+    Parameters
+    ----------
+    **filters
+        Lists of accepted values for any of the ``COHORT_FILTERS``,
+        ``procedures`` (the names of procedures the sessions must have)
+        and ``age_min``/``age_max`` (the age at scan bounds, inclusive).
+
+    Returns
+    -------
+    dict
+        The filter, with sorted, de-duplicated values and without empty entries.
+    """
+    unknown = set(filters) - {*COHORT_FILTERS, "procedures", "age_min", "age_max"}
+    if unknown:
+        msg = f"Unknown cohort filters: {', '.join(sorted(unknown))}"
+        raise ValueError(msg)
+    normalized: dict = {}
+    for name, values in filters.items():
+        if values is None or values == []:
+            continue
+        if name in ("age_min", "age_max"):
+            normalized[name] = float(values)
+        else:
+            if isinstance(values, str):
+                values = [values]
+            normalized[name] = sorted({str(value) for value in values})
+    return normalized
+
+
+def cohort_cache_key(normalized: dict) -> str:
+    """
+    The cache key of a normalized filter at the current table versions.
+    """
+    digest = hashlib.sha1(  # noqa: S324
+        json.dumps(normalized, sort_keys=True).encode()
+    ).hexdigest()
+    versions = "-".join(str(version) for version in table_versions())
+    return f"cohorts:{versions}:{digest}"
+
+
+def query_cohort(normalized: dict) -> list[dict]:
+    """
+    Run a normalized cohort filter against the database.
+
+    Parameters
+    ----------
+    normalized : dict
+        The filter returned by ``normalize_filter``.
+
+    Returns
+    -------
+    list[dict]
+        The matching sessions (with the ``COHORT_FIELDS``), oldest first.
+    """
+    sessions = Session.objects.all()
+    for name, lookup in COHORT_FILTERS.items():
+        if name in normalized:
+            sessions = sessions.filter(**{f"{lookup}__in": normalized[name]})
+    if "age_min" in normalized:
+        sessions = sessions.filter(age_at_scan__gte=normalized["age_min"])
+    if "age_max" in normalized:
+        sessions = sessions.filter(age_at_scan__lte=normalized["age_max"])
+    for name in normalized.get("procedures", []):
+        sessions = sessions.filter(
+            pk__in=Procedure.objects.filter(name=name).values("session_id")
+        )
+    rows = sessions.order_by("timestamp", "id").values(*COHORT_FIELDS.values())
+    return [{field: row[path] for field, path in COHORT_FIELDS.items()} for row in rows]
+
+
+def get_cohort(**filters) -> tuple[list[dict], bool]:
+    """
+    Return the sessions matching a cohort filter, from the cache when possible.
+
+    Parameters
+    ----------
+    **filters
+        The cohort filter (see ``normalize_filter``).
+
+    Returns
+    -------
+    list[dict]
+        The matching sessions (see ``query_cohort``).
+    bool
+        Whether the result was served from the cache.
+    """
+    normalized = normalize_filter(**filters)
+    key = cohort_cache_key(normalized)
+    rows = cache.get(key)
+    if rows is not None:
+        return rows, True
+    rows = query_cohort(normalized)
+    cache.set(key, rows, timeout=COHORT_TIMEOUT)
+    return rows, False
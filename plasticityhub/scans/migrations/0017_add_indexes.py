@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("behavioral", "0006_add_indexes"),
+        ("scans", "0016_alter_session_rawdata_path"),
+        ("studies", "0003_study_lab"),
+        ("subjects", "0010_add_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["timestamp"], name="session_timestamp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["date"], name="session_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["subject", "timestamp"], name="session_subject_timestamp_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import datetime
 
 import numpy as np
+import pandas as pd
 from django.db import models
 from django.utils import timezone
 
@@ -9,6 +10,134 @@ from plasticityhub.behavioral.seca import SECAMeasurement
 from plasticityhub.studies.models import Condition, Group, Lab, Study
 from plasticityhub.subjects.models import Subject
 
+# the fields the derived fields of a session are inferred from (name: attname)
+SOURCE_FIELDS = {"origin_session_id": "origin_session_id", "subject": "subject_id"}
+DERIVED_FIELDS = ["timestamp", "date", "time", "session_id", "age_at_scan"]
+_MISSING = object()
+
+
+class SessionQuerySet(models.QuerySet):
+    """
+    Sessions, with the derived fields inferred in bulk
+    for ``bulk_create`` and ``bulk_update`` (which bypass ``save``).
+    """
+
+    def fill_derived_fields(self, sessions: list, changed: set | None = None) -> set:
+        """
+        Infer the derived fields of sessions, loading the subjects'
+        dates of birth with a single query.
+
+        Parameters
+        ----------
+        sessions : list[Session]
+            The sessions to update in place.
+        changed : set, optional
+            The source fields that changed (defaults to all of them).
+
+        Returns
+        -------
+        set
+            The names of the fields that were inferred.
+        """
+        changed = set(SOURCE_FIELDS) if changed is None else changed
+        dates_of_birth = dict(
+            Subject.objects.filter(
+                pk__in={session.subject_id for session in sessions}
+            ).values_list("pk", "date_of_birth")
+        )
+        derived = set()
+        for session in sessions:
+            derived |= session.infer_derived_fields(
+                changed, dates_of_birth.get(session.subject_id)
+            )
+        return derived
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.fill_derived_fields(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs, fields = list(objs), list(fields)
+        changed = {
+            name
+            for name, attname in SOURCE_FIELDS.items()
+            if {name, attname} & set(fields)
+        }
+        if changed:
+            derived = self.fill_derived_fields(objs, changed)
+            fields += sorted(derived - set(fields))
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def refresh_derived_fields(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the derived fields (timestamp, date, time, session_id and
+        age_at_scan) of all the sessions in the queryset at once, with
+        vectorized pandas operations and a single bulk update.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of sessions to write per UPDATE statement.
+
+        Returns
+        -------
+        int
+            The number of sessions whose derived fields changed.
+        """
+        sessions = pd.DataFrame.from_records(
+            self.values_list(
+                "pk", "origin_session_id", "subject__date_of_birth", *DERIVED_FIELDS
+            ),
+            columns=["pk", "origin_session_id", "date_of_birth", *DERIVED_FIELDS],
+        )
+        if sessions.empty:
+            return 0
+        timestamps = pd.to_datetime(
+            sessions["origin_session_id"], format="%Y%m%d_%H%M", errors="coerce"
+        ).dt.tz_localize(
+            timezone.get_current_timezone(), ambiguous="NaT", nonexistent="NaT"
+        )
+        days = (
+            timestamps.dt.tz_localize(None).dt.normalize()
+            - pd.to_datetime(sessions["date_of_birth"])
+        ).dt.days
+        derived = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "date": timestamps.dt.date,
+                "time": timestamps.dt.time,
+                "session_id": timestamps.dt.strftime("%Y%m%d%H%M"),
+                "age_at_scan": (days / 365.25).round(2),
+            }
+        )
+        derived = derived.astype(object).where(derived.notna(), None)
+        current = sessions[DERIVED_FIELDS].astype(object)
+        current = current.where(current.notna(), None)
+        # nulls compare unequal in pandas, so treat two nulls as unchanged
+        same = (derived == current) | (derived.isna() & current.isna())
+        changed = ~same.all(axis=1) & timestamps.notna()
+        to_update = [
+            Session(
+                pk=pk,
+                **{
+                    field: (
+                        value.to_pydatetime()
+                        if isinstance(value, pd.Timestamp)
+                        else value
+                    )
+                    for field, value in row.items()
+                },
+            )
+            for pk, row in zip(
+                sessions.loc[changed, "pk"],
+                derived[changed].to_dict("records"),
+                strict=True,
+            )
+        ]
+        super().bulk_update(to_update, DERIVED_FIELDS, batch_size=batch_size)
+        return len(to_update)
+
 
 class Session(models.Model):
     subject = models.ForeignKey(
@@ -112,22 +241,101 @@ class Session(models.Model):
         max_length=300,
     )
 
+    objects = SessionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Session"
         verbose_name_plural = "Sessions"
         ordering = ["timestamp"]
+        indexes = [
+            models.Index(fields=["timestamp"], name="session_timestamp_idx"),
+            # SECA ingest matches measurements by the date of the session
+            models.Index(fields=["date"], name="session_date_idx"),
+            # temporal alignment loads the sessions of subjects in time order
+            models.Index(
+                fields=["subject", "timestamp"], name="session_subject_timestamp_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Session {self.id} for {self.subject} on {self.date} at {self.time}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_source_fields()
+        return instance
+
+    def remember_source_fields(self):
+        """
+        Remember the loaded values of the fields the derived fields are inferred from.
+        """
+        self._loaded_sources = {
+            attname: self.__dict__[attname]
+            for attname in SOURCE_FIELDS.values()
+            if attname in self.__dict__
+        }
+
+    def changed_source_fields(self) -> set:
+        """
+        Return the source fields that changed since the session was loaded.
+        All of them are considered changed for sessions that were not loaded
+        from the database.
+        """
+        loaded = getattr(self, "_loaded_sources", None)
+        if loaded is None:
+            return set(SOURCE_FIELDS)
+        return {
+            name
+            for name, attname in SOURCE_FIELDS.items()
+            if loaded.get(attname, _MISSING) != self.__dict__.get(attname, _MISSING)
+        }
+
     def save(self, *args, **kwargs):
-        # Automatically set the inferred_datetime field
-        self.timestamp = self.infer_timestamp()
-        self.date = self.infer_date()
-        self.time = self.infer_time()
-        self.session_id = self.infer_session_id()
-        self.age_at_scan = self.infer_age_at_scan()
+        # Only re-infer the derived fields whose sources changed
+        changed = self.changed_source_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            changed = {
+                name for name in changed if {name, SOURCE_FIELDS[name]} & update_fields
+            }
+        derived = self.infer_derived_fields(changed)
+        if update_fields is not None:
+            kwargs["update_fields"] = update_fields | derived
         super().save(*args, **kwargs)
+        self.remember_source_fields()
+
+    def infer_derived_fields(self, changed: set, date_of_birth=_MISSING) -> set:
+        """
+        Infer the fields derived from the given changed source fields.
+
+        Parameters
+        ----------
+        changed : set
+            The names of the source fields (see ``SOURCE_FIELDS``) that changed.
+        date_of_birth : datetime.date, optional
+            The subject's date of birth, if already known
+            (by default it is read from the subject).
+
+        Returns
+        -------
+        set
+            The names of the fields that were inferred.
+        """
+        derived = set()
+        if "origin_session_id" in changed or self.timestamp is None:
+            self.timestamp = self.infer_timestamp()
+            self.date = self.infer_date()
+            self.time = self.infer_time()
+            self.session_id = self.infer_session_id()
+            derived |= {"timestamp", "date", "time", "session_id"}
+        if derived or "subject" in changed:
+            if date_of_birth is _MISSING:
+                date_of_birth = self.subject.date_of_birth
+            self.age_at_scan = self.compute_age_at_scan(date_of_birth)
+            derived.add("age_at_scan")
+        return derived
 
     def infer_timestamp(self):
         """
@@ -159,16 +367,17 @@ class Session(models.Model):
         """
         Return the age of the subject at the time of the scan
         """
-        if self.subject.date_of_birth:
+        return self.compute_age_at_scan(self.subject.date_of_birth)
+
+    def compute_age_at_scan(self, date_of_birth):
+        """
+        Return the age at the time of the scan of a subject born at a given date
+        """
+        if date_of_birth:
             try:
-                dob = self.subject.date_of_birth.date()
+                dob = date_of_birth.date()
             except AttributeError:
-                dob = self.subject.date_of_birth
-            # dob = (
-            #     self.subject.date_of_birth
-            #     if isinstance(self.subject.date_of_birth, datetime.date)
-            #     else self.subject.date_of_birth.date()
-            # )
+                dob = date_of_birth
             return np.round(
                 datetime.timedelta(days=(self.timestamp.date() - dob).days).days
                 / 365.25,
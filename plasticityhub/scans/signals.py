@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.cohorts import bump_versions
+from plasticityhub.scans.models import Session
+from plasticityhub.studies.models import Condition, Group, Lab, Study
+from plasticityhub.subjects.models import Subject
+
+# model -> the cohort table it belongs to
+COHORT_MODELS = {
+    Session: "sessions",
+    Subject: "subjects",
+    Procedure: "procedures",
+    Study: "studies",
+    Group: "studies",
+    Condition: "studies",
+    Lab: "studies",
+}
+
+
+def invalidate_cohorts(sender, **kwargs):
+    """
+    Invalidate the cached cohorts when a row they read changes.
+    """
+    bump_versions(COHORT_MODELS[sender])
+
+
+for model in COHORT_MODELS:
+    post_save.connect(invalidate_cohorts, sender=model)
+    post_delete.connect(invalidate_cohorts, sender=model)
@@ -0,0 +1,89 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.cohorts import get_cohort, normalize_filter
+from plasticityhub.scans.models import Session
+from plasticityhub.studies.models import Study
+from plasticityhub.subjects.models import Subject
+from plasticityhub.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def sessions() -> list[Session]:
+    study = Study.objects.create(name="Learning")
+    subject = Subject.objects.create(
+        subject_id="000000001",
+        subject_code="0001",
+        name="Test Subject",
+        date_of_birth=datetime.date(1990, 1, 10),
+    )
+    sessions = [
+        Session.objects.create(
+            subject=subject, study=study, origin_session_id=origin_session_id
+        )
+        for origin_session_id in ["20100110_1030", "20240110_1030"]
+    ]
+    Procedure.objects.create(
+        name="kepost", description="", session=sessions[1], path="", status=""
+    )
+    return sessions
+
+
+def test_normalize_filter():
+    assert normalize_filter(study=["B", "A", "A"], group=[], age_min="20") == {
+        "study": ["A", "B"],
+        "age_min": 20.0,
+    }
+    with pytest.raises(ValueError, match="Unknown cohort filters"):
+        normalize_filter(name="x")
+
+
+def test_get_cohort(sessions: list[Session]):
+    rows, cached = get_cohort(study=["Learning"], procedures=["kepost"], age_min=30)
+    assert not cached
+    assert [row["session_id"] for row in rows] == [sessions[1].session_id]
+    rows, cached = get_cohort(procedures=["kepost"], age_min=30, study="Learning")
+    assert cached
+
+
+def test_get_cohort_is_served_from_the_cache(
+    sessions: list[Session], django_assert_num_queries
+):
+    get_cohort(study=["Learning"])
+    with django_assert_num_queries(0):
+        get_cohort(study=["Learning"])
+
+
+def test_saves_invalidate_the_cache(sessions: list[Session]):
+    rows, _ = get_cohort(scan_tag=["pre"])
+    assert rows == []
+    sessions[0].scan_tag = "pre"
+    sessions[0].save()
+    rows, cached = get_cohort(scan_tag=["pre"])
+    assert not cached
+    assert len(rows) == 1
+
+
+def test_cohort_view(client: Client, user: User, sessions: list[Session]):
+    client.force_login(user)
+    response = client.get(
+        reverse("scans:cohort"), {"study": "Learning", "age_max": "30"}
+    )
+    data = response.json()
+    assert data["count"] == 1
+    assert data["results"][0]["session_id"] == sessions[0].session_id
+    response = client.get(reverse("scans:cohort"), {"age_max": "old"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def subject() -> Subject:
+    return Subject.objects.create(
+        subject_id="000000001",
+        name="Test Subject",
+        date_of_birth=datetime.date(1990, 1, 10),
+    )
+
+
+@pytest.fixture
+def session(subject: Subject) -> Session:
+    return Session.objects.create(subject=subject, origin_session_id="20240110_1030")
+
+
+def test_save_infers_derived_fields(session: Session):
+    assert session.date == datetime.date(2024, 1, 10)
+    assert session.time == datetime.time(10, 30)
+    assert session.session_id == "202401101030"
+    assert session.age_at_scan == 34.0  # noqa: PLR2004
+
+
+def test_save_skips_inference_when_sources_are_unchanged(
+    session: Session, django_assert_num_queries
+):
+    session = Session.objects.get(pk=session.pk)
+    session.rawdata_path = "/data/rawdata"
+    # only the update itself: the subject is not loaded to infer the age
+    with django_assert_num_queries(1):
+        session.save()
+
+
+def test_save_reinfers_changed_sources(session: Session):
+    session = Session.objects.get(pk=session.pk)
+    session.origin_session_id = "20250110_0900"
+    session.save()
+    session.refresh_from_db()
+    assert session.session_id == "202501100900"
+    assert session.age_at_scan == 35.0  # noqa: PLR2004
+
+
+def test_save_extends_update_fields(session: Session):
+    session = Session.objects.get(pk=session.pk)
+    session.origin_session_id = "20250110_0900"
+    session.save(update_fields=["origin_session_id"])
+    session.refresh_from_db()
+    assert session.date == datetime.date(2025, 1, 10)
+
+
+def test_bulk_create_infers_derived_fields(subject: Subject, django_assert_num_queries):
+    sessions = [
+        Session(subject_id=subject.pk, origin_session_id=f"2024011{i}_1030")
+        for i in range(3)
+    ]
+    # one query for the dates of birth, one for the insert
+    with django_assert_num_queries(2):
+        Session.objects.bulk_create(sessions)
+    assert list(
+        Session.objects.order_by("timestamp").values_list("session_id", "age_at_scan")
+    ) == [
+        ("202401101030", 34.0),
+        ("202401111030", 34.0),
+        ("202401121030", 34.0),
+    ]
+
+
+def test_bulk_update_infers_derived_fields(session: Session):
+    session = Session.objects.get(pk=session.pk)
+    session.origin_session_id = "20250110_0900"
+    Session.objects.bulk_update([session], ["origin_session_id"])
+    session.refresh_from_db()
+    assert session.session_id == "202501100900"
+    assert session.age_at_scan == 35.0  # noqa: PLR2004
+
+
+def test_refresh_derived_fields(session: Session, django_assert_num_queries):
+    # the vectorized computation agrees with save()
+    assert Session.objects.all().refresh_derived_fields() == 0
+    Session.objects.filter(pk=session.pk).update(
+        session_id="", age_at_scan=None, date=None
+    )
+    # one query to load the sessions, one to write them
+    with django_assert_num_queries(2):
+        assert Session.objects.all().refresh_derived_fields() == 1
+    session.refresh_from_db()
+    assert session.session_id == "202401101030"
+    assert session.date == datetime.date(2024, 1, 10)
+    assert session.age_at_scan == 34.0  # noqa: PLR2004
+    assert Session.objects.all().refresh_derived_fields() == 0
+
+
+def test_date_of_birth_change_refreshes_ages(session: Session):
+    subject = Subject.objects.get(pk=session.subject_id)
+    subject.date_of_birth = datetime.date(2000, 1, 10)
+    subject.save()
+    session.refresh_from_db()
+    assert session.age_at_scan == 24.0  # noqa: PLR2004
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import cohort_view, session_list_view
+
+app_name = "scans"
+urlpatterns = [
+    path("", view=session_list_view, name="list"),
+    path("cohort/", view=cohort_view, name="cohort"),
+]
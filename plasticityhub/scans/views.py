@@ -1 +1,85 @@
-# Create your views here.
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views import View
+
+from plasticityhub.scans.cohorts import COHORT_FILTERS, get_cohort
+from plasticityhub.scans.models import Session
+from plasticityhub.utils.api import JSONListView
+
+SESSION_FILTERS = {
+    "study": "study__name",
+    "group": "group__name",
+    "condition": "condition__name",
+    "lab": "lab__name",
+    "scan_tag": "scan_tag",
+    "subject_code": "subject__subject_code",
+}
+
+
+class SessionListView(JSONListView):
+    """
+    The scanning sessions, oldest first.
+    Subjects are identified by their (pseudonymous) subject code only.
+    """
+
+    queryset = Session.objects.filter(timestamp__isnull=False)
+    fields = {
+        "id": "id",
+        "session_id": "session_id",
+        "origin_session_id": "origin_session_id",
+        "timestamp": "timestamp",
+        "date": "date",
+        "time": "time",
+        "subject_code": "subject__subject_code",
+        "sex": "subject__sex",
+        "age_at_scan": "age_at_scan",
+        "study": "study__name",
+        "group": "group__name",
+        "condition": "condition__name",
+        "lab": "lab__name",
+        "scan_tag": "scan_tag",
+        "status": "status",
+        "rawdata_path": "rawdata_path",
+        "time_between_scan_and_questionnaire": "time_between_scan_and_questionnaire",
+        "time_between_scan_and_seca": "time_between_scan_and_seca",
+    }
+    default_fields = [
+        "id",
+        "session_id",
+        "timestamp",
+        "subject_code",
+        "age_at_scan",
+        "study",
+        "group",
+        "condition",
+        "scan_tag",
+    ]
+    filters = SESSION_FILTERS
+    ordering = ["timestamp", "id"]
+
+
+session_list_view = SessionListView.as_view()
+
+
+class CohortView(LoginRequiredMixin, View):
+    """
+    The sessions of a cohort, e.g.
+    ``?study=X&procedure=kepost&age_min=20&age_max=40``, served from the cache
+    until one of the tables it reads changes.
+    """
+
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        filters = {name: request.GET.getlist(name) for name in COHORT_FILTERS}
+        filters["procedures"] = request.GET.getlist("procedure")
+        filters["age_min"] = request.GET.get("age_min")
+        filters["age_max"] = request.GET.get("age_max")
+        try:
+            rows, cached = get_cohort(**filters)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse({"count": len(rows), "cached": cached, "results": rows})
+
+
+cohort_view = CohortView.as_view()
@@ -1 +1,13 @@
-# Register your models here.
+from django.contrib import admin
+
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.admin import LargeTableAdmin
+
+
+@admin.register(Subject)
+class SubjectAdmin(LargeTableAdmin):
+    list_display = ["subject_id", "subject_code", "name", "sex", "date_of_birth"]
+    list_filter = ["sex", "studies"]
+    # exact lookups on indexed columns
+    search_fields = ["=subject_id", "=subject_code"]
+    filter_horizontal = ["studies", "groups", "conditions"]
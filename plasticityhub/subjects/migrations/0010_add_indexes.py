@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("studies", "0003_study_lab"),
+        ("subjects", "0009_subject_conditions_subject_groups_subject_studies"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(fields=["subject_code"], name="subject_code_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(
+                fields=["date_of_birth", "sex"], name="subject_dob_sex_idx"
+            ),
+        ),
+    ]
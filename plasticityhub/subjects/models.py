@@ -1,9 +1,20 @@
+import datetime
+
 from django.db import models
 from django.utils import timezone
 
 from plasticityhub.studies.models import Condition, Group, Study
 
 
+def _as_date(value):
+    """
+    The ingest may set datetimes (e.g. pandas timestamps) instead of dates.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
 class Subject(models.Model):
     SUBJECT_SEX_CHOICES = [
         ("M", "Male"),
@@ -97,10 +108,35 @@ class Subject(models.Model):
         verbose_name = "Subject"
         verbose_name_plural = "Subjects"
         ordering = ["subject_id"]
+        indexes = [
+            # questionnaire ingest matches rows by subject code
+            models.Index(fields=["subject_code"], name="subject_code_idx"),
+            # SECA ingest matches measurements by date of birth and sex
+            models.Index(fields=["date_of_birth", "sex"], name="subject_dob_sex_idx"),
+        ]
 
     def __str__(self):
         return f"{self.subject_id} - {self.first_name} {self.last_name or ''}".strip()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_date_of_birth()
+        return instance
+
+    def remember_date_of_birth(self):
+        """
+        Remember the current date of birth (see ``date_of_birth_changed``).
+        """
+        self._loaded_date_of_birth = _as_date(self.__dict__.get("date_of_birth"))
+
+    def date_of_birth_changed(self) -> bool:
+        """
+        Whether the date of birth changed since the subject was loaded.
+        """
+        loaded = getattr(self, "_loaded_date_of_birth", None)
+        return loaded != _as_date(self.__dict__.get("date_of_birth"))
+
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
 
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from plasticityhub.scans.cohorts import bump_versions
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+
+
+@receiver(post_save, sender=Subject)
+def refresh_session_ages(sender, instance: Subject, created: bool, **kwargs):
+    """
+    Recompute the age at scan of a subject's sessions when the date of birth changes.
+    """
+    if not created and not kwargs.get("raw") and instance.date_of_birth_changed():
+        if Session.objects.filter(subject=instance).refresh_derived_fields():
+            bump_versions("sessions")
+    instance.remember_date_of_birth()
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import subject_list_view
+
+app_name = "subjects"
+urlpatterns = [
+    path("", view=subject_list_view, name="list"),
+]
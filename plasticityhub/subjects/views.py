@@ -1 +1,36 @@
-# Create your views here.
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.api import JSONListView
+
+
+class SubjectListView(JSONListView):
+    """
+    The subjects, by their (pseudonymous) subject code.
+    Identifying fields (ID number, name, contact details and date of birth)
+    are not exposed.
+    """
+
+    queryset = Subject.objects.all()
+    fields = {
+        "id": "id",
+        "subject_code": "subject_code",
+        "sex": "sex",
+        "handedness": "handedness",
+        "height": "height",
+        "weight": "weight",
+        "status": "status",
+    }
+    default_fields = ["id", "subject_code", "sex", "handedness"]
+    filters = {
+        "study": "studies__name",
+        "group": "groups__name",
+        "condition": "conditions__name",
+        "subject_code": "subject_code",
+    }
+    ordering = ["id"]
+
+    def get_queryset(self):
+        # the study, group and condition filters span many-to-many relations
+        return super().get_queryset().distinct()
+
+
+subject_list_view = SubjectListView.as_view()
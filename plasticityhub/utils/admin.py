@@ -1 +1,63 @@
-# Register your models here.
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+# below this many (estimated) rows, an exact COUNT(*) is cheap enough
+EXACT_COUNT_THRESHOLD = 10000
+
+
+def estimated_count(queryset: QuerySet) -> int | None:
+    """
+    Estimate the number of rows in a model's table from the planner statistics.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        A queryset over the model.
+
+    Returns
+    -------
+    int or None
+        The estimated number of rows, or None when no estimate is available
+        (e.g. the table was never analyzed, or the database is not PostgreSQL).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that uses the table statistics instead of COUNT(*)
+    for unfiltered changelists of large tables.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimated_count(queryset)
+            if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    A model admin for large tables: estimated page counts and no full result
+    count (large JSON columns are deferred by the models' default managers).
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
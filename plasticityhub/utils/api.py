@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.http import JsonResponse
+from django.views import View
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class APIError(Exception):
+    """
+    An invalid API request, reported to the client with a 400 response.
+    """
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encode the ordering values of the last row of a page as an opaque cursor.
+
+    Parameters
+    ----------
+    values : list
+        The values of the ordering fields.
+
+    Returns
+    -------
+    str
+        The cursor.
+    """
+    # str() keeps the full precision of datetimes, in a format the ORM parses back
+    data = json.dumps(values, default=str).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor created by ``encode_cursor``.
+
+    Parameters
+    ----------
+    cursor : str
+        The cursor.
+    size : int
+        The number of ordering fields.
+
+    Returns
+    -------
+    list
+        The values of the ordering fields.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError) as e:
+        msg = "Invalid cursor."
+        raise APIError(msg) from e
+    if not isinstance(values, list) or len(values) != size:
+        msg = "Invalid cursor."
+        raise APIError(msg)
+    return values
+
+
+def keyset_filter(ordering: list[str], values: list) -> Q:
+    """
+    Build the filter selecting the rows after a given row,
+    i.e. ``(a, b) > (value_a, value_b)`` for an ascending ordering on (a, b).
+
+    Parameters
+    ----------
+    ordering : list[str]
+        The (ascending, non-null) ordering fields; the last one must be unique.
+    values : list
+        The values of the ordering fields of the last row returned.
+
+    Returns
+    -------
+    Q
+        The filter.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        equal = Q(**dict(zip(ordering[:i], values[:i], strict=True)))
+        condition |= equal & Q(**{f"{field}__gt": values[i]})
+    return condition
+
+
+class JSONListView(LoginRequiredMixin, View):
+    """
+    A read-only JSON list endpoint with field projection, filtering
+    and keyset (cursor) pagination.
+
+    Rows are fetched with ``values()`` on the whitelisted fields only,
+    so related tables are joined in SQL and no model instances are built.
+    """
+
+    raise_exception = True
+    queryset: QuerySet
+    # public field name -> ORM lookup path; only these can be requested
+    fields: dict[str, str] = {}
+    default_fields: list[str] = []
+    # query parameter -> ORM lookup
+    filters: dict[str, str] = {}
+    # ascending, non-null fields; the last one must be unique
+    ordering: list[str] = ["id"]
+
+    def get_fields(self) -> list[str]:
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return self.default_fields
+        fields = [field.strip() for field in requested.split(",") if field.strip()]
+        unknown = sorted(set(fields) - set(self.fields))
+        if unknown:
+            msg = f"Unknown fields: {', '.join(unknown)}."
+            raise APIError(msg)
+        return fields
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.GET.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError as e:
+            msg = "limit must be an integer."
+            raise APIError(msg) from e
+        return max(1, min(limit, MAX_PAGE_SIZE))
+
+    def get_queryset(self) -> QuerySet:
+        queryset = self.queryset.all()
+        for param, lookup in self.filters.items():
+            values = self.request.GET.getlist(param)
+            if values:
+                queryset = queryset.filter(**{f"{lookup}__in": values})
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields = self.get_fields()
+            limit = self.get_limit()
+            queryset = self.get_queryset().order_by(*self.ordering)
+            cursor = request.GET.get("cursor")
+            if cursor:
+                values = decode_cursor(cursor, len(self.ordering))
+                queryset = queryset.filter(keyset_filter(self.ordering, values))
+        except APIError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        except (ValueError, ValidationError):
+            return JsonResponse(
+                {"error": "Invalid filter or cursor value."}, status=400
+            )
+
+        # the ordering fields are fetched too, to build the next cursor
+        paths = list(dict.fromkeys([*self.ordering, *(self.fields[f] for f in fields)]))
+        rows = list(queryset.values(*paths)[: limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][field] for field in self.ordering])
+        results = [{field: row[self.fields[field]] for field in fields} for row in rows]
+        return JsonResponse({"results": results, "next": self.next_url(next_cursor)})
+
+    def next_url(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query["cursor"] = cursor
+        return self.request.build_absolute_uri(
+            f"{self.request.path}?{query.urlencode()}"
+        )
@@ -0,0 +1,212 @@
+import json
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+import environ
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+
+def peak_rss() -> int:
+    """
+    The peak resident set size of the process, in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class QueryCounter:
+    """
+    A database execute wrapper counting queries and their time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.wall_time = 0.0
+
+    @contextmanager
+    def measure(self):
+        """
+        Count the queries of the current thread's connection, and the wall time.
+        """
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self):
+                yield self
+        finally:
+            self.wall_time = time.perf_counter() - start
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - start
+
+
+@dataclass
+class StageReport:
+    """
+    The cost of a stage of a run.
+    """
+
+    name: str
+    wall_time: float
+    queries: int
+    query_time: float
+    # the peak RSS of the process (not only the stage) when the stage ended
+    peak_rss: int
+
+
+@dataclass
+class RunReport:
+    """
+    The cost of a run of a command and of each of its stages.
+    """
+
+    command: str
+    started_at: str
+    wall_time: float = 0.0
+    queries: int = 0
+    query_time: float = 0.0
+    peak_rss: int = 0
+    stages: list[StageReport] = field(default_factory=list)
+
+    def stage(self, name: str) -> StageReport:
+        """
+        The report of a stage, by name.
+        """
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+class Instrumentation:
+    """
+    Record the wall time, the number and time of database queries and the
+    peak RSS of a run and of its stages.
+
+    Queries are counted with ``connection.execute_wrapper``, which applies to
+    the connection of the current thread, so stages running in worker threads
+    (see ``StageGraph.run``) are counted by entering ``stage`` in them.
+    The run's totals include the queries of every stage.
+
+    Parameters
+    ----------
+    command : str
+        The name of the instrumented command.
+    """
+
+    def __init__(self, command: str):
+        self.report = RunReport(command=command, started_at=timezone.now().isoformat())
+        self._lock = threading.Lock()
+        self._thread = threading.current_thread()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Record a stage of the run.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        """
+        counter = QueryCounter()
+        try:
+            with counter.measure():
+                yield
+        finally:
+            # failed stages are recorded too
+            self._record_stage(name, counter)
+
+    def _record_stage(self, name: str, counter: QueryCounter):
+        with self._lock:
+            self.report.stages.append(
+                StageReport(
+                    name=name,
+                    wall_time=counter.wall_time,
+                    queries=counter.queries,
+                    query_time=counter.seconds,
+                    peak_rss=peak_rss(),
+                )
+            )
+            # stages in worker threads are not seen by the run's wrapper
+            if threading.current_thread() is not self._thread:
+                self.report.queries += counter.queries
+                self.report.query_time += counter.seconds
+
+    @contextmanager
+    def run(self):
+        """
+        Record the whole run.
+        """
+        self._thread = threading.current_thread()
+        counter = QueryCounter()
+        try:
+            with counter.measure():
+                yield self
+        finally:
+            self._record_run(counter)
+
+    def _record_run(self, counter: QueryCounter):
+        with self._lock:
+            self.report.wall_time = counter.wall_time
+            self.report.queries += counter.queries
+            self.report.query_time += counter.seconds
+            self.report.peak_rss = peak_rss()
+
+    def write(self, directory: Union[str, Path]) -> Path:
+        """
+        Store the report as JSON, named after the command and the run's start.
+
+        Returns
+        -------
+        Path
+            The path to the report.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        started_at = self.report.started_at.replace(":", "").replace("+", "_")
+        path = directory / f"{self.report.command}-{started_at}.json"
+        path.write_text(self.report.to_json())
+        return path
+
+
+class InstrumentedCommand(BaseCommand):
+    """
+    A management command whose runs are instrumented.
+
+    ``handle`` may record its stages with ``self.instrumentation.stage``.
+    The report of the last run is kept in ``self.report``, and stored as
+    JSON in ``INSTRUMENTATION_DIR`` when it is set.
+    """
+
+    env = environ.Env()
+    instrumentation_dir = env("INSTRUMENTATION_DIR", default=None)
+    report: Optional[RunReport] = None
+
+    def execute(self, *args, **options):
+        name = self.__module__.rsplit(".", 1)[-1]
+        self.instrumentation = Instrumentation(name)
+        try:
+            with self.instrumentation.run():
+                return super().execute(*args, **options)
+        finally:
+            self.report = self.instrumentation.report
+            if self.instrumentation_dir:
+                self.instrumentation.write(self.instrumentation_dir)
@@ -6,10 +6,13 @@ from typing import Optional
 
 import environ
 import tqdm
-from django.core.management.base import BaseCommand
 from niworkflows.engine.workflows import LiterateWorkflow as Workflow
 
 from plasticityhub.procedures.models import Procedure
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+from plasticityhub.utils.management.commands.aggregate_kepost_parcellations import (
+    load_kepost_procedures,
+)
 from plasticityhub.utils.management.static.procedures.connectomes.connectomes import (
     init_connectome_wf,
 )
@@ -188,7 +191,7 @@ def generate_connectomes(
     print("Generating connectomes...")
     reconstruction_parameters = generate_reconstruction_parameters(scales, stat_edges)
     print(reconstruction_parameters)
-    procedures = Procedure.objects.filter(name="kepost")
+    procedures = load_kepost_procedures()
     tracts_queries = generate_queries(CONNECTOME_PARAMETERS)
     atlases_queries, atlases_copy = collect_atlases(AVAILABLE_ATLASES)
     for procedure in tqdm.tqdm(procedures, desc="Generating connectomes"):
@@ -276,7 +279,7 @@ def generate_connectomes(
         # subprocess.run(cmd, shell=True)
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Populate the database with the properties of existing procedures."
     env = environ.Env()
 
@@ -8,10 +8,10 @@ import environ
 import gspread as gs
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
 from django.db.models import QuerySet
 
 from plasticityhub.procedures.models import Procedure
+from plasticityhub.utils.instrumentation import InstrumentedCommand
 from plasticityhub.utils.management.static.procedures.kepost.outputs import (
     AVAILABLE_ATLASES,
     QC_PARAMETERS,
@@ -20,6 +20,26 @@ from plasticityhub.utils.management.static.procedures.kepost.outputs import (
 
 warnings.filterwarnings("ignore")
 
+PROCEDURE_RELATED_FIELDS = [
+    "session__subject",
+    "session__study",
+    "session__group",
+    "session__condition",
+    "session__lab",
+]
+
+
+def load_kepost_procedures() -> QuerySet:
+    """
+    The kepost procedures with their outputs, sessions and subjects,
+    so describing them does not query the database again.
+    """
+    return (
+        Procedure.objects.filter(name="kepost")
+        .with_outputs()
+        .select_related(*PROCEDURE_RELATED_FIELDS)
+    )
+
 
 def add_atlases_to_queries(base_queries: list[dict], atlases: dict):
     """
@@ -127,7 +147,37 @@ def generate_destination_path(destination: str, query: dict):
     return path
 
 
-def aggregate_tensor_results(procedures: QuerySet, destination: str, overwrite: bool):
+def load_unchanged_rows(
+    data_destination: Path, changed: Optional[list[Procedure]]
+) -> Optional[pd.DataFrame]:
+    """
+    Load the previously aggregated rows that the changed procedures do not affect.
+
+    Parameters
+    ----------
+    data_destination : Path
+        The path to the aggregated data.
+    changed : list[Procedure], optional
+        The procedures whose outputs changed since the last aggregation.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        The rows to keep, or None if the data has to be aggregated from scratch.
+    """
+    if changed is None or not data_destination.exists():
+        return None
+    df = pd.read_pickle(data_destination)
+    session_ids = {procedure.session.session_id for procedure in changed}
+    return df[~df["session_id"].isin(session_ids)]
+
+
+def aggregate_tensor_results(
+    procedures: QuerySet,
+    destination: str,
+    overwrite: bool,
+    changed: Optional[list[Procedure]] = None,
+):
     """
     Aggregate the results of the tensor estimations.
 
@@ -137,6 +187,9 @@ def aggregate_tensor_results(procedures: QuerySet, destination: str, overwrite:
         The path to store the output files.
     overwrite : bool
         Whether to overwrite existing files.
+    changed : list[Procedure], optional
+        Procedures whose outputs changed since the last aggregation.
+        When given, only their rows are re-read and merged into the existing files.
     """
     tensor_queries = generate_queries(TENSORS_PARAMETERS, atlases=AVAILABLE_ATLASES)
     for full_query in tqdm.tqdm(tensor_queries, desc="Aggregating tensor results"):
@@ -145,11 +198,19 @@ def aggregate_tensor_results(procedures: QuerySet, destination: str, overwrite:
         query_destination = generate_destination_path(destination, query)
         data_destination = query_destination / "data.pkl"
         atlas_destination = query_destination / "atlas.pkl"
-        if data_destination.exists() and atlas_destination.exists() and not overwrite:
+        if (
+            data_destination.exists()
+            and atlas_destination.exists()
+            and not overwrite
+            and changed is None
+        ):
             continue
         atlas = full_query.get("atlas")
-        query_df = pd.DataFrame()
-        for procedure in procedures:
+        query_df = load_unchanged_rows(data_destination, changed)
+        to_read = procedures if query_df is None else changed
+        if query_df is None:
+            query_df = pd.DataFrame()
+        for procedure in to_read:
             fname = procedure.get(query)
             if not fname or not Path(fname).exists():
                 continue
@@ -157,6 +218,10 @@ def aggregate_tensor_results(procedures: QuerySet, destination: str, overwrite:
             p_df = add_session_and_subject_details(p_df, procedure)
             query_df = pd.concat([query_df, p_df], ignore_index=True)
         if query_df.empty:
+            # drop the stale rows of changed procedures whose outputs were removed
+            if changed is not None:
+                data_destination.unlink(missing_ok=True)
+                atlas_destination.unlink(missing_ok=True)
             continue
         query_df.to_pickle(data_destination)
         # save atlas to pickle file
@@ -164,7 +229,12 @@ def aggregate_tensor_results(procedures: QuerySet, destination: str, overwrite:
             pickle.dump(atlas, f)
 
 
-def aggregate_qc_results(procedures: QuerySet, destination: str, overwrite: bool):
+def aggregate_qc_results(
+    procedures: QuerySet,
+    destination: str,
+    overwrite: bool,
+    changed: Optional[list[Procedure]] = None,
+):
     """
     Aggregate the results of the quality control.
 
@@ -174,16 +244,22 @@ def aggregate_qc_results(procedures: QuerySet, destination: str, overwrite: bool
         The path to store the output files.
     overwrite : bool
         Whether to overwrite existing files.
+    changed : list[Procedure], optional
+        Procedures whose outputs changed since the last aggregation.
+        When given, only their rows are re-read and merged into the existing files.
     """
     qc_queries = generate_queries(QC_PARAMETERS)
     for full_query in tqdm.tqdm(qc_queries, desc="Aggregating QC results"):
         query = full_query.get("query")
         query_destination = generate_destination_path(destination, query)
         data_destination = query_destination / "data.pkl"
-        if data_destination.exists() and not overwrite:
+        if data_destination.exists() and not overwrite and changed is None:
             continue
-        query_df = pd.DataFrame()
-        for procedure in procedures:
+        query_df = load_unchanged_rows(data_destination, changed)
+        to_read = procedures if query_df is None else changed
+        if query_df is None:
+            query_df = pd.DataFrame()
+        for procedure in to_read:
             fname = procedure.get(query)
             if not fname:
                 continue
@@ -194,11 +270,16 @@ def aggregate_qc_results(procedures: QuerySet, destination: str, overwrite: bool
             p_df = add_session_and_subject_details(p_df, procedure)
             query_df = pd.concat([query_df, p_df], ignore_index=True)
         if query_df.empty:
+            # drop the stale rows of changed procedures whose outputs were removed
+            if changed is not None:
+                data_destination.unlink(missing_ok=True)
             continue
         query_df.to_pickle(data_destination)
 
 
-def aggregate_results(destination: str, overwrite: bool):
+def aggregate_results(
+    destination: str, overwrite: bool, procedure_ids: Optional[set] = None
+):
     """
     Aggregate the results of the procedures.
 
@@ -208,13 +289,19 @@ def aggregate_results(destination: str, overwrite: bool):
         The path to store the output files.
     overwrite : bool
         Whether to overwrite existing files.
+    procedure_ids : set, optional
+        The primary keys of procedures that changed since the last aggregation.
+        When given, only these procedures are re-read.
     """
-    procedures = Procedure.objects.filter(name="kepost")
-    aggregate_tensor_results(procedures, destination, overwrite)
-    aggregate_qc_results(procedures, destination, overwrite)
+    procedures = load_kepost_procedures()
+    changed = None
+    if procedure_ids is not None:
+        changed = list(procedures.filter(pk__in=procedure_ids))
+    aggregate_tensor_results(procedures, destination, overwrite, changed)
+    aggregate_qc_results(procedures, destination, overwrite, changed)
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Populate the database with the properties of existing procedures."
     env = environ.Env()
 
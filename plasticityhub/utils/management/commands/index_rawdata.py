@@ -0,0 +1,54 @@
+import environ
+from django.core.management.base import CommandError
+
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+from plasticityhub.utils.rawdata import index_rawdata
+
+
+class Command(InstrumentedCommand):
+    help = "Index the session directories of the scanner exports into the mapped rawdata file."
+    env = environ.Env()
+    rawdata_roots = env.list("RAWDATA_ROOTS", default=[])
+    mapped_rawdata_path = env("MAPPED_RAWDATA_PATH", default=None)
+    rawdata_index_path = env("RAWDATA_INDEX_PATH", default=None)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--roots",
+            nargs="*",
+            type=str,
+            default=self.rawdata_roots,
+            help="The directories of the scanner exports.",
+        )
+        parser.add_argument(
+            "--mapped_rawdata_path",
+            type=str,
+            default=self.mapped_rawdata_path,
+            help="Path to the mapped rawdata file to write.",
+        )
+        parser.add_argument(
+            "--index_path",
+            type=str,
+            default=self.rawdata_index_path,
+            help="Path to the index (defaults to next to the mapped rawdata file).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="List every directory, even those unchanged since the last run.",
+        )
+
+    def handle(self, *args, **kwargs):
+        if not kwargs["roots"] or not kwargs["mapped_rawdata_path"]:
+            msg = "Both --roots and --mapped_rawdata_path are required."
+            raise CommandError(msg)
+        stats = index_rawdata(
+            kwargs["roots"],
+            kwargs["mapped_rawdata_path"],
+            kwargs["index_path"],
+            full=kwargs["full"],
+        )
+        self.stdout.write(
+            f"Listed {stats.scanned} directories, reused {stats.reused} unchanged."
+        )
+        self.stdout.write(self.style.SUCCESS(f"Indexed {stats.sessions} sessions."))
@@ -1,29 +1,118 @@
+import os
 from pathlib import Path
+from typing import Optional
 
 import environ
 import gspread as gs
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
 
 from plasticityhub.procedures.models import Procedure
 from plasticityhub.scans.models import Session
 from plasticityhub.studies.models import Condition, Group, Lab, Study
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import InstrumentedCommand
 from plasticityhub.utils.management.static.database_mapping import COLUMNS_MAPPING
 from plasticityhub.utils.management.static.procedures.utils import parse_session
 
+# where kepost outputs are stored, relative to the QNAP root
+KEPOST_DIRECTORY = Path("share/Biden_Results/derivatives/kepost")
 
-def populate_kepost_procedures(qnap_path: str, overwrite: bool = False):
+
+def modified_since(path: str, timestamp: float) -> bool:
+    """
+    Whether a directory, or anything under it, was modified after a timestamp.
+
+    Directories count as well as files, since removing an entry only
+    changes the mtime of its parent directory.
+
+    Parameters
+    ----------
+    path : str
+        The directory.
+    timestamp : float
+        The POSIX timestamp to compare the mtimes with.
+
+    Returns
+    -------
+    bool
+        True as soon as a later mtime is found.
+    """
+    pending = [path]
+    while pending:
+        directory = pending.pop()
+        try:
+            if os.stat(directory).st_mtime > timestamp:
+                return True
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.stat().st_mtime > timestamp:
+                        return True
+        except OSError:
+            # removed while listing
+            continue
+    return False
+
+
+def changed_kepost_outputs(qnap_path: str) -> set:
+    """
+    Find the kepost outputs on the QNAP that were not parsed since they last changed.
+
+    An output directory is changed when there is no kepost procedure for it,
+    or when it or any of its files or subdirectories (e.g. ``dwi``) was
+    modified after the procedure's last update.
+
+    Parameters
+    ----------
+    qnap_path : str
+        The path to the QNAP directory.
+
+    Returns
+    -------
+    set
+        The session IDs of the new or modified outputs.
+    """
+    parsed = dict(
+        Procedure.objects.filter(name="kepost").values_list("path", "updated_at")
+    )
+    changed = set()
+    for directory in (Path(qnap_path) / KEPOST_DIRECTORY).glob("sub-*/ses-*"):
+        updated_at = parsed.get(str(directory))
+        if updated_at is None or modified_since(str(directory), updated_at.timestamp()):
+            changed.add(directory.name.removeprefix("ses-"))
+    return changed
+
+
+def populate_kepost_procedures(
+    qnap_path: str, overwrite: bool = False, sessions: Optional[list[Session]] = None
+):
     """
     Populate the database with the properties of existing procedures.
+
+    Parameters
+    ----------
+    qnap_path : str
+        The path to the QNAP directory.
+    overwrite : bool
+        Whether to overwrite existing procedures with new outputs.
+    sessions : list[Session], optional
+        Already loaded sessions to look for, by default all sessions.
+
+    Returns
+    -------
+    set
+        The primary keys of the procedures that were created or updated.
     """
     qnap_path = Path(qnap_path)
-    for session in tqdm.tqdm(Session.objects.all()):
+    if sessions is None:
+        sessions = list(Session.objects.all())
+    changed = set()
+    for session in tqdm.tqdm(sessions):
         kepost_output = list(
-            qnap_path.glob(
-                f"share/Biden_Results/derivatives/kepost/sub-*/ses-{session.session_id}"
-            )
+            (qnap_path / KEPOST_DIRECTORY).glob(f"sub-*/ses-{session.session_id}")
         )
         if not kepost_output:
             continue
@@ -36,12 +125,14 @@ def populate_kepost_procedures(qnap_path: str, overwrite: bool = False):
         if created or overwrite:
             procedure.outputs = parse_session(kepost_output)
             procedure.save()
+            changed.add(procedure.pk)
+    return changed
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Populate the database with the properties of existing procedures."
     env = environ.Env()
-    qnap_path = env.get_value("QNAP_PATH")
+    qnap_path = env("QNAP_PATH", default=None)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -59,6 +150,9 @@ class Command(BaseCommand):
 
     def handle(self, *args, **kwargs):
         qnap_path = kwargs.get("qnap_path")
+        if not qnap_path:
+            msg = "Set QNAP_PATH or pass --qnap_path."
+            raise CommandError(msg)
         overwrite = kwargs.get("overwrite")
         populate_kepost_procedures(qnap_path, overwrite)
         self.stdout.write(self.style.SUCCESS("Database updated successfully."))
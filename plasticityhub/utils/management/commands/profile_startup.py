@@ -0,0 +1,214 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+import environ
+import pandas as pd
+from django.conf import settings
+from django.core.management import get_commands
+from django.core.management.base import BaseCommand, CommandError
+
+SETUP_SNIPPET = "import django; django.setup()"
+COMMAND_SNIPPET = (
+    SETUP_SNIPPET
+    + "; from django.core.management import load_command_class"
+    + "; load_command_class({app!r}, {name!r})"
+)
+IMPORTTIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<module>\s+\S+)\s*$"
+)
+LOCAL_APPS_PREFIX = "plasticityhub"
+
+
+def parse_importtime(output: str) -> pd.DataFrame:
+    """
+    Parse the output of ``python -X importtime`` into a DataFrame.
+
+    Parameters
+    ----------
+    output : str
+        The stderr of a process started with ``-X importtime``.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per imported module, in the order reported by the interpreter,
+        with the self and cumulative import time (in microseconds) and the
+        depth of the module in the import tree.
+    """
+    rows = []
+    for line in output.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        module = match.group("module")
+        rows.append(
+            {
+                "module": module.strip(),
+                "self_us": int(match.group("self")),
+                "cumulative_us": int(match.group("cumulative")),
+                # the interpreter indents nested imports by two spaces
+                "depth": (len(module) - len(module.lstrip()) - 1) // 2,
+            }
+        )
+    return pd.DataFrame(rows, columns=["module", "self_us", "cumulative_us", "depth"])
+
+
+def measure_startup(snippet: str, settings_module: str) -> tuple[float, pd.DataFrame]:
+    """
+    Run a snippet in a fresh interpreter and measure its cold start.
+
+    Parameters
+    ----------
+    snippet : str
+        The Python code to execute.
+    settings_module : str
+        The Django settings module to use.
+
+    Returns
+    -------
+    float
+        The wall time of the process, in seconds.
+    pd.DataFrame
+        The per-module import cost (see ``parse_importtime``).
+    """
+    env = os.environ.copy()
+    env["DJANGO_SETTINGS_MODULE"] = settings_module
+    start = time.perf_counter()
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_time = time.perf_counter() - start
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1:]
+        msg = f"Failed to run `{snippet}`: {' '.join(error)}"
+        raise CommandError(msg)
+    return wall_time, parse_importtime(process.stderr)
+
+
+def format_import_tree(imports: pd.DataFrame, threshold_ms: float) -> str:
+    """
+    Format the imports that exceed a threshold as an ``-X importtime``-style tree.
+
+    Parameters
+    ----------
+    imports : pd.DataFrame
+        The per-module import cost (see ``parse_importtime``).
+    threshold_ms : float
+        Only modules whose cumulative import time exceeds this value are shown.
+
+    Returns
+    -------
+    str
+        The formatted tree.
+    """
+    lines = [f"{'self [ms]':>10} | {'cumulative':>10} | imported package"]
+    heavy = imports[imports["cumulative_us"] >= threshold_ms * 1000]
+    for _, row in heavy.iterrows():
+        lines.append(
+            f"{row['self_us'] / 1000:>10.1f} | {row['cumulative_us'] / 1000:>10.1f} | "
+            f"{'  ' * row['depth']}{row['module']}"
+        )
+    return "\n".join(lines)
+
+
+def local_commands() -> dict:
+    """
+    Collect the management commands defined by the project's own apps.
+
+    Returns
+    -------
+    dict
+        A mapping of command name to the app that defines it.
+    """
+    return {
+        name: app
+        for name, app in sorted(get_commands().items())
+        if isinstance(app, str) and app.startswith(LOCAL_APPS_PREFIX)
+    }
+
+
+class Command(BaseCommand):
+    help = "Measure the cold start of django.setup() and of the management commands."
+    env = environ.Env()
+    budget = env.float("STARTUP_BUDGET", default=5.0)
+    command_budget = env.float("COMMAND_STARTUP_BUDGET", default=10.0)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--commands",
+            nargs="*",
+            type=str,
+            help="The commands to profile (defaults to all of the project's commands).",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=self.budget,
+            help="The maximal cold start of django.setup(), in seconds.",
+        )
+        parser.add_argument(
+            "--command_budget",
+            type=float,
+            default=self.command_budget,
+            help="The maximal cold start of each management command, in seconds.",
+        )
+        parser.add_argument(
+            "--threshold_ms",
+            type=float,
+            default=50.0,
+            help="Only report modules whose cumulative import time exceeds this.",
+        )
+        parser.add_argument(
+            "--skip_commands",
+            action="store_true",
+            help="Only profile django.setup().",
+        )
+
+    def handle(self, *args, **kwargs):
+        settings_module = os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "config.settings.local"
+        )
+        targets = [("django.setup()", SETUP_SNIPPET, kwargs["budget"])]
+        if not kwargs["skip_commands"]:
+            commands = local_commands()
+            for name in kwargs["commands"] or commands:
+                if name not in commands:
+                    msg = f"Unknown command: {name}"
+                    raise CommandError(msg)
+                snippet = COMMAND_SNIPPET.format(app=commands[name], name=name)
+                targets.append((name, snippet, kwargs["command_budget"]))
+
+        over_budget = []
+        summary = []
+        for name, snippet, budget in targets:
+            try:
+                wall_time, imports = measure_startup(snippet, settings_module)
+            except CommandError as e:
+                self.stderr.write(f"\n### {name}\n{e}")
+                over_budget.append(name)
+                continue
+            import_time = imports.loc[imports["depth"] == 0, "cumulative_us"].sum()
+            summary.append((name, wall_time, import_time / 1e6, budget))
+            self.stdout.write(f"\n### {name} ({wall_time:.2f}s)")
+            self.stdout.write(format_import_tree(imports, kwargs["threshold_ms"]))
+            if wall_time > budget:
+                over_budget.append(name)
+
+        self.stdout.write("\n### Summary")
+        for name, wall_time, import_time, budget in summary:
+            self.stdout.write(
+                f"{name:<40} wall {wall_time:6.2f}s  imports {import_time:6.2f}s  "
+                f"budget {budget:6.2f}s"
+            )
+        if over_budget:
+            msg = f"Startup failed or exceeded budget: {', '.join(over_budget)}"
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("Startup is within budget."))
@@ -0,0 +1,25 @@
+from plasticityhub.scans.cohorts import bump_versions
+from plasticityhub.scans.models import Session
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+
+
+class Command(InstrumentedCommand):
+    help = "Recompute the derived fields (timestamp, date, time, session ID and age at scan) of sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subjects",
+            nargs="*",
+            type=str,
+            help="The IDs of the subjects whose sessions to refresh (defaults to all).",
+        )
+
+    def handle(self, *args, **kwargs):
+        sessions = Session.objects.all()
+        if kwargs["subjects"]:
+            sessions = sessions.filter(subject__subject_id__in=kwargs["subjects"])
+        count = sessions.refresh_derived_fields()
+        if count:
+            # the bulk update bypasses the signals that invalidate cached cohorts
+            bump_versions("sessions")
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {count} sessions."))
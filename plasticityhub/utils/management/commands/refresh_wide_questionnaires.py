@@ -0,0 +1,12 @@
+from plasticityhub.behavioral.wide import refresh_wide_responses
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+
+
+class Command(InstrumentedCommand):
+    help = "Rebuild the wide questionnaire table from the questionnaire responses."
+
+    def handle(self, *args, **kwargs):
+        count = refresh_wide_responses()
+        self.stdout.write(
+            self.style.SUCCESS(f"Wide questionnaire table refreshed ({count} rows).")
+        )
@@ -0,0 +1,328 @@
+from functools import partial
+
+import environ
+import pandas as pd
+
+from plasticityhub.scans.cohorts import bump_versions
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+from plasticityhub.utils.management.commands.aggregate_kepost_parcellations import (
+    aggregate_results,
+)
+from plasticityhub.utils.management.commands.populate_procedures import (
+    changed_kepost_outputs,
+    populate_kepost_procedures,
+)
+from plasticityhub.utils.management.commands.update_database import (
+    output_to_csv,
+    snapshot_sessions,
+    update_database_from_frame,
+)
+from plasticityhub.utils.management.commands.update_database_from_questionnaire import (
+    update_database_from_frame as update_questionnaires_from_frame,
+)
+from plasticityhub.utils.management.commands.update_database_from_seca import (
+    update_database_from_frame as update_seca_from_frame,
+)
+from plasticityhub.utils.management.commands.update_derivatives import (
+    output_to_csv_with_derivatives,
+)
+from plasticityhub.utils.matching import write_match_report
+from plasticityhub.utils.pipeline import (
+    ChangeSet,
+    SessionCache,
+    Stage,
+    StageGraph,
+    diff_snapshots,
+)
+from plasticityhub.utils.rawdata import index_rawdata as update_rawdata_index
+from plasticityhub.utils.sinks import (
+    EXPORT_STATE_FILE,
+    RSYNC_DESTINATION,
+    Exporter,
+    configured_sinks,
+    write_deliveries,
+)
+from plasticityhub.utils.sources import GoogleSheetSource, fetch_all, load_sheet
+
+STAGES = [
+    "fetch_sources",
+    "index_rawdata",
+    "update_database",
+    "update_derivatives",
+    "update_questionnaires",
+    "update_seca",
+    "probe_kepost",
+    "populate_procedures",
+    "aggregate_parcellations",
+]
+
+
+class Command(InstrumentedCommand):
+    help = "Run the daily pipeline (database, derivatives, questionnaires, SECA, procedures) in a single process."
+    env = environ.Env()
+    sheet_key = env("CRF_SHEET_KEY", default=None)
+    questionnaire_sheet_key = env("QUESTIONNAIRE_SHEET_KEY", default=None)
+    credentials = env("GSPREAD_CREDENTIALS", default=None)
+    authorized_user = env("GSPREAD_AUTHORIZED_USER", default=None)
+    mapped_rawdata_path = env("MAPPED_RAWDATA_PATH", default=None)
+    rawdata_roots = env.list("RAWDATA_ROOTS", default=[])
+    rawdata_index_path = env("RAWDATA_INDEX_PATH", default=None)
+    folder_id = env("GOOGLE_DRIVE_FOLDER_ID", default=None)
+    qnap_path = env("QNAP_PATH", default=None)
+    snapshot_dir = env("SHEET_SNAPSHOT_DIR", default=None)
+    seca_path = env("SECA_FILE_PATH", default=None)
+    rsync_destination = env("EXPORT_RSYNC_DESTINATION", default=RSYNC_DESTINATION)
+    export_dir = env("EXPORT_DIR", default=None)
+    export_state = env("EXPORT_STATE_FILE", default=EXPORT_STATE_FILE)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip",
+            nargs="*",
+            # the ingest stages read the fetched sources
+            choices=STAGES[1:],
+            default=[],
+            help="Stages to skip.",
+        )
+        parser.add_argument(
+            "--qnap_path",
+            type=str,
+            default=self.qnap_path,
+            help="The path to the QNAP directory (populate_procedures is skipped without it).",
+        )
+        parser.add_argument(
+            "--seca_path",
+            type=str,
+            default=self.seca_path,
+            help="The path to the SECA CSV export (update_seca is skipped without it).",
+        )
+        parser.add_argument(
+            "--destination",
+            type=str,
+            help="Where to store aggregated parcellations (skipped without it).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Run every stage on all sessions, regardless of upstream changes.",
+        )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="With --full, overwrite existing procedures and aggregated files.",
+        )
+        parser.add_argument(
+            "--snapshot_dir",
+            type=str,
+            default=self.snapshot_dir,
+            help="Directory of the sheet snapshots (re-downloaded only when a sheet changed).",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Read the sheet snapshots without contacting Google Sheets.",
+        )
+
+    def handle(self, *args, **kwargs):
+        cache = SessionCache()
+        full = kwargs["full"]
+        skip = set(kwargs["skip"])
+        if not kwargs["qnap_path"]:
+            skip.update(["probe_kepost", "populate_procedures"])
+        if not kwargs["destination"]:
+            skip.add("aggregate_parcellations")
+        if not self.questionnaire_sheet_key:
+            skip.add("update_questionnaires")
+        if not kwargs["seca_path"]:
+            skip.add("update_seca")
+        if (
+            not self.rawdata_roots
+            or not self.mapped_rawdata_path
+            or "update_database" in skip
+        ):
+            # the index is written to the mapped rawdata file update_database reads
+            skip.add("index_rawdata")
+        frames: dict = {}
+        fetch_timings: dict = {}
+        # deliveries run in the background while the next stages proceed
+        exporter = Exporter(self.export_state)
+
+        def fetch_sources(upstream: ChangeSet):
+            # all the sources are fetched concurrently, before any ingest stage
+            sheets = {
+                "update_database": self.sheet_key,
+                "update_questionnaires": self.questionnaire_sheet_key,
+            }
+            loaders = {
+                name: partial(
+                    load_sheet,
+                    GoogleSheetSource(
+                        sheet_key, self.credentials, self.authorized_user
+                    ),
+                    kwargs["snapshot_dir"],
+                    kwargs["offline"],
+                )
+                for name, sheet_key in sheets.items()
+                if name not in skip
+            }
+            if "update_seca" not in skip:
+                loaders["update_seca"] = partial(pd.read_csv, kwargs["seca_path"])
+            fetched, timings = fetch_all(loaders)
+            frames.update(fetched)
+            fetch_timings.update(timings)
+
+        def index_rawdata(upstream: ChangeSet):
+            stats = update_rawdata_index(
+                self.rawdata_roots,
+                self.mapped_rawdata_path,
+                self.rawdata_index_path,
+                full=full,
+            )
+            self.stdout.write(
+                f"Indexed {stats.sessions} rawdata sessions "
+                f"({stats.scanned} directories listed, {stats.reused} reused)."
+            )
+
+        def update_database(upstream: ChangeSet):
+            before = snapshot_sessions()
+            rejected = update_database_from_frame(
+                frames.pop("update_database"), self.mapped_rawdata_path
+            )
+            write_match_report(self, rejected, title="Rejected rows")
+            cache.invalidate()
+            exporter.export(
+                output_to_csv(sessions=cache.sessions),
+                configured_sinks(self.rsync_destination, self.export_dir),
+                force=full,
+            )
+            return ChangeSet(sessions=diff_snapshots(before, snapshot_sessions()))
+
+        def update_derivatives(upstream: ChangeSet):
+            out_file = output_to_csv_with_derivatives(sessions=cache.sessions)
+            # unchanged tables are not re-uploaded
+            exporter.export(
+                out_file,
+                configured_sinks(
+                    export_dir=self.export_dir,
+                    folder_id=self.folder_id,
+                    authorized_user=self.authorized_user,
+                ),
+                force=full,
+            )
+
+        def update_questionnaires(upstream: ChangeSet):
+            report = update_questionnaires_from_frame(
+                frames.pop("update_questionnaires"), bulk=True
+            )
+            write_match_report(self, report)
+
+        def update_seca(upstream: ChangeSet):
+            report = update_seca_from_frame(frames.pop("update_seca"))
+            write_match_report(self, report)
+
+        def probe_kepost(upstream: ChangeSet):
+            # the outputs populate_procedures parses, which may land on the
+            # QNAP on nights when their sessions did not change
+            session_ids = changed_kepost_outputs(kwargs["qnap_path"])
+            return ChangeSet(
+                kepost={
+                    session.pk
+                    for session in cache.sessions
+                    if session.session_id in session_ids
+                }
+            )
+
+        def populate_procedures(upstream: ChangeSet):
+            if full:
+                sessions, overwrite = cache.sessions, kwargs["overwrite"]
+            else:
+                # only re-parse the sessions whose data or kepost outputs changed
+                invalidated = upstream.get("sessions") | upstream.get("kepost")
+                sessions = [s for s in cache.sessions if s.pk in invalidated]
+                overwrite = True
+            changed = populate_kepost_procedures(
+                kwargs["qnap_path"], overwrite, sessions=sessions
+            )
+            return ChangeSet(procedures=changed)
+
+        def aggregate_parcellations(upstream: ChangeSet):
+            procedure_ids = None if full else upstream.get("procedures")
+            aggregate_results(
+                kwargs["destination"], kwargs["overwrite"], procedure_ids=procedure_ids
+            )
+
+        graph = StageGraph(
+            [
+                # the rawdata crawl overlaps with the sheet downloads
+                Stage("fetch_sources", fetch_sources),
+                Stage("index_rawdata", index_rawdata),
+                Stage(
+                    "update_database",
+                    update_database,
+                    requires=["fetch_sources", "index_rawdata"],
+                ),
+                # the derivatives export, the questionnaire sync and the kepost
+                # probe are independent
+                Stage(
+                    "update_derivatives",
+                    update_derivatives,
+                    requires=["update_database"],
+                ),
+                Stage(
+                    "update_questionnaires",
+                    update_questionnaires,
+                    requires=["update_database"],
+                ),
+                # both link sessions to their nearest events; run them one
+                # after the other so their bulk updates do not contend for rows
+                Stage(
+                    "update_seca",
+                    update_seca,
+                    requires=["update_database", "update_questionnaires"],
+                ),
+                Stage(
+                    "probe_kepost",
+                    probe_kepost,
+                    requires=["update_database"],
+                ),
+                Stage(
+                    "populate_procedures",
+                    populate_procedures,
+                    requires=["update_database", "probe_kepost"],
+                    consumes=["sessions", "kepost"],
+                ),
+                Stage(
+                    "aggregate_parcellations",
+                    aggregate_parcellations,
+                    requires=["populate_procedures"],
+                    consumes=["procedures"],
+                ),
+            ]
+        )
+        # load the shared sessions before the concurrent stages need them
+        if "update_database" in skip:
+            _ = cache.sessions
+        try:
+            timings, changes, unchanged = graph.run(
+                skip=skip, full=full, instrumentation=self.instrumentation
+            )
+        finally:
+            deliveries = exporter.close()
+        if changes or full:
+            # bulk writes bypass the signals that invalidate cached cohorts
+            bump_versions()
+
+        for name in STAGES:
+            if name in timings:
+                queries = self.instrumentation.report.stage(name).queries
+                self.stdout.write(
+                    f"{name:<30} {timings[name]:8.2f}s {queries:8d} queries"
+                )
+                if name == "fetch_sources":
+                    for source, seconds in fetch_timings.items():
+                        self.stdout.write(f"  {source:<28} {seconds:8.2f}s")
+            elif name in unchanged:
+                self.stdout.write(f"{name:<30} {'unchanged':>9}")
+        self.stdout.write(f"Changes: {changes!r}")
+        write_deliveries(self, deliveries)
+        self.stdout.write(self.style.SUCCESS("Daily pipeline completed successfully."))
@@ -1,23 +1,55 @@
 import json
-import os
+from typing import Optional
 
 import environ
-import gspread as gs
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.db.models.fields.json import KeyTransform
+from django.utils import timezone
 from pydrive.auth import GoogleAuth
 
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.wide import QUESTIONNAIRE_FIELDS
+from plasticityhub.scans.cohorts import bump_versions
 from plasticityhub.scans.models import Session
 from plasticityhub.studies.models import Condition, Group, Lab, Study
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import InstrumentedCommand
 from plasticityhub.utils.management.static.database_mapping import COLUMNS_MAPPING
-from plasticityhub.utils.management.static.questionnaire_mapping import (
-    QUESTIONNAIRE_MAPPING,
+from plasticityhub.utils.matching import write_match_report
+from plasticityhub.utils.normalization import normalize
+from plasticityhub.utils.pipeline import SESSION_RELATED_FIELDS
+from plasticityhub.utils.sinks import (
+    EXPORT_STATE_FILE,
+    RSYNC_DESTINATION,
+    Exporter,
+    configured_sinks,
+    write_deliveries,
 )
+from plasticityhub.utils.sources import GoogleSheetSource, SheetSource, load_sheet
 
 REMOTE_MOUNTS = {"/mnt/62": "\\132.66.46.62", "/mnt/snbb": "\\132.66.46.165"}
 CSV_OUTPUT_FILE = "sessions.csv"
+SNAPSHOT_FIELDS = [
+    "origin_session_id",
+    "subject_id",
+    "study_id",
+    "group_id",
+    "condition_id",
+    "lab_id",
+    "scan_tag",
+    "status",
+    "rawdata_path",
+    "age_at_scan",
+]
+# CRF column -> subject field
+SUBJECT_COLUMNS = {
+    column: mapping["field"]
+    for column, mapping in COLUMNS_MAPPING.items()
+    if mapping["scope"] == "subject"
+}
+BULK_BATCH_SIZE = 1000
 QUETIONNAIRE_KEYS = [
     "PI006",
     # "PI004",
@@ -36,121 +68,154 @@ QUETIONNAIRE_KEYS = [
 ]
 
 
-def gather_questionnaire_data(session: Session):
+def load_questionnaire_data(subject_ids=None) -> dict:
     """
-    Gather the questionnaire data from the session.
+    Load the first questionnaire response of every subject, with a single query.
 
-    Parameters
-    ----------
-    session : Session
-        The session to gather the data.
-    """
-    questionnaire = session.subject.questionnaire_responses.first()
-    if questionnaire is None:
-        return {}
-    result = {}
-    for key in QUESTIONNAIRE_MAPPING:
-        field = QUESTIONNAIRE_MAPPING.get(key).get("field")
-        if field:
-            result[field] = questionnaire.full_response.get(key)
-    return result
-
-
-def reformat_df(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Reformat the DataFrame to match the expected format for the database.
+    The answers are exported as stored in ``full_response``, rather than as
+    typed in the wide questionnaire table, so only the mapped keys are read.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The DataFrame to reformat.
+    subject_ids : Iterable[int], optional
+        Only load the responses of these subjects.
 
     Returns
     -------
-    pd.DataFrame
-        The reformatted DataFrame.
+    dict
+        A mapping of subject primary key to the subject's questionnaire fields.
     """
-    df.columns = df.columns.str.lower()
-    # drop repeated scanid, keep the first one
-    df = df.drop_duplicates(subset=["scanid"], keep="first")  # noqa: PD901
-    # drop rows with missing scanid
-    df.loc[:, "scanid"] = df.loc[:, "scanid"].replace("", pd.NA)
-    df = df.dropna(subset=["scanid"])  # noqa: PD901
-    # Convert the date of birth to a datetime object
-    df["dob"] = pd.to_datetime(df["dob"])
-
-    # Pad the questionnaire and ID with leading zeros
-    df["qcode"] = df["qcode"].astype(str).str.zfill(4)
-    df["id"] = df["id"].astype(str).str.zfill(9)
-
-    # Convert Sex to uppercase
-    df["gender"] = df["gender"].apply(lambda x: x[0].upper() if x else "U")
-
-    # Convert the protocol, study, and group to title case
-    for col in ["protocol", "study", "group"]:
-        df[col] = df[col].str.title()
+    responses = QuestionnaireResponse.objects.order_by("subject_id", "pk")
+    if subject_ids is not None:
+        responses = responses.filter(subject_id__in=subject_ids)
+    rows = responses.values_list(
+        "subject_id",
+        *[KeyTransform(key, "full_response") for key in QUESTIONNAIRE_FIELDS],
+    )
+    questionnaires: dict = {}
+    for subject_id, *answers in rows:
+        if subject_id not in questionnaires:
+            questionnaires[subject_id] = dict(
+                zip(QUESTIONNAIRE_FIELDS.values(), answers, strict=True)
+            )
+    return questionnaires
 
-    df["scantag"] = df["scantag"].str.lower()
 
-    df["name"] = df["name"].str.title().fillna("Unknown Unknown")
+def gather_questionnaire_data(session: Session, questionnaires: dict | None = None):
+    """
+    Gather the questionnaire data from the session.
 
-    # height - convert rows (where height is a number) to cm
-    df["height"] = df["height"].apply(
-        lambda x: x if x == "" else x if pd.isna(x) else float(x) * 100
-    )
-    return df
+    Parameters
+    ----------
+    session : Session
+        The session to gather the data.
+    questionnaires : dict, optional
+        Preloaded questionnaire data (see ``load_questionnaire_data``).
+    """
+    if questionnaires is None:
+        questionnaires = load_questionnaire_data(subject_ids=[session.subject_id])
+    return questionnaires.get(session.subject_id, {})
 
 
-def get_or_create_subject(subject_kwargs: dict, session_kwargs: dict):
+def resolve_subjects(crf_df: pd.DataFrame) -> dict:
     """
-    Get or create a subject and session based on the provided information.
+    Create or update the subjects of a (normalized) CRF sheet in bulk.
+
+    An attribute is taken from the latest session (by origin session ID)
+    that has it, and only overrides an existing value when that session is
+    not older than the subject's latest session in the database.
+    Blank values never override existing ones.
 
     Parameters
     ----------
-    subject_kwargs : dict
-        The keyword arguments to create the subject.
-    session_kwargs : dict
-        The keyword arguments to create the session.
+    crf_df : pd.DataFrame
+        The normalized rows of the sheet.
 
     Returns
     -------
-    Subject
-        The subject object.
-    Session
-        The session object.
+    dict
+        A mapping of subject ID to the (saved) subject.
     """
-    # check for existing subject
-    subject = Subject.objects.filter(
-        subject_id=subject_kwargs["subject_id"],
-        subject_code=subject_kwargs["subject_code"],
-    ).first()
-    # if subject exists, update the subject
-    if subject:
-        for key, value in subject_kwargs.items():
-            # check the existing attribute
-            if getattr(subject, key) == value or (not value):
-                continue
-            # update only if the session is later than the latest session
-            latest_session = subject.sessions.order_by("-timestamp").first()
-            if (
-                latest_session
-                and latest_session.origin_session_id
-                > session_kwargs["origin_session_id"]
-            ):
-                # check if the attribute is empty
-                if not getattr(subject, key):
-                    setattr(subject, key, value)
-
-                continue
-            # update the attribute if value is not empty
-            if value:
-                setattr(subject, key, value)
-        subject.save()
-    else:
-        subject, _ = Subject.objects.get_or_create(
-            **{key: value for key, value in subject_kwargs.items() if value},
+    incoming = crf_df[[*SUBJECT_COLUMNS, "scanid"]].rename(
+        columns={**SUBJECT_COLUMNS, "scanid": "origin_session_id"}
+    )
+    incoming = incoming.mask(incoming.eq("")).sort_values(
+        "origin_session_id", kind="stable"
+    )
+    fields = [field for field in SUBJECT_COLUMNS.values() if field != "subject_id"]
+    grouped = incoming.groupby("subject_id")
+    # the latest non-blank value of every attribute, and the session it is from
+    values = grouped[fields].last()
+    sources = pd.DataFrame(
+        {
+            field: incoming[incoming[field].notna()]
+            .groupby("subject_id")["origin_session_id"]
+            .last()
+            for field in fields
+        },
+        index=values.index,
+        columns=fields,
+    )
+
+    subjects = {
+        subject.subject_id: subject
+        for subject in Subject.objects.filter(subject_id__in=values.index).annotate(
+            latest_session=Max("sessions__origin_session_id")
+        )
+    }
+    existing = values.index[values.index.isin(list(subjects))]
+    current = pd.DataFrame(
+        [[getattr(subjects[pk], field) for field in fields] for pk in existing],
+        index=existing,
+        columns=fields,
+        dtype=object,
+    )
+    current = current.mask(current.eq(""))
+    latest_session = pd.Series(
+        [subjects[pk].latest_session or "" for pk in existing],
+        index=existing,
+        dtype=object,
+    )
+    new = values.loc[existing]
+    take = pd.DataFrame(index=existing, columns=fields, dtype=bool)
+    for field in fields:
+        blank = current[field].isna()
+        same = current[field].eq(new[field]) | (blank & new[field].isna())
+        # the value is from a session at least as recent as the subject's latest
+        newer = sources.loc[existing, field].fillna("").ge(latest_session)
+        take[field] = new[field].notna() & ~same & (newer | blank)
+
+    changed, changed_fields = [], set()
+    now = timezone.now()
+    for subject_id, row in take[take.any(axis=1)].iterrows():
+        subject = subjects[subject_id]
+        for field in row.index[row]:
+            setattr(subject, field, new.at[subject_id, field])
+            changed_fields.add(field)
+        subject.updated_at = now
+        changed.append(subject)
+    Subject.objects.bulk_update(
+        changed, [*sorted(changed_fields), "updated_at"], batch_size=BULK_BATCH_SIZE
+    )
+    # bulk updates bypass the signal that refreshes the sessions' ages
+    dob_changed = [subject.pk for subject in changed if subject.date_of_birth_changed()]
+    if dob_changed:
+        Session.objects.filter(subject_id__in=dob_changed).refresh_derived_fields()
+    for subject in changed:
+        subject.remember_date_of_birth()
+
+    created = [
+        Subject(
+            subject_id=subject_id,
+            **{field: value for field, value in row.items() if pd.notna(value)},
         )
-    return subject
+        for subject_id, row in values.drop(index=existing).iterrows()
+    ]
+    Subject.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+    subjects.update({subject.subject_id: subject for subject in created})
+    if changed or created:
+        bump_versions("subjects", "sessions")
+    return subjects
 
 
 def validate_existing_session(session_kwargs: dict):
@@ -184,7 +249,7 @@ def validate_existing_session(session_kwargs: dict):
     return False
 
 
-def process_row(row: pd.Series, mapped_rawdata: dict):
+def process_row(row: pd.Series, mapped_rawdata: dict, subject: Subject):
     """
     Process a row from the DataFrame and update the database with the information.
 
@@ -192,16 +257,16 @@ def process_row(row: pd.Series, mapped_rawdata: dict):
     ----------
     row : pd.Series
         The row to process.
+    mapped_rawdata : dict
+        The mapping of origin session ID to rawdata path.
+    subject : Subject
+        The row's subject (see ``resolve_subjects``).
     """
-    subject_kwargs = {}
     session_kwargs = {}
     for col, mapping in COLUMNS_MAPPING.items():
-        if mapping["scope"] == "subject":
-            subject_kwargs[mapping["field"]] = row[col]
-        elif mapping["scope"] == "session":
+        if mapping["scope"] == "session":
             session_kwargs[mapping["field"]] = row[col]
 
-    subject = get_or_create_subject(subject_kwargs, session_kwargs)
     study, _ = Study.objects.get_or_create(name=session_kwargs["study"])
     group, _ = Group.objects.get_or_create(
         name=session_kwargs["group"],
@@ -215,7 +280,6 @@ def process_row(row: pd.Series, mapped_rawdata: dict):
     subject.studies.add(study)
     subject.groups.add(group)
     subject.conditions.add(condition)
-    subject.save()
     session_kwargs.update(
         {
             "subject": subject,
@@ -226,52 +290,16 @@ def process_row(row: pd.Series, mapped_rawdata: dict):
         },
     )
     _ = validate_existing_session(session_kwargs)
-    session, _ = Session.objects.get_or_create(**session_kwargs)
-    rawdata_path = mapped_rawdata.get(session.origin_session_id)
-    if rawdata_path:
-        # for local_mount, remote_mount in REMOTE_MOUNTS.items():
-        #     rawdata_path = rawdata_path.replace(local_mount, remote_mount)
+    rawdata_path = mapped_rawdata.get(session_kwargs["origin_session_id"])
+    # for local_mount, remote_mount in REMOTE_MOUNTS.items():
+    #     rawdata_path = rawdata_path.replace(local_mount, remote_mount)
+    session, created = Session.objects.get_or_create(
+        **session_kwargs,
+        defaults={"rawdata_path": rawdata_path} if rawdata_path else {},
+    )
+    if not created and rawdata_path and session.rawdata_path != rawdata_path:
         session.rawdata_path = rawdata_path
-    session.save()
-
-
-def load_data_from_sheet(
-    sheet_key: str,
-    credentials: str,
-    authorized_user: str,
-) -> pd.DataFrame:
-    """
-    Load the data from a Google Sheet.
-
-    Parameters
-    ----------
-    sheet_key : str
-        The Google Sheet Key.
-    credentials : str
-        The path to the credentials file.
-    authorized_user : str
-        The authorized user email.
-
-    Returns
-    -------
-    pd.DataFrame
-        The data from the Google Sheet.
-    """
-    gc_kwargs = {}
-    if credentials:
-        gc_kwargs["credentials_filename"] = credentials
-    if authorized_user:
-        gc_kwargs["authorized_user_filename"] = authorized_user
-    try:
-        gc = gs.oauth(**gc_kwargs)  # type: ignore[arg-type]
-        sheet = gc.open_by_key(sheet_key)
-    except Exception as e:  # noqa: BLE001
-        print(f"Error loading the Google Sheet: {e}")  # noqa: T201
-        gc = gs.oauth()
-        sheet = gc.open_by_key(sheet_key)
-    worksheet = sheet.get_worksheet(0)
-    data = worksheet.get_all_values()
-    return pd.DataFrame(data[1:], columns=data[0])
+        session.save(update_fields=["rawdata_path", "updated_at"])
 
 
 def load_mapped_rawdata(mapped_rawdata_path: str) -> dict:
@@ -294,7 +322,13 @@ def load_mapped_rawdata(mapped_rawdata_path: str) -> dict:
 
 
 def update_database_from_sheet(
-    sheet_key: str, credentials: str, authorized_user: str, mapped_rawdata_path: str
+    sheet_key: str,
+    credentials: str,
+    authorized_user: str,
+    mapped_rawdata_path: str,
+    source: Optional[SheetSource] = None,
+    snapshot_dir: Optional[str] = None,
+    offline: bool = False,
 ):
     """
     Update the database with information from a Google Sheet.
@@ -307,32 +341,82 @@ def update_database_from_sheet(
         The path to the credentials file.
     authorized_user : str
         The authorized user email.
+    mapped_rawdata_path : str
+        The path to the mapped rawdata file.
+    source : SheetSource, optional
+        The sheet to read instead of the Google Sheet (e.g. a local export).
+    snapshot_dir : str, optional
+        The directory of the sheet snapshots; the sheet is only re-downloaded
+        when its revision changed.
+    offline : bool
+        Whether to read the snapshot without contacting the sheet.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows rejected by the normalization (see ``normalize``).
     """
-    # Load the data from the Google Sheet
-    crf_df = load_data_from_sheet(
-        sheet_key,
-        credentials,
-        authorized_user,
-    )
-    # Reformat the DataFrame
-    crf_df = reformat_df(crf_df)
+    # Load the data from the Google Sheet (or its snapshot)
+    source = source or GoogleSheetSource(sheet_key, credentials, authorized_user)
+    crf_df = load_sheet(source, snapshot_dir, offline)
+    return update_database_from_frame(crf_df, mapped_rawdata_path)
+
+
+def update_database_from_frame(
+    crf_df: pd.DataFrame, mapped_rawdata_path: str
+) -> pd.DataFrame:
+    """
+    Update the database with the rows of an already loaded CRF sheet.
+
+    Parameters
+    ----------
+    crf_df : pd.DataFrame
+        The rows of the sheet, as strings.
+    mapped_rawdata_path : str
+        The path to the mapped rawdata file.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows rejected by the normalization (see ``normalize``).
+    """
+    # Convert the columns and set the invalid rows aside
+    crf_df, rejected = normalize(crf_df, COLUMNS_MAPPING, key="scanid")
 
     # Load the mapped rawdata
     mapped_rawdata = load_mapped_rawdata(mapped_rawdata_path)
+    subjects = resolve_subjects(crf_df)
     # Update the database with the information from the DataFrame
-    for i, row in tqdm.tqdm(crf_df.iterrows()):
+    for i, row in tqdm.tqdm(crf_df.iterrows(), total=len(crf_df)):
         try:
-            process_row(row, mapped_rawdata)
+            process_row(row, mapped_rawdata, subjects[row["id"]])
         except Exception as e:  # noqa: BLE001
+            # the rows are validated, so only database errors end up here
             print(f"\nError processing row {i}:\n")  # noqa: T201
-            print(f"name: {row['name']}")
-            print(f"scanid: {row['scanid']}")
+            print(f"name: {row['name']}")  # noqa: T201
+            print(f"scanid: {row['scanid']}")  # noqa: T201
             print(f"Error: {e}")  # noqa: T201
-            if "date" in e.args[0]:
-                raise e
+    return rejected
 
 
-def output_to_csv(output_path: str = CSV_OUTPUT_FILE):
+def snapshot_sessions() -> dict:
+    """
+    Take a snapshot of the sessions' ingested fields.
+
+    Returns
+    -------
+    dict
+        A mapping of session primary key to the values of SNAPSHOT_FIELDS.
+    """
+    return {
+        pk: values
+        for pk, *values in Session.objects.values_list("pk", *SNAPSHOT_FIELDS)
+    }
+
+
+def output_to_csv(
+    output_path: str = CSV_OUTPUT_FILE, sessions: Optional[list[Session]] = None
+):
     """
     Output all sessions and some relevant information to a CSV file.
 
@@ -340,81 +424,63 @@ def output_to_csv(output_path: str = CSV_OUTPUT_FILE):
     ----------
     output_path : str
         The path to the output CSV file.
+    sessions : list[Session], optional
+        Already loaded sessions to output, by default all sessions.
+
+    Returns
+    -------
+    str
+        The path to the output CSV file, for the export sinks to deliver.
     """
-    sessions = Session.objects.all()
-    df = pd.DataFrame(
-        index=range(len(sessions)),
-        columns=[
-            "subject_code",
-            "subject_id",
-            "dob",
-            "age_at_scan",
-            "sex",
-            "session_id",
-            "study",
-            "group",
-            "condition",
-            "path",
-        ],
-    )
-    for i, session in enumerate(sessions):
-        for key, value in zip(
-            [
-                "subject_code",
-                "subject_id",
-                "dob",
-                "age_at_scan",
-                "sex",
-                "weight",
-                "height",
-                "session_id",
-                "study",
-                "group",
-                "condition",
-                "path",
-            ],
-            [
-                session.subject.subject_code,
-                session.subject.subject_id,
-                session.subject.date_of_birth,
-                session.age_at_scan,
-                session.subject.sex,
-                session.subject.weight,
-                session.subject.height,
-                session.session_id,
-                session.study.name,
-                session.group.name,
-                session.condition.name,
-                session.rawdata_path,
-            ],
-            strict=False,
-        ):
-            df.loc[i, key] = value
-        # df.loc[i] = [
-        #     session.subject.subject_code,
-        #     session.subject.subject_id,
-        #     session.subject.date_of_birth,
-        #     session.age_at_scan,
-        #     session.subject.sex,
-        #     session.session_id,
-        #     session.study.name,
-        #     session.group.name,
-        #     session.condition.name,
-        #     session.rawdata_path,
-        # ]
-        for key, value in gather_questionnaire_data(session).items():
+    if sessions is None:
+        sessions = list(Session.objects.select_related(*SESSION_RELATED_FIELDS))
+    questionnaires = load_questionnaire_data()
+    columns = [
+        "subject_code",
+        "subject_id",
+        "dob",
+        "age_at_scan",
+        "sex",
+        "session_id",
+        "study",
+        "group",
+        "condition",
+        "path",
+        "weight",
+        "height",
+    ]
+    records = []
+    for session in sessions:
+        record = {
+            "subject_code": session.subject.subject_code,
+            "subject_id": session.subject.subject_id,
+            "dob": session.subject.date_of_birth,
+            "age_at_scan": session.age_at_scan,
+            "sex": session.subject.sex,
+            "weight": session.subject.weight,
+            "height": session.subject.height,
+            "session_id": session.session_id,
+            "study": session.study.name,
+            "group": session.group.name,
+            "condition": session.condition.name,
+            "path": session.rawdata_path,
+        }
+        for key, value in gather_questionnaire_data(session, questionnaires).items():
             if key in ["weight", "height"]:
                 # only insert value if it doesn't exist
-                if pd.isna(df.loc[i, key]) or df.loc[i, key] == "":
-                    df.loc[i, key] = value
+                if pd.isna(record[key]) or record[key] == "":
+                    record[key] = value
             else:
                 # insert value regardless
-                df.loc[i, key] = value
+                record[key] = value
+                if key not in columns:
+                    columns.append(key)
+        records.append(record)
+    # the frame is built at once, as setting it cell by cell is slow
+    df = pd.DataFrame.from_records(records, columns=columns)
     df["path"] = df["path"].replace("", pd.NA)
     df.to_csv(output_path, index=False)
-    os.system(
-        f"rsync -azPL {output_path} yalab_dev@biden.tau.ac.il:/home/yalab_dev/yalab-devops"
-    )
+    return output_path
 
 
 def output_to_csv_with_derivatives(output_path: str = CSV_OUTPUT_FILE):
@@ -442,18 +508,20 @@ def output_to_csv_with_derivatives(output_path: str = CSV_OUTPUT_FILE):
         ]
     df["path"] = df["path"].replace("", pd.NA)
     df.to_csv(output_path, index=False)
-    os.system(
-        f"rsync -azPL {output_path} yalab_dev@biden.tau.ac.il:/home/yalab_dev/yalab-devops"
-    )
+    return output_path
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Update the database with information from an Excel file."
     env = environ.Env()
     sheet_key = env("CRF_SHEET_KEY", default=None)
     credentials = env("GSPREAD_CREDENTIALS", default=None)
     authorized_user = env("GSPREAD_AUTHORIZED_USER", default=None)
     mapped_rawdata_path = env("MAPPED_RAWDATA_PATH", default=None)
+    snapshot_dir = env("SHEET_SNAPSHOT_DIR", default=None)
+    rsync_destination = env("EXPORT_RSYNC_DESTINATION", default=RSYNC_DESTINATION)
+    export_dir = env("EXPORT_DIR", default=None)
+    export_state = env("EXPORT_STATE_FILE", default=EXPORT_STATE_FILE)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -484,13 +552,49 @@ class Command(BaseCommand):
             help="Path to the mapped rawdata file",
             default=self.mapped_rawdata_path,
         )
+        parser.add_argument(
+            "--snapshot_dir",
+            type=str,
+            default=self.snapshot_dir,
+            help="Directory of the sheet snapshots (re-downloaded only when the sheet changed).",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Read the sheet snapshot without contacting Google Sheets.",
+        )
+        parser.add_argument(
+            "--report",
+            type=str,
+            help="Path to a CSV file to store the rejected rows.",
+        )
+        parser.add_argument(
+            "--force_export",
+            action="store_true",
+            help="Deliver the sessions CSV even if it did not change since the last delivery.",
+        )
 
     def handle(self, *args, **kwargs):
         sheet_key = kwargs["sheet_key"]
         credentials = kwargs["credentials"]
         authorized_user = kwargs["authorized_user"]
-        update_database_from_sheet(
-            sheet_key, credentials, authorized_user, kwargs["mapped_rawdata_path"]
+        with self.instrumentation.stage("update_database"):
+            rejected = update_database_from_sheet(
+                sheet_key,
+                credentials,
+                authorized_user,
+                kwargs["mapped_rawdata_path"],
+                snapshot_dir=kwargs["snapshot_dir"],
+                offline=kwargs["offline"],
+            )
+        write_match_report(self, rejected, kwargs["report"], title="Rejected rows")
+        with self.instrumentation.stage("output_to_csv"):
+            out_file = output_to_csv()
+        exporter = Exporter(self.export_state)
+        exporter.export(
+            out_file,
+            configured_sinks(self.rsync_destination, self.export_dir),
+            force=kwargs["force_export"],
         )
-        output_to_csv()
+        write_deliveries(self, exporter.close())
         self.stdout.write(self.style.SUCCESS("Database updated successfully."))
@@ -1,117 +1,110 @@
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
 
 from plasticityhub.scans.models import Session
 from plasticityhub.studies.models import Condition, Group, Lab, Study
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+from plasticityhub.utils.matching import write_match_report
+from plasticityhub.utils.normalization import REJECTION_COLUMNS, normalize
+from plasticityhub.utils.workbooks import (
+    DEFAULT_BATCH_SIZE,
+    prefetch,
+    read_workbook_batches,
+)
 
 COLUMNS_MAPPING = {
     "name": {
         "scope": "subject",
         "field": "name",
+        "dtype": "title",
+        "default": "Unknown Unknown",
     },
     "dob": {
         "scope": "subject",
         "field": "date_of_birth",
+        "dtype": "date",
     },
     "id": {
         "scope": "subject",
         "field": "subject_id",
+        "dtype": "code",
+        "width": 9,
+        "required": True,
     },
     "email": {
         "scope": "subject",
         "field": "email",
+        "dtype": "text",
     },
     "cellular no.": {
         "scope": "subject",
         "field": "phone",
+        "dtype": "text",
     },
     "gender": {
         "scope": "subject",
         "field": "sex",
+        "dtype": "sex",
     },
     "height": {
         "scope": "subject",
         "field": "height",
+        "dtype": "height",
     },
     "weight": {
         "scope": "subject",
         "field": "weight",
+        "dtype": "float",
     },
     "protocol": {
         "scope": "session",
         "field": "study",
+        "dtype": "title",
+        "required": True,
     },
     "study": {
         "scope": "session",
         "field": "group",
+        "dtype": "title",
+        "required": True,
     },
     "group": {
         "scope": "session",
         "field": "condition",
+        "dtype": "title",
+        "required": True,
     },
     "lab": {
         "scope": "session",
         "field": "lab",
+        "dtype": "text",
+        "required": True,
     },
     "scantag": {
         "scope": "session",
         "field": "scan_tag",
+        "dtype": "lower",
+        "default": "",
     },
     "qcode": {
         "scope": "subject",
         "field": "subject_code",
+        "dtype": "code",
+        "width": 4,
     },
     "scanid": {
         "scope": "session",
         "field": "session_id",
+        "dtype": "text",
+        "required": True,
     },
 }
 
 
-def reformat_df(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Reformat the DataFrame to match the expected format for the database.
-
-    Parameters
-    ----------
-    df : pd.DataFrame
-        The DataFrame to reformat.
-
-    Returns
-    -------
-    pd.DataFrame
-        The reformatted DataFrame.
-    """
-    df.columns = df.columns.str.lower()
-    # drop repeated scanid, keep the first one
-    df = df.drop_duplicates(subset=["scanid"], keep="first")  # noqa: PD901
-    # drop rows with missing scanid
-    df["scanid"] = df["scanid"].replace("", pd.NA)
-    df = df.dropna(subset=["scanid"])  # noqa: PD901
-    # Convert the date of birth to a datetime object
-    df["dob"] = pd.to_datetime(df["dob"])
-
-    # Pad the questionnaire and ID with leading zeros
-    df["qcode"] = df["qcode"].astype(str).str.zfill(4)
-    df["id"] = df["id"].astype(str).str.zfill(9)
-
-    # Convert Sex to uppercase
-    df["gender"] = df["gender"].apply(lambda x: x[0].upper())
-
-    # Convert the protocol, study, and group to title case
-    for col in ["protocol", "study", "group"]:
-        df[col] = df[col].str.title()
-
-    df["scantag"] = df["scantag"].str.lower()
-
-    df["name"] = df["name"].str.title().fillna("Unknown Unknown")
-    return df
-
-
 def get_or_create_subject(subject_kwargs: dict, session_kwargs: dict):
     """
     Get or create a subject and session based on the provided information.
@@ -198,36 +191,93 @@ def process_row(row: pd.Series):
     _, _ = Session.objects.get_or_create(**session_kwargs)  # noqa: RUF100
 
 
-def update_database_from_file(in_file: Path):
+def iter_crf_batches(
+    in_file: Path, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
     """
-    Update the database with information from a CSV file.
+    Stream the normalized rows of a CRF workbook in batches.
 
     Parameters
     ----------
     in_file : Path
-        The path to the input CSV file containing the data to update the database with.
+        The path to the CRF workbook.
+    batch_size : int
+        The number of rows per batch.
+
+    Yields
+    ------
+    pd.DataFrame
+        The valid rows; a scan ID is only kept the first time it appears
+        in the workbook, as when the whole workbook is normalized at once.
+    pd.DataFrame
+        The rejected rows (see ``normalize``).
+    """
+    seen: set = set()
+    for batch in read_workbook_batches(in_file, batch_size):
+        yield normalize(batch, COLUMNS_MAPPING, key="scanid", seen=seen)
+
+
+def update_database_from_file(
+    in_file: Path, batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
     """
-    # Read the data from the input file
-    crf_df = pd.read_excel(in_file)
-    # Reformat the DataFrame
-    crf_df = reformat_df(crf_df)
+    Update the database with information from a CRF workbook.
+
+    The workbook is parsed in a background thread, one batch ahead
+    of the database writes.
+
+    Parameters
+    ----------
+    in_file : Path
+        The path to the input Excel file containing the data to update the database with.
+    batch_size : int
+        The number of rows parsed at a time.
 
-    # Update the database with the information from the DataFrame
-    for i, row in tqdm.tqdm(crf_df.iterrows()):
-        try:
-            process_row(row)
-        except Exception as e:  # noqa: BLE001
-            print(f"Error processing row {i}: {row}")  # noqa: T201
-            print(e)  # noqa: T201
+    Returns
+    -------
+    pd.DataFrame
+        The rows rejected by the normalization (see ``normalize``).
+    """
+    progress = tqdm.tqdm()
+    rejected = []
+    for batch, batch_rejected in prefetch(iter_crf_batches(in_file, batch_size)):
+        rejected.append(batch_rejected)
+        # Update the database with the information from the DataFrame
+        for i, row in batch.iterrows():
+            try:
+                process_row(row)
+            except Exception as e:  # noqa: BLE001
+                # the rows are validated, so only database errors end up here
+                print(f"Error processing row {i}: {row}")  # noqa: T201
+                print(e)  # noqa: T201
+        progress.update(len(batch))
+    progress.close()
+    return (
+        pd.concat(rejected, ignore_index=True)
+        if rejected
+        else pd.DataFrame(columns=REJECTION_COLUMNS)
+    )
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Update the database with information from an Excel file."
 
     def add_arguments(self, parser):
         parser.add_argument("infile", type=str, help="Path to the input Excel file")
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The number of rows parsed at a time.",
+        )
+        parser.add_argument(
+            "--report",
+            type=str,
+            help="Path to a CSV file to store the rejected rows.",
+        )
 
     def handle(self, *args, **kwargs):
         infile = Path(kwargs["infile"])
-        update_database_from_file(infile)
+        rejected = update_database_from_file(infile, kwargs["batch_size"])
+        write_match_report(self, rejected, kwargs["report"], title="Rejected rows")
         self.stdout.write(self.style.SUCCESS("Database updated successfully."))
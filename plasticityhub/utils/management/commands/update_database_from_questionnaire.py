@@ -1,16 +1,23 @@
+import datetime
+
 import environ
-import gspread as gs
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
 
+from plasticityhub.behavioral.alignment import EVENT_COLUMNS, align_sessions, localize
 from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.wide import refresh_wide_responses
 from plasticityhub.scans.models import Session
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import InstrumentedCommand
 from plasticityhub.utils.management.static.questionnaire_mapping import (
     COLUMNS_MAPPING,
     QUESTIONNAIRE_MAPPING,
 )
+from plasticityhub.utils.matching import match_rows, write_match_report
+from plasticityhub.utils.sources import GoogleSheetSource, SheetSource, load_sheet
+
+BULK_BATCH_SIZE = 1000
 
 
 def reformat_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -38,43 +45,6 @@ def reformat_df(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load_data_from_sheet(
-    sheet_key: str, credentials: str, authorized_user: str
-) -> pd.DataFrame:
-    """
-    Load the data from a Google Sheet.
-
-    Parameters
-    ----------
-    sheet_key : str
-        The Google Sheet Key.
-    credentials : str
-        The path to the credentials file.
-    authorized_user : str
-        The authorized user email.
-
-    Returns
-    -------
-    pd.DataFrame
-        The data from the Google Sheet.
-    """
-    gc_kwargs = {}
-    if credentials:
-        gc_kwargs["credentials_filename"] = credentials
-    if authorized_user:
-        gc_kwargs["authorized_user_filename"] = authorized_user
-    try:
-        gc = gs.oauth(**gc_kwargs)  # type: ignore[arg-type]
-        sheet = gc.open_by_key(sheet_key)
-    except Exception as e:  # noqa: BLE001
-        print(f"Error loading the Google Sheet: {e}")  # noqa: T201
-        gc = gs.oauth()
-        sheet = gc.open_by_key(sheet_key)
-    worksheet = sheet.get_worksheet(0)
-    data = worksheet.get_all_values()
-    return pd.DataFrame(data[1:], columns=data[0])
-
-
 def make_questionnaire_response(subject: Subject, row: pd.Series):
     """
     Create a QuestionnaireResponse object from a row in the DataFrame.
@@ -96,66 +66,181 @@ def make_questionnaire_response(subject: Subject, row: pd.Series):
     return questionnaire_response
 
 
-def update_sessions(subject: Subject, questionnaire_response: QuestionnaireResponse):
+def process_row(row: pd.Series, subject: Subject):
     """
-    Update the sessions with the questionnaire response.
+    Process a row from the DataFrame.
 
     Parameters
     ----------
+    row : pd.Series
+        The row to process.
     subject : Subject
-        The subject associated with the questionnaire response.
-    questionnaire_response : QuestionnaireResponse
-        The questionnaire response to associate with the sessions.
-    """
-    for session in subject.sessions.all():
-        session.questionnaire_response = questionnaire_response
-        if questionnaire_response.full_response["Questionnaire"] != "No":
-            session.time_between_questionnaire_and_scan = (  # type: ignore[attr-defined]
-                session.timestamp - questionnaire_response.timestamp
-            )
-        session.save()
-        # if session.questionnaire_response is None:
-        # else:
-        #     # check to see if the current response is closer in time to the session
-        #     if (
-        #         session.questionnaire_response.timestamp
-        #         and questionnaire_response.timestamp
-        #         and abs(session.questionnaire_response.timestamp - session.timestamp)
-        #         > abs(questionnaire_response.timestamp - session.timestamp)
-        #     ):
-        #         session.questionnaire_response = questionnaire_response
-        #         session.time_between_questionnaire_and_scan = (  # type: ignore[attr-defined]
-        #             session.timestamp - questionnaire_response.timestamp
-        #         )
-        #         session.save()
-
-
-def process_row(row: pd.Series):
+        The subject the row was matched to (see ``match_subjects``).
     """
-    Process a row from the DataFrame.
+    questionnaire_response = make_questionnaire_response(subject, row)
+    subject.questionnaire_responses.add(questionnaire_response)
+
+
+def match_subjects(q_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Match the questionnaire rows to subjects by their subject code,
+    using a single query and an in-memory hash join.
 
     Parameters
     ----------
-    row : pd.Series
-        The row to process.
+    q_df : pd.DataFrame
+        The reformatted questionnaire DataFrame.
+
+    Returns
+    -------
+    pd.DataFrame
+        The filled questionnaires that matched exactly one subject,
+        with the subject's primary key in a ``subject_pk`` column.
+    pd.DataFrame
+        The rows that matched no subject or more than one.
+    """
+    keys = pd.DataFrame.from_records(
+        Subject.objects.exclude(subject_code="").values_list("pk", "subject_code"),
+        columns=["subject_pk", "subject_code"],
+    )
+    filled = q_df[q_df["Questionnaire"] != "No"]
+    return match_rows(filled, keys, left_on=["Subject Code"], right_on=["subject_code"])
+
+
+def response_key(subject_code: str, full_response: dict) -> tuple:
+    """
+    The natural key of a questionnaire response.
+
+    Parameters
+    ----------
+    subject_code : str
+        The subject's questionnaire code.
+    full_response : dict
+        The response to the questionnaire.
+
+    Returns
+    -------
+    tuple
+        The (subject_code, QTimeStamp) pair.
+    """
+    return subject_code, full_response.get("QTimeStamp")
+
+
+def link_sessions(subject_ids, tolerance: datetime.timedelta | None = None) -> int:
+    """
+    Link the subjects' sessions to their questionnaire response closest in time,
+    with a single update.
+
+    Parameters
+    ----------
+    subject_ids : Iterable[int]
+        The primary keys of the subjects whose sessions to update.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its response.
+
+    Returns
+    -------
+    int
+        The number of sessions that changed.
     """
-    subject_code = row.get("Subject Code")
-    subjects = Subject.objects.filter(subject_code=subject_code)
-    if not subjects.exists():
-        print(f"Error on row {row.name}: Subject with code {subject_code} not found")
-        return
-    if subjects.count() > 1:
-        print(
-            f"Error on row {row.name}: Multiple subjects found with code {subject_code}"
+    responses = pd.DataFrame.from_records(
+        QuestionnaireResponse.objects.filter(subject_id__in=subject_ids)
+        .exclude(full_response__Questionnaire="No")
+        .values_list("pk", "subject_id", "full_response__QTimeStamp"),
+        columns=EVENT_COLUMNS,
+    )
+    responses["event_timestamp"] = localize(
+        pd.to_datetime(responses["event_timestamp"], format="%m/%d/%Y", errors="coerce")
+    )
+    return align_sessions(
+        responses,
+        "questionnaire_response",
+        "time_between_scan_and_questionnaire",
+        subject_ids,
+        tolerance,
+    )
+
+
+def bulk_update_database(
+    q_df: pd.DataFrame, tolerance: datetime.timedelta | None = None
+) -> pd.DataFrame:
+    """
+    Upsert the questionnaire responses, keyed on (subject_code, QTimeStamp),
+    instead of truncating and re-inserting the whole table.
+
+    Parameters
+    ----------
+    q_df : pd.DataFrame
+        The reformatted questionnaire DataFrame.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its response.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that matched no subject or more than one.
+    """
+    matched, report = match_subjects(q_df)
+    subjects = Subject.objects.in_bulk(matched["subject_pk"].unique().tolist())
+    existing: dict = {}
+    duplicates = []
+    for response in QuestionnaireResponse.objects.with_full_response().select_related(
+        "subject"
+    ):
+        key = response_key(response.subject.subject_code, response.full_response)
+        if key in existing:
+            duplicates.append(response.pk)
+            continue
+        existing[key] = response
+    seen = set()
+    to_create, to_update = [], []
+    for _, row in matched.iterrows():
+        subject = subjects[row["subject_pk"]]
+        full_response = row[q_df.columns].to_dict()
+        key = response_key(subject.subject_code, full_response)
+        seen.add(key)
+        response = existing.get(key)
+        if response is None:
+            response = QuestionnaireResponse(
+                subject=subject, full_response=full_response
+            )
+            existing[key] = response
+            to_create.append(response)
+        elif response.full_response != full_response:
+            response.full_response = full_response
+            to_update.append(response)
+    QuestionnaireResponse.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+    QuestionnaireResponse.objects.bulk_update(
+        to_update, ["full_response"], batch_size=BULK_BATCH_SIZE
+    )
+    refresh_wide_responses(response.pk for response in to_create + to_update)
+    # remove responses that are no longer in the sheet, without cascading to sessions
+    stale = duplicates + [
+        response.pk for key, response in existing.items() if key not in seen
+    ]
+    stale_subjects = set(
+        QuestionnaireResponse.objects.filter(pk__in=stale).values_list(
+            "subject_id", flat=True
         )
-        return
-    subject = subjects.first()
-    questionnaire_response = make_questionnaire_response(subject, row)  # type: ignore[arg-type]
-    subject.questionnaire_responses.add(questionnaire_response)  # type: ignore[union-attr]
-    update_sessions(subject, questionnaire_response)  # type: ignore[arg-type]
+    )
+    Session.objects.filter(questionnaire_response__in=stale).update(
+        questionnaire_response=None, time_between_scan_and_questionnaire=None
+    )
+    QuestionnaireResponse.objects.filter(pk__in=stale).delete()
+    link_sessions(list(stale_subjects | set(subjects)), tolerance)
+    return report
 
 
-def update_database_from_sheet(sheet_key: str, credentials: str, authorized_user: str):
+def update_database_from_sheet(
+    sheet_key: str,
+    credentials: str,
+    authorized_user: str,
+    bulk: bool = False,
+    tolerance: datetime.timedelta | None = None,
+    source: SheetSource | None = None,
+    snapshot_dir: str | None = None,
+    offline: bool = False,
+) -> pd.DataFrame:
     """
     Update the database with information from a Google Sheet.
 
@@ -167,34 +252,86 @@ def update_database_from_sheet(sheet_key: str, credentials: str, authorized_user
         The path to the credentials file.
     authorized_user : str
         The authorized user email.
+    bulk : bool
+        Whether to upsert the responses in bulk instead of reloading them row by row.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its response.
+        Sessions without a response within the tolerance are left unlinked.
+    source : SheetSource, optional
+        The sheet to read instead of the Google Sheet (e.g. a local export).
+    snapshot_dir : str, optional
+        The directory of the sheet snapshots; the sheet is only re-downloaded
+        when its revision changed.
+    offline : bool
+        Whether to read the snapshot without contacting the sheet.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that matched no subject or more than one.
+    """
+    # Load the data from the Google Sheet (or its snapshot)
+    source = source or GoogleSheetSource(sheet_key, credentials, authorized_user)
+    q_df = load_sheet(source, snapshot_dir, offline)
+    return update_database_from_frame(q_df, bulk=bulk, tolerance=tolerance)
+
+
+def update_database_from_frame(
+    q_df: pd.DataFrame,
+    bulk: bool = False,
+    tolerance: datetime.timedelta | None = None,
+) -> pd.DataFrame:
+    """
+    Update the database with the rows of an already loaded questionnaire sheet.
+
+    Parameters
+    ----------
+    q_df : pd.DataFrame
+        The rows of the sheet, as strings.
+    bulk : bool
+        Whether to upsert the responses in bulk instead of reloading them row by row.
+    tolerance : datetime.timedelta, optional
+        The maximal time between a session and its response.
+        Sessions without a response within the tolerance are left unlinked.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that matched no subject or more than one.
     """
-    QuestionnaireResponse.objects.all().delete()
-    # Load the data from the Google Sheet
-    q_df = load_data_from_sheet(
-        sheet_key,
-        credentials,
-        authorized_user,
-    )
     # Reformat the DataFrame
     q_df = reformat_df(q_df)
+    if bulk:
+        return bulk_update_database(q_df, tolerance)
+
+    # unlink the sessions first, so deleting the responses does not cascade to them
+    Session.objects.update(
+        questionnaire_response=None, time_between_scan_and_questionnaire=None
+    )
+    QuestionnaireResponse.objects.all().delete()
+    matched, report = match_subjects(q_df)
+    subjects = Subject.objects.in_bulk(matched["subject_pk"].unique().tolist())
 
     # Update the database with the information from the DataFrame
-    for i, row in tqdm.tqdm(q_df.iterrows()):
+    for i, row in tqdm.tqdm(matched.iterrows(), total=len(matched)):
         try:
-            if row["Questionnaire"] == "No":
-                continue
-            process_row(row)
+            process_row(row[q_df.columns], subjects[row["subject_pk"]])
         except Exception as e:  # noqa: BLE001
             print(f"\nError processing row {i}: {row}")  # noqa: T201
             print(e)  # noqa: T201
+    refresh_wide_responses()
+    link_sessions(list(subjects), tolerance)
+    return report
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Update the database with information from an Excel file."
     env = environ.Env()
     sheet_key = env("QUESTIONNAIRE_SHEET_KEY", default=None)
     credentials = env("GSPREAD_CREDENTIALS", default=None)
     authorized_user = env("GSPREAD_AUTHORIZED_USER", default=None)
+    tolerance_days = env.float("QUESTIONNAIRE_TOLERANCE_DAYS", default=None)
+    snapshot_dir = env("SHEET_SNAPSHOT_DIR", default=None)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -218,10 +355,51 @@ class Command(BaseCommand):
             help="Authorized user email",
             default=self.authorized_user,
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Upsert the responses in bulk instead of reloading the table.",
+        )
+        parser.add_argument(
+            "--report",
+            type=str,
+            help="Path to a CSV file to store the unmatched and ambiguous rows.",
+        )
+        parser.add_argument(
+            "--tolerance_days",
+            type=float,
+            default=self.tolerance_days,
+            help="The maximal number of days between a session and its response.",
+        )
+        parser.add_argument(
+            "--snapshot_dir",
+            type=str,
+            default=self.snapshot_dir,
+            help="Directory of the sheet snapshots (re-downloaded only when the sheet changed).",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Read the sheet snapshot without contacting Google Sheets.",
+        )
 
     def handle(self, *args, **kwargs):
         sheet_key = kwargs["sheet_key"]
         credentials = kwargs["credentials"]
         authorized_user = kwargs["authorized_user"]
-        update_database_from_sheet(sheet_key, credentials, authorized_user)
+        tolerance = (
+            datetime.timedelta(days=kwargs["tolerance_days"])
+            if kwargs["tolerance_days"] is not None
+            else None
+        )
+        report = update_database_from_sheet(
+            sheet_key,
+            credentials,
+            authorized_user,
+            bulk=kwargs["bulk"],
+            tolerance=tolerance,
+            snapshot_dir=kwargs["snapshot_dir"],
+            offline=kwargs["offline"],
+        )
+        write_match_report(self, report, kwargs["report"])
         self.stdout.write(self.style.SUCCESS("Database updated successfully."))
@@ -2,16 +2,18 @@ import environ
 import gspread as gs
 import pandas as pd
 import tqdm
-from django.core.management.base import BaseCommand
 
+from plasticityhub.behavioral.alignment import EVENT_COLUMNS, align_sessions
 from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
 from plasticityhub.behavioral.seca import SECAMeasurement
 from plasticityhub.scans.models import Session
 from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import InstrumentedCommand
 from plasticityhub.utils.management.static.seca_mapping import (
     COLUMNS_MAPPING,
     SECA_MAPPING,
 )
+from plasticityhub.utils.matching import match_rows, write_match_report
 
 
 def reformat_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -60,40 +62,32 @@ def make_seca_measurement(subject: Subject, row: pd.Series):
     return seca_measurement
 
 
-def update_sessions(subject: Subject, seca_measurement: SECAMeasurement):
+def assign_measurements(subject_ids) -> int:
     """
-    Update the sessions with the questionnaire response.
+    Assign every session of the given subjects the SECA measurement closest to it in time.
 
     Parameters
     ----------
-    subject : Subject
-        The subject associated with the questionnaire response.
-    seca_measurement : SECAMeasurement
-        The SECA measurement to associate with the sessions.
+    subject_ids : Iterable[int]
+        The primary keys of the subjects whose sessions to update.
+
+    Returns
+    -------
+    int
+        The number of sessions whose measurement changed.
     """
-    for session in subject.sessions.all():
-        if session.seca_measurement is None:
-            session.seca_measurement = seca_measurement
-            session.time_between_scan_and_seca = (
-                session.timestamp - seca_measurement.timestamp  # type: ignore[operator]
-            )
-            session.save()
-        else:
-            # check to see if the current response is closer in time to the session
-            if (
-                session.seca_measurement.timestamp
-                and seca_measurement.timestamp
-                and abs(session.seca_measurement.timestamp - session.timestamp)  # type: ignore[operator]
-                > abs(seca_measurement.timestamp - session.timestamp)  # type: ignore[operator]
-            ):
-                session.seca_measurement = seca_measurement
-                session.time_between_scan_and_seca = (
-                    session.timestamp - seca_measurement.timestamp  # type: ignore[operator]
-                )
-                session.save()
-
-
-def process_row(row: pd.Series):
+    measurements = pd.DataFrame.from_records(
+        SECAMeasurement.objects.filter(
+            subject_id__in=subject_ids, timestamp__isnull=False
+        ).values_list("pk", "subject_id", "timestamp"),
+        columns=EVENT_COLUMNS,
+    )
+    return align_sessions(
+        measurements, "seca_measurement", "time_between_scan_and_seca", subject_ids
+    )
+
+
+def process_row(row: pd.Series, subject: Subject):
     """
     Process a row from the DataFrame.
 
@@ -101,34 +95,54 @@ def process_row(row: pd.Series):
     ----------
     row : pd.Series
         The row to process.
+    subject : Subject
+        The subject the row was matched to (see ``match_sessions``).
     """
-    date_of_measurement = pd.to_datetime(row.get("timestamp"), format="%d/%m/%Y")
-    date_of_birth = pd.to_datetime(row.get("date of birth"), format="%d/%m/%Y")
-    sex = row.get("gender")[0]
-    sessions = Session.objects.filter(
-        date=date_of_measurement.date(),
-        subject__date_of_birth=date_of_birth.date(),
-        subject__sex=sex,
-    )
-    if not sessions.exists():
-        print(f"Cound not find scanning session to associated with measurement:")
-        print(f"date_of_measurement: {date_of_measurement}")
-        print(f"date_of_birth: {date_of_birth}")
-        print(f"subject's sex: {sex}\n")
-        return
-    if sessions.count() > 1:
-        print(
-            f"Found multiple scanning sessions to associated with measurement:\n{row}"
-        )
-        return
-    session = sessions.first()
-    subject = session.subject  # type: ignore[union-attr]
     seca_measurement = make_seca_measurement(subject, row)
     subject.seca_measurements.add(seca_measurement)
-    update_sessions(subject, seca_measurement)
 
 
-def update_database_from_file(file_path: str):
+def match_sessions(seca_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Match the measurements to scanning sessions by the date of the measurement
+    and the subject's date of birth and sex,
+    using a single query and an in-memory hash join.
+
+    Parameters
+    ----------
+    seca_df : pd.DataFrame
+        The reformatted SECA DataFrame.
+
+    Returns
+    -------
+    pd.DataFrame
+        The measurements that matched exactly one session, with the session's
+        and subject's primary keys in ``session_pk`` and ``subject_pk`` columns.
+    pd.DataFrame
+        The measurements that matched no session or more than one.
+    """
+    keys = pd.DataFrame.from_records(
+        Session.objects.values_list(
+            "pk", "subject_id", "date", "subject__date_of_birth", "subject__sex"
+        ),
+        columns=["session_pk", "subject_pk", "date", "date_of_birth", "sex"],
+    )
+    match_on = ["date_of_measurement", "date_of_birth", "sex"]
+    rows = seca_df.assign(
+        date_of_measurement=pd.to_datetime(
+            seca_df["timestamp"], format="%d/%m/%Y", errors="coerce"
+        ).dt.date,
+        date_of_birth=pd.to_datetime(
+            seca_df["date of birth"], format="%d/%m/%Y", errors="coerce"
+        ).dt.date,
+        sex=seca_df["gender"].str[0],
+    )
+    return match_rows(
+        rows, keys, left_on=match_on, right_on=["date", "date_of_birth", "sex"]
+    )
+
+
+def update_database_from_file(file_path: str) -> pd.DataFrame:
     """
     Update the database with information from a CSV file output from SECA.
 
@@ -136,22 +150,49 @@ def update_database_from_file(file_path: str):
     ----------
     file_path : str
         The path to the CSV file.
+
+    Returns
+    -------
+    pd.DataFrame
+        The measurements that matched no session or more than one.
     """
-    # Load the data from the Google Sheet
+    # Load the data from the CSV file
     seca_df = pd.read_csv(file_path)
+    return update_database_from_frame(seca_df)
+
+
+def update_database_from_frame(seca_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Update the database with the rows of an already loaded SECA export.
+
+    Parameters
+    ----------
+    seca_df : pd.DataFrame
+        The rows of the export, as read by ``pd.read_csv``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The measurements that matched no session or more than one.
+    """
     # Reformat the DataFrame
     seca_df = reformat_df(seca_df)
+    matched, report = match_sessions(seca_df)
+    subjects = Subject.objects.in_bulk(matched["subject_pk"].unique().tolist())
 
     # Update the database with the information from the DataFrame
-    for i, row in tqdm.tqdm(seca_df.iterrows()):
+    for i, row in tqdm.tqdm(matched.iterrows(), total=len(matched)):
         try:
-            process_row(row)
+            process_row(row[seca_df.columns], subjects[row["subject_pk"]])
         except Exception as e:  # noqa: BLE001
             print(f"\nError processing row {i}: {row}")  # noqa: T201
             print(e)
+    # link the sessions to their closest measurements in one pass
+    assign_measurements(list(subjects))
+    return report
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Update the database with information from a SECA CSV file."
     env = environ.Env()
 
@@ -161,8 +202,14 @@ class Command(BaseCommand):
             type=str,
             help="Path to the SECA CSV file",
         )
+        parser.add_argument(
+            "--report",
+            type=str,
+            help="Path to a CSV file to store the unmatched and ambiguous rows.",
+        )
 
     def handle(self, *args, **kwargs):
         file_path = kwargs["file_path"]
-        update_database_from_file(file_path)
+        report = update_database_from_file(file_path)
+        write_match_report(self, report, kwargs["report"])
         self.stdout.write(self.style.SUCCESS("Database updated successfully."))
@@ -1,16 +1,23 @@
 import os
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 import environ
 import pandas as pd
 import tqdm
 from crontab import CronTab
-from django.core.management.base import BaseCommand
 from pydrive.auth import GoogleAuth
 from pydrive.drive import GoogleDrive
 
 from plasticityhub.scans.models import Session
+from plasticityhub.utils.instrumentation import InstrumentedCommand
+from plasticityhub.utils.pipeline import SESSION_RELATED_FIELDS
+from plasticityhub.utils.sinks import (
+    EXPORT_STATE_FILE,
+    Exporter,
+    configured_sinks,
+    write_deliveries,
+)
 
 CSV_OUTPUT_FILE = "sessions_with_derivatives.csv"
 BIDS_PATH = Path("/mnt/62/Bids")
@@ -21,6 +28,7 @@ def output_to_csv_with_derivatives(
     output_path: str = CSV_OUTPUT_FILE,
     bids_path=BIDS_PATH,
     derivatives_path=DERIVATIVES_PATH,
+    sessions: Optional[list[Session]] = None,
 ):
     """
     Output all sessions and some relevant information to a CSV file.
@@ -33,8 +41,11 @@ def output_to_csv_with_derivatives(
         The path to the BIDS directory.
     derivatives_path : Path
         The path to the derivatives directory.
+    sessions : list[Session], optional
+        Already loaded sessions to output, by default all sessions.
     """
-    sessions = Session.objects.all()
+    if sessions is None:
+        sessions = list(Session.objects.select_related(*SESSION_RELATED_FIELDS))
     df = pd.DataFrame(
         index=range(len(sessions)),
         columns=[
@@ -158,14 +169,34 @@ def upload_to_drive(
     print("File uploaded to Google Drive")
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Update the database with information from an Excel file."
     env = environ.Env()
     credentials = env("GSPREAD_CREDENTIALS", default=None)
     authorized_user = env("GSPREAD_AUTHORIZED_USER", default=None)
     folder_id = env("GOOGLE_DRIVE_FOLDER_ID", default=None)
+    export_dir = env("EXPORT_DIR", default=None)
+    export_state = env("EXPORT_STATE_FILE", default=EXPORT_STATE_FILE)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force_export",
+            action="store_true",
+            help="Upload the table even if it did not change since the last upload.",
+        )
 
     def handle(self, *args, **kwargs):
-        out_file = output_to_csv_with_derivatives()
-        upload_to_drive(out_file, self.folder_id, self.authorized_user)
+        with self.instrumentation.stage("output_to_csv_with_derivatives"):
+            out_file = output_to_csv_with_derivatives()
+        exporter = Exporter(self.export_state)
+        exporter.export(
+            out_file,
+            configured_sinks(
+                export_dir=self.export_dir,
+                folder_id=self.folder_id,
+                authorized_user=self.authorized_user,
+            ),
+            force=kwargs["force_export"],
+        )
+        write_deliveries(self, exporter.close())
         print("Done.")
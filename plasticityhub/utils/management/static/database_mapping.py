@@ -2,65 +2,92 @@ COLUMNS_MAPPING = {
     "name": {
         "scope": "subject",
         "field": "name",
+        "dtype": "title",
+        "default": "Unknown Unknown",
     },
     "dob": {
         "scope": "subject",
         "field": "date_of_birth",
+        "dtype": "date",
     },
     "id": {
         "scope": "subject",
         "field": "subject_id",
+        "dtype": "code",
+        "width": 9,
+        "required": True,
     },
     "email": {
         "scope": "subject",
         "field": "email",
+        "dtype": "text",
     },
     "cellular no.": {
         "scope": "subject",
         "field": "phone",
+        "dtype": "text",
     },
     "gender": {
         "scope": "subject",
         "field": "sex",
+        "dtype": "sex",
     },
     "height": {
         "scope": "subject",
         "field": "height",
+        "dtype": "height",
     },
     "weight": {
         "scope": "subject",
         "field": "weight",
+        "dtype": "float",
     },
     "protocol": {
         "scope": "session",
         "field": "study",
+        "dtype": "title",
+        "required": True,
     },
     "study": {
         "scope": "session",
         "field": "group",
+        "dtype": "title",
+        "required": True,
     },
     "group": {
         "scope": "session",
         "field": "condition",
+        "dtype": "title",
+        "required": True,
     },
     "lab": {
         "scope": "session",
         "field": "lab",
+        "dtype": "text",
+        "required": True,
     },
     "scantag": {
         "scope": "session",
         "field": "scan_tag",
+        "dtype": "lower",
+        "default": "",
     },
     "qcode": {
         "scope": "subject",
         "field": "subject_code",
+        "dtype": "code",
+        "width": 4,
     },
     "scanid": {
         "scope": "session",
         "field": "origin_session_id",
+        "dtype": "text",
+        "required": True,
     },
     "status": {
         "scope": "session",
         "field": "status",
+        "dtype": "text",
+        "default": "",
     },
 }
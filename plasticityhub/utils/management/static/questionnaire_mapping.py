@@ -1,7 +1,12 @@
 QUESTIONNAIRE_MAPPING = {
-    "Gender": {"field": "sex", "mapper": {"Female": "F", "Male": "M", "": "U"}},
+    "Gender": {
+        "field": "sex",
+        "dtype": "category",
+        "mapper": {"Female": "F", "Male": "M", "": "U"},
+    },
     "version": {
         "field": "version",
+        "dtype": "category",
         "mapper": {
             "גרסה 1 (2021)": "1 (2021)",
             "גרסה 2 (2022)": "2 (2022)",
@@ -11,6 +16,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "DominantHand": {
         "field": "handedness",
+        "dtype": "category",
         "mapper": {
             "Right": "R",
             "Left": "L",
@@ -18,10 +24,17 @@ QUESTIONNAIRE_MAPPING = {
             "": "U",
         },
     },
-    "Weight (kg)": {"field": "weight"},
-    "Height (cm)": {"field": "height"},
+    "Weight (kg)": {
+        "field": "weight",
+        "dtype": "float",
+    },
+    "Height (cm)": {
+        "field": "height",
+        "dtype": "float",
+    },
     "Gender Indentity": {
         "field": "gender",
+        "dtype": "category",
         "mapper": {
             "Cisgender": "cisgender",
             "Transgender": "transgender",
@@ -31,6 +44,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "Sexual Orientation": {
         "field": "sexual_orientation",
+        "dtype": "category",
         "mapper": {
             "Heterosexual": "heterosexual",
             "Homosexual/Lesbian": "homosexual",
@@ -41,12 +55,17 @@ QUESTIONNAIRE_MAPPING = {
             "": "U",
         },
     },
-    "Living environment": {"field": "living_environment"},
+    "Living environment": {
+        "field": "living_environment",
+        "dtype": "text",
+    },
     "Years in Residence": {
         "field": "years_in_residence",
+        "dtype": "float",
     },
     "Marital Status": {
         "field": "marital_status",
+        "dtype": "category",
         "mapper": {
             "Single": "single",
             "Married": "married",
@@ -60,18 +79,23 @@ QUESTIONNAIRE_MAPPING = {
     },
     "Years in relationship": {
         "field": "relationship_duration",
+        "dtype": "float",
     },
     "Number of Children": {
         "field": "number_of_children",
+        "dtype": "float",
     },
     "Number of Sibling": {
         "field": "number_of_siblings",
+        "dtype": "float",
     },
     "Your Sibling Order": {
         "field": "sibling_order",
+        "dtype": "float",
     },
     "Twins": {
         "field": "twins",
+        "dtype": "category",
         "mapper": {
             "No": False,
             "Identical": "identical",
@@ -80,43 +104,59 @@ QUESTIONNAIRE_MAPPING = {
     },
     "EthnicalIdentity": {
         "field": "ethnic_identity",
+        "dtype": "text",
     },
     "PoliticalOrientation": {
         "field": "political_orientation",
+        "dtype": "text",
+    },
+    "Religion": {
+        "field": "religion",
+        "dtype": "text",
     },
-    "Religion": {"field": "religion"},
     "ReligionDegree": {
         "field": "religion_degree",
+        "dtype": "text",
     },
     "FamilyHistory": {
         "field": "family_history",
+        "dtype": "text",
     },
     "BloodSuger": {
         "field": "blood_sugar",
+        "dtype": "text",
     },
     "BloodPressure": {
         "field": "blood_pressure",
+        "dtype": "text",
     },
     "Thyroids": {
         "field": "thyroids",
+        "dtype": "text",
     },
     "Lipids": {
         "field": "lipids",
+        "dtype": "text",
     },
     "SevereHealthConditions": {
         "field": "severe_health_conditions",
+        "dtype": "text",
     },
     "MajorHealthConditions": {
         "field": "major_health_conditions",
+        "dtype": "text",
     },
     "MinorHealthConditions": {
         "field": "minor_health_conditions",
+        "dtype": "text",
     },
     "BrainHealth": {
         "field": "brain_health",
+        "dtype": "text",
     },
     "Depression": {
         "field": "depression",
+        "dtype": "bool",
         "mapper": {
             "0": False,
             "1": True,
@@ -124,6 +164,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "Anxiety": {
         "field": "anxiety",
+        "dtype": "bool",
         "mapper": {
             "0": False,
             "1": True,
@@ -131,6 +172,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "CommunicationDisorders": {
         "field": "communication_disorders",
+        "dtype": "bool",
         "mapper": {
             "0": False,
             "1": True,
@@ -138,6 +180,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "AttentionDisorders": {
         "field": "attention_disorders",
+        "dtype": "bool",
         "mapper": {
             "0": False,
             "1": True,
@@ -145,6 +188,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "VisualAid": {
         "field": "visual_aid",
+        "dtype": "bool",
         "mapper": {
             "No": False,
             "Yes": True,
@@ -152,6 +196,7 @@ QUESTIONNAIRE_MAPPING = {
     },
     "HearingAid": {
         "field": "hearing_aid",
+        "dtype": "bool",
         "mapper": {
             "No": False,
             "Yes": True,
@@ -159,9 +204,11 @@ QUESTIONNAIRE_MAPPING = {
     },
     "PSQI": {
         "field": "psqi",
+        "dtype": "float",
     },
     "LongCovid": {
         "field": "long_covid",
+        "dtype": "bool",
         "mapper": {
             "No": False,
             "Yes": True,
@@ -170,39 +217,51 @@ QUESTIONNAIRE_MAPPING = {
     },
     "OASIS": {
         "field": "oasis",
+        "dtype": "float",
     },
     "PCL-5": {
         "field": "pcl5",
+        "dtype": "float",
     },
     "GAD-7": {
         "field": "gad7",
+        "dtype": "float",
     },
     "PHQ9": {
         "field": "phq9",
+        "dtype": "float",
     },
     "B5 Extraversion": {
         "field": "b5_extraversion",
+        "dtype": "float",
     },
     "B5 Agreeableness": {
         "field": "b5_agreeableness",
+        "dtype": "float",
     },
     "B5 Conscientiousness": {
         "field": "b5_conscientiousness",
+        "dtype": "float",
     },
     "B5 EmotionalStability": {
         "field": "b5_emotional_stability",
+        "dtype": "float",
     },
     "B5 Openness": {
         "field": "b5_openness",
+        "dtype": "float",
     },
     "SubjectiveHappiness": {
         "field": "hli",
+        "dtype": "float",
     },
     "SWLS": {
         "field": "swls",
+        "dtype": "float",
     },
     "Education": {
         "field": "education_level",
+        "dtype": "category",
         "mapper": {
             "High school graduate": "high school",
             "Academic graduate": "bachelor's degree",
@@ -215,19 +274,27 @@ QUESTIONNAIRE_MAPPING = {
     },
     "Salary": {
         "field": "salary",
+        "dtype": "text",
     },
     "PsychometricScore": {
         "field": "psychometric_score",
+        "dtype": "float",
     },
     "MainHobby": {
         "field": "main_hobby",
+        "dtype": "text",
     },
     "HobbyTime": {
         "field": "hobby_time",
+        "dtype": "text",
+    },
+    "TimesTrainingPerWeek": {
+        "field": "weekly_workouts",
+        "dtype": "float",
     },
-    "TimesTrainingPerWeek": {"field": "weekly_workouts"},
     "TrainingGroup": {
         "field": "training_alone",
+        "dtype": "bool",
         "mapper": {
             "Alone": True,
             "Group": False,
@@ -235,9 +302,11 @@ QUESTIONNAIRE_MAPPING = {
     },
     "Caffeine": {
         "field": "caffeine",
+        "dtype": "text",
     },
     "Nutrition": {
         "field": "nutrition",
+        "dtype": "text",
     },
 }
 
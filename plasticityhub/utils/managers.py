@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class DeferredFieldsQuerySet(models.QuerySet):
+    """
+    A queryset that can load specific deferred fields again,
+    without clearing the other deferrals (as ``defer(None)`` would).
+    """
+
+    def undefer(self, *fields: str):
+        """
+        Load the given fields with the rows.
+
+        Parameters
+        ----------
+        *fields : str
+            The names of the fields to load.
+
+        Returns
+        -------
+        DeferredFieldsQuerySet
+            A copy of the queryset.
+        """
+        clone = self._chain()
+        names, defer = clone.query.deferred_loading
+        if defer:
+            clone.query.deferred_loading = frozenset(names) - set(fields), True
+        elif names:
+            # only() was used; extend the fields it loads
+            clone.query.deferred_loading = frozenset(names) | set(fields), False
+        return clone
+
+
+class DeferredFieldsManager(models.Manager):
+    """
+    A manager that defers large (e.g. JSON) columns by default.
+    The columns are still loaded on access, with one query per row,
+    so code that reads them in bulk should undefer them explicitly.
+    """
+
+    deferred_fields: list[str] = []
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.deferred_fields)
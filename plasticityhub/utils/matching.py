@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+REPORT_COLUMNS = ["row", "reason", "n_matches"]
+
+
+def match_rows(
+    df: pd.DataFrame,
+    keys: pd.DataFrame,
+    left_on: list[str],
+    right_on: list[str],
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Resolve every row of a DataFrame to exactly one database row with a hash join.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The incoming rows (e.g. a questionnaire or SECA export).
+    keys : pd.DataFrame
+        The preloaded database keys, with the ``right_on`` columns and any
+        columns (e.g. primary keys) to attach to the matched rows.
+    left_on : list[str]
+        The columns of ``df`` to match on.
+    right_on : list[str]
+        The columns of ``keys`` to match on.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that matched exactly one key, with the key's columns attached.
+        The original index is kept.
+    pd.DataFrame
+        A report of the rows that matched no key ("unmatched") or more than
+        one key ("ambiguous"), with the values they were matched on.
+    """
+    counts = keys.groupby(right_on, dropna=True).size().rename("n_matches")
+    rows = df.join(counts, on=left_on)
+    rows["n_matches"] = rows["n_matches"].fillna(0).astype(int)
+
+    report = rows.loc[rows["n_matches"] != 1, left_on + ["n_matches"]]
+    report = report.assign(
+        reason=np.where(report["n_matches"] == 0, "unmatched", "ambiguous")
+    )
+    report = report.rename_axis("row").reset_index()[REPORT_COLUMNS + left_on]
+
+    unique_keys = keys.drop_duplicates(subset=right_on, keep=False)
+    unique_keys = unique_keys.rename(columns=dict(zip(right_on, left_on, strict=True)))
+    matched = rows[rows["n_matches"] == 1].drop(columns="n_matches")
+    matched = (
+        matched.reset_index(names="_row")
+        .merge(unique_keys, on=left_on, how="inner", validate="many_to_one")
+        .set_index("_row")
+        .rename_axis(df.index.name)
+    )
+    return matched, report
+
+
+def write_match_report(
+    command,
+    report: pd.DataFrame,
+    path: str | None = None,
+    title: str = "Could not match rows",
+):
+    """
+    Summarize a matching (or rejection) report on a management command's output.
+
+    Parameters
+    ----------
+    command : BaseCommand
+        The running management command.
+    report : pd.DataFrame
+        The report returned by ``match_rows`` (or any report with a ``reason`` column).
+    path : str, optional
+        A path to save the full report to, as CSV.
+    title : str
+        The summary's title.
+    """
+    if report.empty:
+        return
+    counts = report["reason"].value_counts()
+    summary = ", ".join(f"{count} {reason}" for reason, count in counts.items())
+    command.stdout.write(command.style.WARNING(f"{title}: {summary}"))
+    if path:
+        report.to_csv(path, index=False)
+        command.stdout.write(f"Report saved to {path}")
@@ -0,0 +1,150 @@
+import pandas as pd
+
+REJECTION_COLUMNS = ["row", "column", "value", "reason"]
+# heights below this are in metres, the rest already in centimetres
+MAX_HEIGHT_IN_METRES = 3
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """
+    Strip text cells, with blank cells as nulls.
+    """
+    text = values.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+def _as_code(values: pd.Series, width: int) -> pd.Series:
+    """
+    Zero-pad codes (e.g. IDs), which spreadsheets may have turned into numbers.
+    """
+    text = _as_text(values)
+    numbers = pd.to_numeric(text, errors="coerce")
+    integers = numbers.notna() & (numbers % 1 == 0)
+    text = text.mask(integers, numbers[integers].astype("Int64").astype("string"))
+    return text.str.zfill(width)
+
+
+def _as_height(values: pd.Series) -> pd.Series:
+    """
+    Heights in centimetres.
+    """
+    heights = pd.to_numeric(_as_text(values), errors="coerce")
+    return heights.mask(heights < MAX_HEIGHT_IN_METRES, heights * 100)
+
+
+CONVERTERS = {
+    "text": lambda values, spec: _as_text(values),
+    "title": lambda values, spec: _as_text(values).str.title(),
+    "lower": lambda values, spec: _as_text(values).str.lower(),
+    "code": lambda values, spec: _as_code(values, spec["width"]),
+    "sex": lambda values, spec: _as_text(values).str[0].str.upper().fillna("U"),
+    "float": lambda values, spec: pd.to_numeric(_as_text(values), errors="coerce"),
+    "height": lambda values, spec: _as_height(values),
+    "date": lambda values, spec: pd.to_datetime(
+        values.mask(_as_text(values).isna()), errors="coerce"
+    ).dt.date,
+}
+
+
+def _rejections(
+    df: pd.DataFrame, invalid: pd.Series, column: str, reason: str
+) -> pd.DataFrame:
+    rows = df.loc[invalid]
+    return pd.DataFrame(
+        {
+            "row": rows.index,
+            "column": column,
+            "value": rows[column].astype(object).to_numpy() if column in rows else None,
+            "reason": reason,
+        },
+        columns=REJECTION_COLUMNS,
+    )
+
+
+def normalize(
+    df: pd.DataFrame,
+    mapping: dict,
+    key: str,
+    seen: set | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert the columns of a sheet to the types of the fields they map to,
+    with vectorized operations, and set the invalid rows aside.
+
+    Every entry of the mapping may define a ``dtype`` (see ``CONVERTERS``),
+    whether the column is ``required``, a ``default`` for blank cells and,
+    for codes, the ``width`` to zero-pad them to.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The rows of the sheet.
+    mapping : dict
+        The column mapping (e.g. ``COLUMNS_MAPPING``).
+    key : str
+        The column identifying a row (e.g. the scan ID);
+        only the first row of every key is kept.
+    seen : set, optional
+        The keys of rows already normalized (e.g. in previous batches),
+        updated in place.
+
+    Returns
+    -------
+    pd.DataFrame
+        The valid rows, with lower case columns. Mapped columns hold Python
+        values (str, float, date) and None for blank cells.
+    pd.DataFrame
+        The rejected rows, one line per problem, with ``REJECTION_COLUMNS``.
+    """
+    df = df.rename(columns=str.lower)
+    missing = [
+        column
+        for column, spec in mapping.items()
+        if spec.get("required") and column not in df.columns
+    ]
+    if missing:
+        msg = f"Missing required columns: {', '.join(missing)}"
+        raise ValueError(msg)
+    seen = set() if seen is None else seen
+
+    rejected = []
+    keys = _as_text(df[key])
+    blank = keys.isna()
+    duplicate = ~blank & (keys.duplicated(keep="first") | keys.isin(seen))
+    rejected.append(_rejections(df, blank, key, f"missing {key}"))
+    rejected.append(_rejections(df, duplicate, key, f"duplicate {key}"))
+    # every problem of the other rows is reported
+    candidates = ~(blank | duplicate)
+    valid = candidates.copy()
+
+    clean = df.copy()
+    for column, spec in mapping.items():
+        if column not in df.columns:
+            clean[column] = None
+            continue
+        converted = CONVERTERS[spec.get("dtype", "text")](df[column], spec)
+        given = _as_text(df[column]).notna()
+        invalid = given & converted.isna()
+        rejected.append(
+            _rejections(df, candidates & invalid, column, f"invalid {column}")
+        )
+        if spec.get("required"):
+            absent = ~given
+            rejected.append(
+                _rejections(df, candidates & absent, column, f"missing {column}")
+            )
+            invalid |= absent
+        valid &= ~invalid
+        if "default" in spec:
+            converted = converted.fillna(spec["default"])
+        clean[column] = converted.astype(object).where(converted.notna(), None)
+
+    clean = clean.loc[valid]
+    seen.update(clean[key])
+    rejected = [frame for frame in rejected if not frame.empty]
+    rejections = (
+        pd.concat(rejected, ignore_index=True)
+        if rejected
+        else pd.DataFrame(columns=REJECTION_COLUMNS)
+    )
+    return clean, rejections.sort_values("row", kind="stable", ignore_index=True)
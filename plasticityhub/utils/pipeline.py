@@ -0,0 +1,324 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from plasticityhub.scans.models import Session
+from plasticityhub.utils.instrumentation import Instrumentation
+
+SESSION_RELATED_FIELDS = ["subject", "study", "group", "condition", "lab"]
+
+
+class SessionCache:
+    """
+    A shared, lazily loaded view of the sessions (and their subjects)
+    used by all the stages of a single pipeline run.
+    """
+
+    def __init__(self):
+        self._sessions: list[Session] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def sessions(self) -> list[Session]:
+        """
+        The sessions, with their subject, study, group, condition and lab.
+        """
+        with self._lock:
+            if self._sessions is None:
+                self._sessions = list(
+                    Session.objects.select_related(*SESSION_RELATED_FIELDS)
+                )
+            return self._sessions
+
+    @property
+    def subjects(self) -> dict:
+        """
+        A mapping of subject primary key to subject, for subjects with sessions.
+        """
+        return {session.subject_id: session.subject for session in self.sessions}
+
+    def invalidate(self):
+        """
+        Drop the cached sessions, so they are reloaded on the next access.
+        """
+        with self._lock:
+            self._sessions = None
+
+
+def run_stage(name: str, func: Callable, timings: dict):
+    """
+    Run a single stage and record its wall time.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    func : Callable
+        The stage itself, called without arguments.
+    timings : dict
+        The mapping of stage name to wall time (in seconds) to update.
+    """
+    start = time.perf_counter()
+    try:
+        func()
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def _run_stage_in_thread(name: str, func: Callable, timings: dict):
+    """
+    Run a stage in a worker thread, closing the thread's database connection.
+    """
+    try:
+        run_stage(name, func, timings)
+    finally:
+        connection.close()
+
+
+def run_stages(groups: list[list[tuple[str, Callable]]]) -> dict:
+    """
+    Run groups of stages in order.
+    Stages within the same group are independent and run concurrently.
+
+    Parameters
+    ----------
+    groups : list[list[tuple[str, Callable]]]
+        The groups of (name, stage) pairs.
+
+    Returns
+    -------
+    dict
+        The wall time (in seconds) of each stage that ran.
+    """
+    timings: dict = {}
+    for group in groups:
+        if len(group) == 1:
+            name, func = group[0]
+            run_stage(name, func, timings)
+            continue
+        with ThreadPoolExecutor(max_workers=len(group)) as executor:
+            futures = [
+                executor.submit(_run_stage_in_thread, name, func, timings)
+                for name, func in group
+            ]
+            for future in futures:
+                future.result()
+    return timings
+
+
+class ChangeSet:
+    """
+    The keys (e.g. session primary keys) created or modified by the stages
+    of a pipeline run, grouped by kind (e.g. "sessions", "procedures").
+    """
+
+    def __init__(self, **changes):
+        self._changes: dict = {kind: set(keys) for kind, keys in changes.items()}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return any(self._changes.values())
+
+    def __repr__(self):
+        counts = ", ".join(f"{kind}={len(keys)}" for kind, keys in self.items())
+        return f"ChangeSet({counts})"
+
+    def add(self, kind: str, keys):
+        """
+        Record changed keys of a given kind.
+        """
+        with self._lock:
+            self._changes.setdefault(kind, set()).update(keys)
+
+    def get(self, kind: str) -> set:
+        """
+        Return the changed keys of a given kind.
+        """
+        with self._lock:
+            return set(self._changes.get(kind, set()))
+
+    def items(self):
+        with self._lock:
+            return [(kind, set(keys)) for kind, keys in self._changes.items()]
+
+    def update(self, other: "ChangeSet"):
+        """
+        Merge the changes recorded by another change set.
+        """
+        for kind, keys in other.items():
+            self.add(kind, keys)
+
+    def copy(self) -> "ChangeSet":
+        return ChangeSet(**dict(self.items()))
+
+
+def diff_snapshots(before: dict, after: dict) -> set:
+    """
+    Compare two snapshots of a table, keyed by a natural key.
+
+    Parameters
+    ----------
+    before : dict
+        The snapshot taken before the stage ran.
+    after : dict
+        The snapshot taken after the stage ran.
+
+    Returns
+    -------
+    set
+        The keys that were added or whose values changed.
+    """
+    return {key for key, value in after.items() if before.get(key) != value}
+
+
+class Stage:
+    """
+    A single step of the nightly pipeline.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    func : Callable
+        The stage itself. It is called with the ``ChangeSet`` accumulated by
+        its upstream stages and returns the ``ChangeSet`` it produced (or None).
+    requires : list[str]
+        The names of the stages that must run before this one.
+    consumes : list[str]
+        The kinds of changes that invalidate the stage's outputs.
+        A stage that consumes nothing always runs (e.g. it reads an external source).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        requires: list[str] | None = None,
+        consumes: list[str] | None = None,
+    ):
+        self.name = name
+        self.func = func
+        self.requires = requires or []
+        self.consumes = consumes or []
+
+    def __repr__(self):
+        return f"Stage({self.name})"
+
+    def is_invalidated(self, changes: ChangeSet) -> bool:
+        """
+        Whether the stage needs to run given its upstream changes.
+        """
+        if not self.consumes:
+            return True
+        return any(changes.get(kind) for kind in self.consumes)
+
+
+class StageGraph:
+    """
+    A dependency graph of pipeline stages.
+    Stages run once all the stages they require ran (or were skipped),
+    and only when the changes produced upstream invalidate them.
+    """
+
+    def __init__(self, stages: list[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = set(stage.requires) - set(self.stages)
+            if missing:
+                msg = f"Stage {stage.name} requires unknown stages: {missing}"
+                raise ValueError(msg)
+
+    def levels(self) -> list[list[Stage]]:
+        """
+        Sort the stages topologically.
+
+        Returns
+        -------
+        list[list[Stage]]
+            Groups of stages, where each group only requires earlier groups.
+        """
+        remaining = dict(self.stages)
+        done: set = set()
+        levels = []
+        while remaining:
+            level = [
+                stage
+                for stage in remaining.values()
+                if set(stage.requires).issubset(done)
+            ]
+            if not level:
+                msg = f"Cyclic stage dependencies: {sorted(remaining)}"
+                raise ValueError(msg)
+            levels.append(level)
+            for stage in level:
+                done.add(stage.name)
+                remaining.pop(stage.name)
+        return levels
+
+    def run(
+        self,
+        skip: set | None = None,
+        full: bool = False,
+        instrumentation: Instrumentation | None = None,
+    ) -> tuple[dict, ChangeSet, list[str]]:
+        """
+        Run the stages level by level; stages of the same level run concurrently.
+
+        Parameters
+        ----------
+        skip : set, optional
+            The names of stages not to run.
+        full : bool
+            Whether to run every stage regardless of the upstream changes.
+        instrumentation : Instrumentation, optional
+            Where to record the cost (queries, memory) of every stage.
+
+        Returns
+        -------
+        dict
+            The wall time (in seconds) of each stage that ran.
+        ChangeSet
+            All the changes produced by the run.
+        list[str]
+            The names of the stages that were not invalidated and did not run.
+        """
+        skip = skip or set()
+        changes = ChangeSet()
+        timings: dict = {}
+        unchanged = []
+        for level in self.levels():
+            upstream = changes.copy()
+            group = []
+            for stage in level:
+                if stage.name in skip:
+                    continue
+                if not full and not stage.is_invalidated(upstream):
+                    unchanged.append(stage.name)
+                    continue
+                group.append(
+                    (stage.name, self._bind(stage, upstream, changes, instrumentation))
+                )
+            if group:
+                timings.update(run_stages([group]))
+        return timings, changes, unchanged
+
+    @staticmethod
+    def _bind(
+        stage: Stage,
+        upstream: ChangeSet,
+        changes: ChangeSet,
+        instrumentation: Instrumentation | None = None,
+    ) -> Callable:
+        def func():
+            if instrumentation is None:
+                produced = stage.func(upstream)
+            else:
+                with instrumentation.stage(stage.name):
+                    produced = stage.func(upstream)
+            if produced:
+                changes.update(produced)
+
+        return func
@@ -0,0 +1,176 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Union
+
+# scanner exports name session directories after the session (e.g. 20240110_1030)
+SESSION_DIRECTORY = re.compile(r"^\d{8}_\d{4}$")
+
+
+@dataclass
+class IndexStats:
+    """
+    How much of the rawdata tree an indexing run had to list.
+    """
+
+    scanned: int = 0
+    reused: int = 0
+    sessions: int = 0
+
+
+def _list_directory(path: str) -> tuple[dict[str, str], list[str]]:
+    """
+    The session directories and the other subdirectories of a directory.
+    """
+    sessions, children = {}, []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if not is_dir:
+                continue
+            if SESSION_DIRECTORY.match(entry.name):
+                sessions[entry.name] = entry.path
+            else:
+                children.append(entry.path)
+    return sessions, sorted(children)
+
+
+class RawdataIndex:
+    """
+    An incremental index of the session directories under the rawdata roots.
+
+    The entries of every directory are stored with the directory's mtime.
+    A directory's mtime changes when entries are added, removed or renamed in
+    it, so unchanged directories are not listed again, only stat-ed on the
+    way to their subdirectories. Session directories are never descended
+    into.
+
+    Parameters
+    ----------
+    state_path : Union[str, Path]
+        The path to the JSON file storing the index.
+    """
+
+    def __init__(self, state_path: Union[str, Path]):
+        self.state_path = Path(state_path)
+        self.directories: dict = {}
+        if self.state_path.exists():
+            with open(self.state_path, "r") as f:
+                self.directories = json.load(f)
+
+    def update(self, roots: Iterable[Union[str, Path]], full: bool = False):
+        """
+        Bring the index up to date with the directories under the roots.
+
+        Parameters
+        ----------
+        roots : Iterable[Union[str, Path]]
+            The directories of the scanner exports.
+        full : bool
+            Whether to list every directory, regardless of its mtime.
+
+        Returns
+        -------
+        IndexStats
+            The number of listed and reused directories, and of sessions found.
+        """
+        stats = IndexStats()
+        directories: dict = {}
+        pending = [str(root) for root in reversed(list(roots))]
+        while pending:
+            path = pending.pop()
+            if path in directories:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                # unmounted roots and directories removed since the last run
+                continue
+            entry = self.directories.get(path)
+            if full or entry is None or entry["mtime"] != mtime:
+                try:
+                    sessions, children = _list_directory(path)
+                except OSError:
+                    continue
+                entry = {"mtime": mtime, "sessions": sessions, "children": children}
+                stats.scanned += 1
+            else:
+                stats.reused += 1
+            directories[path] = entry
+            pending.extend(reversed(entry["children"]))
+        self.directories = directories
+        stats.sessions = len(self.mapping())
+        return stats
+
+    def mapping(self) -> dict[str, str]:
+        """
+        The paths of the sessions' rawdata, by origin session ID.
+
+        Sessions found in several directories are mapped to the first one,
+        in the order of the roots.
+        """
+        mapping: dict[str, str] = {}
+        for entry in self.directories.values():
+            for session_id, path in entry["sessions"].items():
+                mapping.setdefault(session_id, path)
+        return mapping
+
+    def save(self):
+        """
+        Store the index.
+        """
+        _write_json(self.state_path, self.directories)
+
+
+def _write_json(path: Path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(content, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def state_path_for(output_path: Union[str, Path]) -> Path:
+    """
+    The default path of the index of a mapped rawdata file.
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.index.json")
+
+
+def index_rawdata(
+    roots: Iterable[Union[str, Path]],
+    output_path: Union[str, Path],
+    state_path: Union[str, Path, None] = None,
+    full: bool = False,
+) -> IndexStats:
+    """
+    Index the session directories under the rawdata roots and write the
+    mapping read by ``update_database`` (``MAPPED_RAWDATA_PATH``).
+
+    Parameters
+    ----------
+    roots : Iterable[Union[str, Path]]
+        The directories of the scanner exports.
+    output_path : Union[str, Path]
+        The path to the mapped rawdata JSON file.
+    state_path : Union[str, Path], optional
+        The path to the index, by default next to the output file.
+    full : bool
+        Whether to list every directory, regardless of its mtime.
+
+    Returns
+    -------
+    IndexStats
+        The number of listed and reused directories, and of sessions found.
+    """
+    index = RawdataIndex(state_path or state_path_for(output_path))
+    stats = index.update(roots, full=full)
+    _write_json(Path(output_path), index.mapping())
+    index.save()
+    return stats
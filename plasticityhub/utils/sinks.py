@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+EXPORT_STATE_FILE = ".export_state.json"
+RSYNC_DESTINATION = "yalab_dev@biden.tau.ac.il:/home/yalab_dev/yalab-devops"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    The SHA-256 digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExportSink:
+    """
+    A destination the pipeline's artifacts (e.g. the sessions CSV) are delivered to.
+    """
+
+    def key(self) -> str:
+        """
+        A stable identifier of the destination, used to remember what it received.
+        """
+        raise NotImplementedError
+
+    def deliver(self, path: Path):
+        """
+        Deliver a file, raising on failure.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.key()
+
+
+class RsyncSink(ExportSink):
+    """
+    Copy files to a (remote) directory with rsync.
+
+    Parameters
+    ----------
+    destination : str
+        The rsync destination (e.g. "user@host:/path").
+    options : list[str], optional
+        The rsync options.
+    """
+
+    def __init__(self, destination: str, options: Optional[list[str]] = None):
+        self.destination = destination
+        self.options = options or ["-azPL"]
+
+    def key(self) -> str:
+        return f"rsync:{self.destination}"
+
+    def deliver(self, path: Path):
+        subprocess.run(  # noqa: S603
+            ["rsync", *self.options, str(path), self.destination],  # noqa: S607
+            check=True,
+            capture_output=True,
+        )
+
+
+class DriveSink(ExportSink):
+    """
+    Upload files to a Google Drive folder, replacing the previous upload.
+
+    Parameters
+    ----------
+    folder_id : str
+        The ID of the Drive folder.
+    authorized_user : str
+        The path to the authorized user credentials.
+    """
+
+    def __init__(self, folder_id: str, authorized_user: str):
+        self.folder_id = folder_id
+        self.authorized_user = authorized_user
+
+    def key(self) -> str:
+        return f"drive:{self.folder_id}"
+
+    def deliver(self, path: Path):
+        # imported here, as the derivatives command builds its sinks from this module
+        from plasticityhub.utils.management.commands.update_derivatives import (
+            upload_to_drive,
+        )
+
+        upload_to_drive(path, self.folder_id, self.authorized_user)
+
+
+class LocalDirectorySink(ExportSink):
+    """
+    Copy files to a local directory (e.g. a mounted share, or for tests).
+
+    Parameters
+    ----------
+    directory : Union[str, Path]
+        The directory.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def key(self) -> str:
+        return f"local:{self.directory.resolve()}"
+
+    def deliver(self, path: Path):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / path.name
+        tmp = target.with_name(f".{target.name}.tmp")
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+
+
+def configured_sinks(
+    rsync_destination: Optional[str] = None,
+    export_dir: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    authorized_user: Optional[str] = None,
+) -> list[ExportSink]:
+    """
+    Build the sinks of the given destinations, skipping the unset ones.
+
+    Parameters
+    ----------
+    rsync_destination : str, optional
+        The rsync destination.
+    export_dir : str, optional
+        A local directory.
+    folder_id : str, optional
+        A Google Drive folder ID (requires ``authorized_user``).
+    authorized_user : str, optional
+        The path to the Google authorized user credentials.
+
+    Returns
+    -------
+    list[ExportSink]
+        The sinks.
+    """
+    sinks: list[ExportSink] = []
+    if rsync_destination:
+        sinks.append(RsyncSink(rsync_destination))
+    if folder_id:
+        sinks.append(DriveSink(folder_id, authorized_user))
+    if export_dir:
+        sinks.append(LocalDirectorySink(export_dir))
+    return sinks
+
+
+@dataclass
+class Delivery:
+    """
+    The outcome of exporting a file to a sink.
+    """
+
+    sink: ExportSink
+    path: Path
+    status: str  # "delivered", "unchanged" or "failed"
+    error: Optional[BaseException] = None
+
+
+class Exporter:
+    """
+    Deliver files to sinks in background threads, skipping the sinks
+    that already received the same content.
+
+    The digest of the last content every sink received is stored in a JSON
+    state file, and only recorded once the delivery succeeded, so failed
+    deliveries are retried on the next export.
+    Exported files must not be rewritten until ``wait`` returns.
+
+    Parameters
+    ----------
+    state_path : Union[str, Path]
+        The path to the state file.
+    max_workers : int
+        The maximal number of concurrent deliveries.
+    """
+
+    def __init__(
+        self, state_path: Union[str, Path] = EXPORT_STATE_FILE, max_workers: int = 4
+    ):
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending: list[tuple[ExportSink, Path, Future]] = []
+        self._skipped: list[Delivery] = []
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r") as f:
+            return json.load(f)
+
+    def _record(self, sink: ExportSink, path: Path, digest: str):
+        with self._lock:
+            self._state.setdefault(sink.key(), {})[path.name] = digest
+            tmp = self.state_path.with_name(f".{self.state_path.name}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._state, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.state_path)
+
+    def last_digest(self, sink: ExportSink, path: Union[str, Path]) -> Optional[str]:
+        """
+        The digest of the last content of a file the sink received.
+        """
+        with self._lock:
+            return self._state.get(sink.key(), {}).get(Path(path).name)
+
+    def export(
+        self, path: Union[str, Path], sinks: list[ExportSink], force: bool = False
+    ):
+        """
+        Schedule the delivery of a file to the sinks that did not receive it yet.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            The file.
+        sinks : list[ExportSink]
+            The sinks.
+        force : bool
+            Whether to deliver the file even if it is unchanged.
+        """
+        path = Path(path)
+        digest = file_digest(path)
+        for sink in sinks:
+            if not force and self.last_digest(sink, path) == digest:
+                self._skipped.append(Delivery(sink, path, "unchanged"))
+                continue
+            future = self._executor.submit(self._deliver, sink, path, digest)
+            self._pending.append((sink, path, future))
+
+    def _deliver(self, sink: ExportSink, path: Path, digest: str):
+        sink.deliver(path)
+        self._record(sink, path, digest)
+
+    def wait(self) -> list[Delivery]:
+        """
+        Wait for the scheduled deliveries.
+
+        Returns
+        -------
+        list[Delivery]
+            The outcome of every export since the last call, failures included.
+        """
+        deliveries = self._skipped
+        for sink, path, future in self._pending:
+            error = future.exception()
+            status = "failed" if error is not None else "delivered"
+            deliveries.append(Delivery(sink, path, status, error))
+        self._pending, self._skipped = [], []
+        return deliveries
+
+    def close(self) -> list[Delivery]:
+        """
+        Wait for the scheduled deliveries and stop the worker threads.
+        """
+        deliveries = self.wait()
+        self._executor.shutdown()
+        return deliveries
+
+
+def write_deliveries(command, deliveries: list[Delivery]):
+    """
+    Summarize deliveries on a management command's output.
+    """
+    for delivery in deliveries:
+        line = f"{delivery.path.name} -> {delivery.sink!r}: {delivery.status}"
+        if delivery.status == "failed":
+            command.stdout.write(command.style.ERROR(f"{line} ({delivery.error})"))
+        else:
+            command.stdout.write(line)
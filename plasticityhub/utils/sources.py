@@ -0,0 +1,291 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import gspread as gs
+import pandas as pd
+
+# the OAuth flow may refresh and rewrite the token files; sources fetched
+# concurrently authenticate one at a time
+_OAUTH_LOCK = threading.Lock()
+
+
+class SheetSource:
+    """
+    A sheet the ingest commands read rows from.
+    """
+
+    def snapshot_name(self) -> str:
+        """
+        The (file system safe) name of the sheet's snapshot.
+        """
+        raise NotImplementedError
+
+    def revision(self) -> Optional[str]:
+        """
+        The sheet's current revision (e.g. its modification time),
+        or None when it cannot be determined (the sheet is always re-read).
+        """
+        raise NotImplementedError
+
+    def fetch(self) -> pd.DataFrame:
+        """
+        Read the sheet, with the first row as the header and all values as strings.
+        """
+        raise NotImplementedError
+
+
+class GoogleSheetSource(SheetSource):
+    """
+    The first worksheet of a Google Sheet.
+
+    Parameters
+    ----------
+    sheet_key : str
+        The Google Sheet Key.
+    credentials : str
+        The path to the credentials file.
+    authorized_user : str
+        The authorized user email.
+    """
+
+    def __init__(
+        self,
+        sheet_key: str,
+        credentials: Optional[str] = None,
+        authorized_user: Optional[str] = None,
+    ):
+        self.sheet_key = sheet_key
+        self.credentials = credentials
+        self.authorized_user = authorized_user
+        self._sheet = None
+
+    def snapshot_name(self) -> str:
+        return f"sheet-{self.sheet_key}"
+
+    def open(self) -> gs.Spreadsheet:
+        """
+        Open the sheet (once), falling back to the default OAuth flow
+        when the configured credentials fail.
+        """
+        if self._sheet is not None:
+            return self._sheet
+        gc_kwargs = {}
+        if self.credentials:
+            gc_kwargs["credentials_filename"] = self.credentials
+        if self.authorized_user:
+            gc_kwargs["authorized_user_filename"] = self.authorized_user
+        with _OAUTH_LOCK:
+            try:
+                gc = gs.oauth(**gc_kwargs)  # type: ignore[arg-type]
+                self._sheet = gc.open_by_key(self.sheet_key)
+            except Exception as e:  # noqa: BLE001
+                print(f"Error loading the Google Sheet: {e}")  # noqa: T201
+                gc = gs.oauth()
+                self._sheet = gc.open_by_key(self.sheet_key)
+        return self._sheet
+
+    def revision(self) -> Optional[str]:
+        try:
+            # a single Drive metadata request, much cheaper than the values
+            return self.open().get_lastUpdateTime()
+        except gs.exceptions.GSpreadException:
+            return None
+
+    def fetch(self) -> pd.DataFrame:
+        data = self.open().get_worksheet(0).get_all_values()
+        return pd.DataFrame(data[1:], columns=data[0])
+
+
+class LocalSheetSource(SheetSource):
+    """
+    A sheet exported to a local CSV or Excel file,
+    e.g. to run the ingest commands offline or in tests.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        The path to the file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def snapshot_name(self) -> str:
+        digest = hashlib.sha1(  # noqa: S324
+            str(self.path.resolve()).encode()
+        ).hexdigest()[:12]
+        return f"local-{self.path.stem}-{digest}"
+
+    def revision(self) -> Optional[str]:
+        return str(self.path.stat().st_mtime_ns)
+
+    def fetch(self) -> pd.DataFrame:
+        if self.path.suffix in (".xlsx", ".xls"):
+            return pd.read_excel(self.path, dtype=str).fillna("")
+        return pd.read_csv(self.path, dtype=str, keep_default_na=False)
+
+
+class SheetSnapshotCache:
+    """
+    Local snapshots of sheets, re-downloaded only when their revision changes.
+
+    Every snapshot is stored as a pickled DataFrame next to a JSON file
+    with the revision it was taken at.
+
+    Parameters
+    ----------
+    directory : Union[str, Path]
+        The directory to store the snapshots in.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def paths(self, source: SheetSource) -> tuple[Path, Path]:
+        name = source.snapshot_name()
+        return self.directory / f"{name}.pkl", self.directory / f"{name}.json"
+
+    def read(self, source: SheetSource) -> tuple[Optional[pd.DataFrame], dict]:
+        """
+        Read the snapshot of a sheet.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            The snapshot, if there is one.
+        dict
+            The snapshot's metadata.
+        """
+        data_path, meta_path = self.paths(source)
+        if not (data_path.exists() and meta_path.exists()):
+            return None, {}
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        return pd.read_pickle(data_path), meta  # noqa: S301
+
+    def write(self, source: SheetSource, df: pd.DataFrame, revision: Optional[str]):
+        """
+        Store the snapshot of a sheet, replacing the previous one atomically.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path = self.paths(source)
+        tmp_data = data_path.with_suffix(".pkl.tmp")
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        df.to_pickle(tmp_data)
+        with open(tmp_meta, "w") as f:
+            json.dump({"revision": revision, "rows": len(df)}, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    def load(self, source: SheetSource, offline: bool = False) -> pd.DataFrame:
+        """
+        Load a sheet, from its snapshot when the sheet did not change.
+
+        Parameters
+        ----------
+        source : SheetSource
+            The sheet.
+        offline : bool
+            Whether to use the snapshot without checking the sheet's revision.
+
+        Returns
+        -------
+        pd.DataFrame
+            The sheet's rows.
+        """
+        snapshot, meta = self.read(source)
+        if offline:
+            if snapshot is None:
+                msg = f"No snapshot of {source.snapshot_name()} in {self.directory}."
+                raise FileNotFoundError(msg)
+            return snapshot
+        revision = source.revision()
+        if (
+            snapshot is not None
+            and revision is not None
+            and meta.get("revision") == revision
+        ):
+            return snapshot
+        # the revision is read before the values, so later edits trigger a refetch
+        df = source.fetch()
+        self.write(source, df, revision)
+        return df
+
+
+def load_sheet(
+    source: SheetSource,
+    snapshot_dir: Optional[Union[str, Path]] = None,
+    offline: bool = False,
+) -> pd.DataFrame:
+    """
+    Load the rows of a sheet.
+
+    Parameters
+    ----------
+    source : SheetSource
+        The sheet.
+    snapshot_dir : Union[str, Path], optional
+        The directory of the snapshots. Without it, the sheet is always read.
+    offline : bool
+        Whether to use the snapshot without contacting the sheet
+        (requires ``snapshot_dir``).
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows of the sheet.
+    """
+    if snapshot_dir is None:
+        if offline:
+            msg = "Offline runs require a snapshot directory."
+            raise ValueError(msg)
+        return source.fetch()
+    return SheetSnapshotCache(snapshot_dir).load(source, offline=offline)
+
+
+def fetch_all(
+    loaders: dict[str, Callable[[], pd.DataFrame]],
+) -> tuple[dict[str, pd.DataFrame], dict[str, float]]:
+    """
+    Fetch several sources concurrently, so the total latency is that
+    of the slowest source rather than the sum of all of them.
+
+    The loaders only do network and file I/O (no database access),
+    so they run in plain worker threads.
+
+    Parameters
+    ----------
+    loaders : dict[str, Callable[[], pd.DataFrame]]
+        The name of each source and a function loading its rows.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        The rows of each source.
+    dict[str, float]
+        The wall time (in seconds) of each fetch.
+    """
+    timings: dict = {}
+
+    def fetch(name: str, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        start = time.perf_counter()
+        try:
+            return loader()
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    if not loaders:
+        return {}, timings
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = {
+            name: executor.submit(fetch, name, loader)
+            for name, loader in loaders.items()
+        }
+        frames = {name: future.result() for name, future in futures.items()}
+    return frames, timings
@@ -0,0 +1,220 @@
+"""
+A small benchmark harness, loaded as a pytest plugin (see ``addopts``).
+
+Tests marked ``benchmark`` only run with ``--run-benchmarks``. They time a
+step with the ``benchmark_step`` fixture, which also records the number of
+queries and the peak of Python memory allocations, and compares them with
+the stored baseline. The terminal summary shows how every step scales with
+the number of sessions; ``--save-benchmark-baseline`` stores the run as
+the new baseline.
+"""
+
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+BASELINE_PATH = Path(__file__).with_name("benchmarks_baseline.json")
+# timings vary between runs (and machines) much more than allocations
+TIME_TOLERANCE = 2.0
+MEMORY_TOLERANCE = 1.5
+_MEASUREMENTS = pytest.StashKey[list]()
+
+
+@dataclass
+class Measurement:
+    """
+    The cost of running a step once on a cohort of a given size.
+    """
+
+    name: str
+    n_sessions: int
+    seconds: float
+    queries: int
+    peak_memory: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.n_sessions}]"
+
+
+def measure(
+    name: str, n_sessions: int, func: Callable, *args, **kwargs
+) -> tuple[Any, Measurement]:
+    """
+    Run a step once, measuring its wall time, queries and peak memory.
+
+    Parameters
+    ----------
+    name : str
+        The name of the step.
+    n_sessions : int
+        The number of sessions of the cohort the step runs on.
+    func : Callable
+        The step, called with the other arguments.
+
+    Returns
+    -------
+    Any
+        The result of the step.
+    Measurement
+        Its cost.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, Measurement(name, n_sessions, seconds, len(queries), peak_memory)
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    """
+    Load the stored measurements, by key.
+    """
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, measurements: list[Measurement]):
+    """
+    Store measurements as the baseline, keeping those of the steps that did not run.
+    """
+    baseline = load_baseline(path)
+    for measurement in measurements:
+        baseline[measurement.key] = {
+            **asdict(measurement),
+            "seconds": round(measurement.seconds, 4),
+        }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(measurement: Measurement, baseline: dict[str, dict]) -> list[str]:
+    """
+    Describe how a measurement exceeds its baseline, if it does.
+    """
+    expected = baseline.get(measurement.key)
+    if expected is None:
+        return []
+    problems = []
+    if measurement.queries > expected["queries"]:
+        problems.append(
+            f"{measurement.key}: {measurement.queries} queries "
+            f"(baseline {expected['queries']})"
+        )
+    if measurement.seconds > expected["seconds"] * TIME_TOLERANCE:
+        problems.append(
+            f"{measurement.key}: {measurement.seconds:.3f}s "
+            f"(baseline {expected['seconds']:.3f}s)"
+        )
+    if measurement.peak_memory > expected["peak_memory"] * MEMORY_TOLERANCE:
+        problems.append(
+            f"{measurement.key}: {measurement.peak_memory / 2**20:.1f} MiB "
+            f"(baseline {expected['peak_memory'] / 2**20:.1f} MiB)"
+        )
+    return problems
+
+
+def scaling_report(measurements: list[Measurement]) -> list[str]:
+    """
+    Tabulate the measurements of every step by the number of sessions.
+    """
+    by_name = defaultdict(list)
+    for measurement in measurements:
+        by_name[measurement.name].append(measurement)
+    lines = [
+        f"{'step':<32} {'sessions':>8} {'seconds':>9} {'ms/session':>10} "
+        f"{'queries':>8} {'peak MiB':>9}"
+    ]
+    for name in sorted(by_name):
+        for m in sorted(by_name[name], key=lambda m: m.n_sessions):
+            lines.append(
+                f"{name:<32} {m.n_sessions:>8} {m.seconds:>9.3f} "
+                f"{1000 * m.seconds / max(m.n_sessions, 1):>10.2f} "
+                f"{m.queries:>8} {m.peak_memory / 2**20:>9.1f}"
+            )
+    return lines
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="Run the tests marked as benchmarks.",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="The JSON file of the baseline measurements.",
+    )
+    group.addoption(
+        "--save-benchmark-baseline",
+        action="store_true",
+        help="Store the measurements as the baseline instead of comparing them.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: a performance benchmark (run with --run-benchmarks)"
+    )
+    config.stash[_MEASUREMENTS] = []
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmark_step(request) -> Callable:
+    """
+    Measure a step (see ``measure``), failing if it regressed from the baseline.
+    """
+    config = request.config
+    baseline = load_baseline(config.getoption("--benchmark-baseline"))
+
+    def run(name: str, n_sessions: int, func: Callable, *args, **kwargs):
+        result, measurement = measure(name, n_sessions, func, *args, **kwargs)
+        config.stash[_MEASUREMENTS].append(measurement)
+        problems = regressions(measurement, baseline)
+        if problems and not config.getoption("--save-benchmark-baseline"):
+            pytest.fail("Regressed from the baseline:\n" + "\n".join(problems))
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    measurements = config.stash.get(_MEASUREMENTS, [])
+    if not measurements:
+        return
+    terminalreporter.section("benchmarks")
+    for line in scaling_report(measurements):
+        terminalreporter.write_line(line)
+    if config.getoption("--save-benchmark-baseline"):
+        path = config.getoption("--benchmark-baseline")
+        save_baseline(path, measurements)
+        terminalreporter.write_line(f"Saved the baseline to {path}")
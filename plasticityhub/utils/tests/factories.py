@@ -0,0 +1,142 @@
+import datetime
+
+from factory import (
+    Faker,
+    LazyAttribute,
+    LazyFunction,
+    SelfAttribute,
+    Sequence,
+    SubFactory,
+)
+from factory.django import DjangoModelFactory
+from factory.fuzzy import FuzzyChoice, FuzzyFloat
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.seca import SECAMeasurement
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.studies.models import Condition, Group, Lab, Study
+from plasticityhub.subjects.models import Subject
+
+# the first synthetic session; the following ones are a day (and 25 minutes) apart,
+# so every session is the only one of its day
+FIRST_SESSION = datetime.datetime(2020, 1, 5, 8, 0)  # noqa: DTZ001
+SESSION_INTERVAL = datetime.timedelta(days=1, minutes=25)
+
+
+def origin_session_id(n: int) -> str:
+    """
+    A scanner session ID (e.g. 20200105_0800), unique to every ``n``.
+    """
+    return (FIRST_SESSION + n * SESSION_INTERVAL).strftime("%Y%m%d_%H%M")
+
+
+class LabFactory(DjangoModelFactory[Lab]):
+    name = Sequence(lambda n: f"Lab {n}")
+
+    class Meta:
+        model = Lab
+        django_get_or_create = ["name"]
+
+
+class StudyFactory(DjangoModelFactory[Study]):
+    name = Sequence(lambda n: f"Study {n}")
+
+    class Meta:
+        model = Study
+        django_get_or_create = ["name"]
+
+
+class GroupFactory(DjangoModelFactory[Group]):
+    study = SubFactory(StudyFactory)
+    name = Sequence(lambda n: f"Group {n}")
+
+    class Meta:
+        model = Group
+        django_get_or_create = ["study", "name"]
+
+
+class ConditionFactory(DjangoModelFactory[Condition]):
+    study = SubFactory(StudyFactory)
+    name = Sequence(lambda n: f"Condition {n}")
+
+    class Meta:
+        model = Condition
+        django_get_or_create = ["study", "name"]
+
+
+class SubjectFactory(DjangoModelFactory[Subject]):
+    subject_id = Sequence(lambda n: f"{n + 1:09d}")
+    subject_code = Sequence(lambda n: f"{n + 1:04d}")
+    name = Faker("name")
+    date_of_birth = Faker("date_of_birth", minimum_age=18, maximum_age=70)
+    sex = FuzzyChoice(["M", "F"])
+    height = FuzzyFloat(150, 200)
+    weight = FuzzyFloat(45, 110)
+
+    class Meta:
+        model = Subject
+        django_get_or_create = ["subject_id"]
+
+
+class SessionFactory(DjangoModelFactory[Session]):
+    subject = SubFactory(SubjectFactory)
+    study = SubFactory(StudyFactory)
+    group = SubFactory(GroupFactory, study=SelfAttribute("..study"))
+    condition = SubFactory(ConditionFactory, study=SelfAttribute("..study"))
+    lab = SubFactory(LabFactory)
+    origin_session_id = Sequence(origin_session_id)
+
+    class Meta:
+        model = Session
+        django_get_or_create = ["origin_session_id"]
+
+
+class QuestionnaireResponseFactory(DjangoModelFactory[QuestionnaireResponse]):
+    class Params:
+        timestamp = Faker("date_between", start_date="-5y", end_date="today")
+
+    subject = SubFactory(SubjectFactory)
+    full_response = LazyAttribute(
+        lambda o: {
+            "Subject Code": o.subject.subject_code,
+            "Questionnaire": "Yes",
+            "QTimeStamp": o.timestamp.strftime("%m/%d/%Y"),
+            "Weight (kg)": f"{o.subject.weight:.1f}",
+        }
+    )
+
+    class Meta:
+        model = QuestionnaireResponse
+
+
+class SECAMeasurementFactory(DjangoModelFactory[SECAMeasurement]):
+    class Params:
+        timestamp = Faker("date_between", start_date="-5y", end_date="today")
+
+    subject = SubFactory(SubjectFactory)
+    # the other fields are inferred from the measurement when saving
+    full_measurement = LazyAttribute(
+        lambda o: {
+            "timestamp": o.timestamp.strftime("%d/%m/%Y"),
+            "date of birth": o.subject.date_of_birth.strftime("%d/%m/%Y"),
+            "gender": {"M": "male", "F": "female"}.get(o.subject.sex, "other"),
+            "bmi": f"{o.subject.weight / (o.subject.height / 100) ** 2:.1f}",
+            "weight": f"{o.subject.weight:.1f}",
+            "height": f"{o.subject.height:.1f}",
+        }
+    )
+
+    class Meta:
+        model = SECAMeasurement
+
+
+class ProcedureFactory(DjangoModelFactory[Procedure]):
+    session = SubFactory(SessionFactory)
+    name = "kepost"
+    status = "completed"
+    path = LazyAttribute(lambda o: f"kepost/ses-{o.session.session_id}")
+    outputs = LazyFunction(dict)
+
+    class Meta:
+        model = Procedure
@@ -0,0 +1,350 @@
+"""
+Synthetic data sized by parameters, to exercise (and benchmark) the ingest,
+discovery and aggregation steps without the lab's NAS and Google Sheets.
+"""
+
+import datetime
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.tests.factories import (
+    ConditionFactory,
+    GroupFactory,
+    LabFactory,
+    ProcedureFactory,
+    QuestionnaireResponseFactory,
+    SECAMeasurementFactory,
+    SessionFactory,
+    StudyFactory,
+    SubjectFactory,
+    origin_session_id,
+)
+
+# where populate_procedures looks for the kepost outputs under the QNAP root
+KEPOST_DIRECTORY = Path("share/Biden_Results/derivatives/kepost")
+# (name, density, division) of the synthetic atlases, named as in kepost
+ATLASES = [("schaefer2018", "100", "7"), ("schaefer2018", "400", "17")]
+TENSOR_MEASURES = {"mrtrix3": ["fa", "md"], "dipy": ["fa", "md"]}
+
+
+@dataclass
+class SyntheticSheets:
+    """
+    Rows of the upstream sources, as their loaders return them.
+    """
+
+    crf: pd.DataFrame
+    questionnaires: pd.DataFrame
+    seca: pd.DataFrame
+
+
+def make_sheets(
+    n_subjects: int, sessions_per_subject: int = 2, seed: int = 0
+) -> SyntheticSheets:
+    """
+    Fabricate the CRF, questionnaire and SECA sheets of a cohort.
+
+    Every session has a questionnaire filled and a SECA measurement taken
+    on the day of the scan.
+
+    Parameters
+    ----------
+    n_subjects : int
+        The number of subjects.
+    sessions_per_subject : int
+        The number of sessions of every subject.
+    seed : int
+        The seed of the random values.
+
+    Returns
+    -------
+    SyntheticSheets
+        The sheets, with the columns (and formats) of the real ones.
+    """
+    rng = random.Random(seed)
+    crf, questionnaires, seca = [], [], []
+    for i in range(n_subjects):
+        subject_id = f"{i + 1:09d}"
+        subject_code = f"{i + 1:04d}"
+        date_of_birth = datetime.date(
+            1950 + rng.randrange(50), rng.randrange(1, 13), rng.randrange(1, 29)
+        )
+        sex = rng.choice(["Male", "Female"])
+        height = round(rng.uniform(1.5, 2.0), 2)
+        weight = round(rng.uniform(45, 110), 1)
+        for j in range(sessions_per_subject):
+            scan_id = origin_session_id(i * sessions_per_subject + j)
+            timestamp = datetime.datetime.strptime(  # noqa: DTZ007
+                scan_id, "%Y%m%d_%H%M"
+            )
+            crf.append(
+                {
+                    "Name": f"subject {subject_code}",
+                    "DOB": date_of_birth.strftime("%Y-%m-%d"),
+                    "ID": subject_id,
+                    "QCode": subject_code,
+                    "Email": "",
+                    "Cellular No.": "",
+                    "Gender": sex,
+                    "Height": str(height),
+                    "Weight": str(weight),
+                    "Protocol": f"study {i % 3}",
+                    "Study": f"group {i % 2}",
+                    "Group": rng.choice(["rest", "task"]),
+                    "Lab": "MRI",
+                    "ScanTag": ["pre", "post"][j % 2],
+                    "ScanID": scan_id,
+                    "Status": "",
+                }
+            )
+            questionnaires.append(
+                {
+                    "Subject Code": subject_code,
+                    "Questionnaire": "Yes",
+                    "QTimeStamp": timestamp.strftime("%m/%d/%Y"),
+                    "Weight (kg)": str(weight),
+                }
+            )
+            seca.append(
+                {
+                    "Timestamp": timestamp.strftime("%d/%m/%Y"),
+                    "Date of birth": date_of_birth.strftime("%d/%m/%Y"),
+                    "Gender": sex,
+                    "BMI value": f"{weight / height**2:.1f}",
+                    "Weight value": str(weight),
+                    "Height value": str(height * 100),
+                }
+            )
+    return SyntheticSheets(
+        crf=pd.DataFrame(crf, dtype=str),
+        questionnaires=pd.DataFrame(questionnaires, dtype=str),
+        seca=pd.DataFrame(seca, dtype=str),
+    )
+
+
+def make_cohort(
+    n_subjects: int,
+    sessions_per_subject: int = 2,
+    n_studies: int = 3,
+    with_behavioral: bool = True,
+) -> list[Session]:
+    """
+    Create a cohort of subjects and their sessions in the database.
+
+    Parameters
+    ----------
+    n_subjects : int
+        The number of subjects.
+    sessions_per_subject : int
+        The number of sessions of every subject.
+    n_studies : int
+        The number of studies the subjects are spread over.
+    with_behavioral : bool
+        Whether to add a questionnaire response and a SECA measurement
+        on the day of every session.
+
+    Returns
+    -------
+    list[Session]
+        The sessions.
+    """
+    lab = LabFactory(name="MRI")
+    studies = []
+    for i in range(n_studies):
+        study = StudyFactory(name=f"Study {i}")
+        studies.append(
+            (
+                study,
+                GroupFactory(study=study, name="Control"),
+                ConditionFactory(study=study, name="Rest"),
+            )
+        )
+    sessions = []
+    for i, subject in enumerate(SubjectFactory.create_batch(n_subjects)):
+        study, group, condition = studies[i % n_studies]
+        for _ in range(sessions_per_subject):
+            session = SessionFactory(
+                subject=subject,
+                study=study,
+                group=group,
+                condition=condition,
+                lab=lab,
+            )
+            sessions.append(session)
+            if with_behavioral:
+                QuestionnaireResponseFactory(subject=subject, timestamp=session.date)
+                SECAMeasurementFactory(subject=subject, timestamp=session.date)
+    return sessions
+
+
+def participant_label(subject: Subject) -> str:
+    """
+    The BIDS participant label of a subject (as derived by update_derivatives).
+    """
+    return (
+        subject.subject_code.replace("_", "")
+        .replace(" ", "")
+        .replace("\t", "")
+        .replace("-", "")
+    )
+
+
+def make_kepost_session(
+    session_directory: Path,
+    subject: str,
+    session: str,
+    n_regions: int = 100,
+    rng: np.random.Generator | None = None,
+) -> dict:
+    """
+    Write the parcellation and QC outputs of a kepost session.
+
+    Parameters
+    ----------
+    session_directory : Path
+        The ``ses-<label>`` directory.
+    subject : str
+        The participant label.
+    session : str
+        The session label.
+    n_regions : int
+        The number of regions of every parcellation.
+    rng : np.random.Generator, optional
+        The source of the random values.
+
+    Returns
+    -------
+    dict
+        The BIDS entities of every output, by path, as stored in
+        ``Procedure.outputs``.
+    """
+    rng = rng or np.random.default_rng(0)
+    dwi = session_directory / "dwi"
+    dwi.mkdir(parents=True, exist_ok=True)
+    prefix = f"sub-{subject}_ses-{session}"
+    base = {"subject": subject, "session": session, "datatype": "dwi"}
+    outputs = {}
+    for software, measures in TENSOR_MEASURES.items():
+        for measure in measures:
+            for atlas, density, division in ATLASES:
+                path = dwi / (
+                    f"{prefix}_space-dwi_atlas-{atlas}_den-{density}"
+                    f"_division-{division}networks_reconstruction-{software}"
+                    f"_measure-{measure}_parc.pkl"
+                )
+                pd.DataFrame(
+                    {
+                        "index": range(1, n_regions + 1),
+                        "mean": rng.random(n_regions),
+                        "median": rng.random(n_regions),
+                    }
+                ).to_pickle(path)
+                outputs[str(path)] = {
+                    **base,
+                    "space": "dwi",
+                    "atlas": atlas,
+                    "den": density,
+                    "division": f"{division}networks",
+                    "reconstruction_software": software,
+                    "measure": measure,
+                    "suffix": "parc",
+                    "extension": ".pkl",
+                }
+    snr = dwi / f"{prefix}_reconstruction-qc_desc-snr_qc.json"
+    snr.write_text(json.dumps({"snr": float(rng.uniform(10, 40))}))
+    eddy = dwi / f"{prefix}_reconstruction-qc_desc-eddy_qc.csv"
+    pd.DataFrame({"qc_mot_abs": [rng.random()], "qc_mot_rel": [rng.random()]}).to_csv(
+        eddy
+    )
+    for path, description in [(snr, "snr"), (eddy, "eddy")]:
+        outputs[str(path)] = {
+            **base,
+            "reconstruction_software": "qc",
+            "desc": description,
+            "suffix": "qc",
+            "extension": path.suffix,
+        }
+    return outputs
+
+
+def make_kepost_tree(
+    qnap_path: Path,
+    sessions: Iterable[Session],
+    n_regions: int = 100,
+    with_procedures: bool = False,
+    seed: int = 0,
+) -> dict[int, dict]:
+    """
+    Write a kepost derivatives tree for sessions, laid out as on the QNAP.
+
+    Parameters
+    ----------
+    qnap_path : Path
+        The root of the fake QNAP.
+    sessions : Iterable[Session]
+        The sessions to write outputs for.
+    n_regions : int
+        The number of regions of every parcellation.
+    with_procedures : bool
+        Whether to also create the sessions' kepost procedures, with the
+        outputs ``populate_procedures`` would parse (which requires pybids).
+    seed : int
+        The seed of the random values.
+
+    Returns
+    -------
+    dict[int, dict]
+        The outputs of every session, by primary key.
+    """
+    rng = np.random.default_rng(seed)
+    outputs = {}
+    for session in sessions:
+        subject = participant_label(session.subject)
+        directory = (
+            Path(qnap_path)
+            / KEPOST_DIRECTORY
+            / f"sub-{subject}"
+            / f"ses-{session.session_id}"
+        )
+        outputs[session.pk] = make_kepost_session(
+            directory, subject, session.session_id, n_regions, rng
+        )
+        if with_procedures:
+            ProcedureFactory(
+                session=session, path=str(directory), outputs=outputs[session.pk]
+            )
+    return outputs
+
+
+def make_rawdata_tree(root: Path, sessions: Iterable[Session]) -> Path:
+    """
+    Write the scanner export directories of sessions, as ``index_rawdata`` finds them.
+
+    Parameters
+    ----------
+    root : Path
+        The root of the scanner exports.
+    sessions : Iterable[Session]
+        The sessions.
+
+    Returns
+    -------
+    Path
+        The root.
+    """
+    for session in sessions:
+        directory = (
+            Path(root)
+            / f"sub-{participant_label(session.subject)}"
+            / session.origin_session_id
+        )
+        (directory / "dicom").mkdir(parents=True, exist_ok=True)
+    return Path(root)
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.studies.models import Condition, Group, Lab, Study
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils import admin as utils_admin
+from plasticityhub.utils.admin import EstimatedCountPaginator
+
+pytestmark = pytest.mark.django_db
+
+CHANGELISTS = [
+    "scans_session",
+    "subjects_subject",
+    "procedures_procedure",
+    "behavioral_questionnaireresponse",
+    "behavioral_secameasurement",
+]
+
+
+def make_sessions(start: int, count: int):
+    study, _ = Study.objects.get_or_create(name="Learning")
+    group, _ = Group.objects.get_or_create(name="Control", study=study)
+    condition, _ = Condition.objects.get_or_create(name="Rest", study=study)
+    lab, _ = Lab.objects.get_or_create(name="Lab")
+    for i in range(start, start + count):
+        subject = Subject.objects.create(
+            subject_id=f"{i:09d}", subject_code=f"{i:04d}", name="Test Subject"
+        )
+        session = Session.objects.create(
+            subject=subject,
+            study=study,
+            group=group,
+            condition=condition,
+            lab=lab,
+            origin_session_id=f"202401{i + 1:02d}_1030",
+        )
+        Procedure.objects.create(
+            name="kepost",
+            description="",
+            session=session,
+            path="",
+            status="completed",
+            outputs={"key": "value"},
+        )
+        QuestionnaireResponse.objects.create(
+            subject=subject, full_response={"Questionnaire": "No"}
+        )
+
+
+@pytest.mark.parametrize("model", CHANGELISTS)
+def test_changelist_queries_do_not_grow_with_rows(admin_client: Client, model: str):
+    url = reverse(f"admin:{model}_changelist")
+    make_sessions(0, 2)
+    with CaptureQueriesContext(connection) as few:
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    make_sessions(2, 8)
+    with CaptureQueriesContext(connection) as many:
+        admin_client.get(url)
+    assert len(many) == len(few)
+
+
+@pytest.mark.parametrize("model", CHANGELISTS)
+def test_changelist_search(admin_client: Client, model: str):
+    make_sessions(0, 1)
+    response = admin_client.get(reverse(f"admin:{model}_changelist"), {"q": "0000"})
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize(
+    ("model", "column"),
+    [
+        ("procedures_procedure", "outputs"),
+        ("behavioral_questionnaireresponse", "full_response"),
+        ("behavioral_secameasurement", "full_measurement"),
+    ],
+)
+def test_changelist_defers_json_columns(admin_client: Client, model: str, column: str):
+    # the columns are deferred by the models' default managers
+    make_sessions(0, 1)
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(reverse(f"admin:{model}_changelist"))
+    selects = [q["sql"] for q in queries if f'FROM "{model}"' in q["sql"]]
+    assert selects
+    assert not any(f'"{model}"."{column}"' in sql for sql in selects)
+
+
+def test_estimated_count_paginator(monkeypatch):
+    make_sessions(0, 3)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE "procedures_procedure"')
+    paginator = EstimatedCountPaginator(Procedure.objects.order_by("pk"), 2)
+    # small tables are counted exactly
+    assert paginator.count == 3  # noqa: PLR2004
+
+    monkeypatch.setattr(utils_admin, "EXACT_COUNT_THRESHOLD", 0)
+    with CaptureQueriesContext(connection) as queries:
+        count = EstimatedCountPaginator(Procedure.objects.order_by("pk"), 2).count
+    assert count == 3  # noqa: PLR2004
+    assert "reltuples" in queries[0]["sql"]
+    # filtered querysets are always counted exactly
+    filtered = Procedure.objects.filter(name="other").order_by("pk")
+    assert EstimatedCountPaginator(filtered, 2).count == 0
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.studies.models import Study
+from plasticityhub.subjects.models import Subject
+from plasticityhub.users.models import User
+from plasticityhub.utils.api import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def sessions() -> list[Session]:
+    study = Study.objects.create(name="Learning")
+    other = Study.objects.create(name="Other")
+    subject = Subject.objects.create(
+        subject_id="000000001", subject_code="0001", name="Test Subject"
+    )
+    subject.studies.add(study)
+    return [
+        Session.objects.create(
+            subject=subject,
+            study=study if i < 3 else other,  # noqa: PLR2004
+            origin_session_id=f"2024011{i}_1030",
+            scan_tag="pre",
+        )
+        for i in range(4)
+    ]
+
+
+@pytest.fixture
+def api_client(client: Client, user: User) -> Client:
+    client.force_login(user)
+    return client
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["2024-01-10 08:30:00+00:00", 3]), 2) == [
+        "2024-01-10 08:30:00+00:00",
+        3,
+    ]
+
+
+def test_requires_login(client: Client):
+    response = client.get(reverse("scans:list"))
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_sessions_keyset_pagination(api_client: Client, sessions: list[Session]):
+    url = reverse("scans:list")
+    response = api_client.get(url, {"limit": 3, "fields": "id,session_id"})
+    page = response.json()
+    assert [row["id"] for row in page["results"]] == [s.pk for s in sessions[:3]]
+    assert set(page["results"][0]) == {"id", "session_id"}
+
+    page = api_client.get(page["next"]).json()
+    assert [row["id"] for row in page["results"]] == [sessions[3].pk]
+    assert page["next"] is None
+
+
+def test_sessions_filters(api_client: Client, sessions: list[Session]):
+    response = api_client.get(
+        reverse("scans:list"), {"study": "Other", "fields": "session_id,study"}
+    )
+    assert response.json()["results"] == [
+        {"session_id": sessions[3].session_id, "study": "Other"}
+    ]
+
+
+def test_unknown_fields_are_rejected(api_client: Client, sessions: list[Session]):
+    response = api_client.get(reverse("subjects:list"), {"fields": "id,name"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "name" in response.json()["error"]
+
+
+def test_invalid_cursor(api_client: Client):
+    response = api_client.get(reverse("scans:list"), {"cursor": "not a cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_subjects_by_study(api_client: Client, sessions: list[Session]):
+    response = api_client.get(reverse("subjects:list"), {"study": "Learning"})
+    assert [row["subject_code"] for row in response.json()["results"]] == ["0001"]
+
+
+def test_procedures(api_client: Client, sessions: list[Session]):
+    Procedure.objects.create(
+        name="kepost",
+        description="",
+        session=sessions[0],
+        path="/derivatives/kepost",
+        status="completed",
+    )
+    response = api_client.get(reverse("procedures:list"), {"study": "Learning"})
+    assert response.json()["results"] == [
+        {
+            "id": Procedure.objects.get().pk,
+            "name": "kepost",
+            "status": "completed",
+            "session_id": sessions[0].session_id,
+            "subject_code": "0001",
+        }
+    ]
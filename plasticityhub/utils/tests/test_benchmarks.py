@@ -0,0 +1,170 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.utils.management.commands.update_database import (
+    output_to_csv,
+    update_database_from_frame,
+)
+from plasticityhub.utils.management.commands.update_database_from_questionnaire import (
+    update_database_from_frame as update_questionnaires_from_frame,
+)
+from plasticityhub.utils.management.commands.update_derivatives import (
+    output_to_csv_with_derivatives,
+)
+from plasticityhub.utils.tests.synthetic import (
+    ATLASES,
+    KEPOST_DIRECTORY,
+    TENSOR_MEASURES,
+    make_cohort,
+    make_kepost_tree,
+    make_sheets,
+)
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+SESSIONS_PER_SUBJECT = 2
+# the number of sessions of the benchmarked cohorts
+SIZES = [20, 80, 320]
+
+
+def cohort(n_sessions: int) -> list[Session]:
+    return make_cohort(n_sessions // SESSIONS_PER_SUBJECT, SESSIONS_PER_SUBJECT)
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_ingest_crf(benchmark_step, tmp_path: Path, n_sessions: int):
+    sheets = make_sheets(n_sessions // SESSIONS_PER_SUBJECT, SESSIONS_PER_SUBJECT)
+    mapped_rawdata_path = tmp_path / "mapped_rawdata.json"
+    mapped_rawdata_path.write_text(json.dumps({}))
+    benchmark_step(
+        "update_database",
+        n_sessions,
+        update_database_from_frame,
+        sheets.crf,
+        mapped_rawdata_path,
+    )
+    assert Session.objects.count() == n_sessions
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_ingest_questionnaires(benchmark_step, n_sessions: int):
+    cohort(n_sessions)
+    sheets = make_sheets(n_sessions // SESSIONS_PER_SUBJECT, SESSIONS_PER_SUBJECT)
+    benchmark_step(
+        "update_questionnaires",
+        n_sessions,
+        update_questionnaires_from_frame,
+        sheets.questionnaires,
+        bulk=True,
+    )
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_output_to_csv(benchmark_step, tmp_path: Path, n_sessions: int):
+    cohort(n_sessions)
+    benchmark_step(
+        "output_to_csv", n_sessions, output_to_csv, tmp_path / "sessions.csv"
+    )
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_output_to_csv_with_derivatives(
+    benchmark_step, tmp_path: Path, n_sessions: int
+):
+    sessions = cohort(n_sessions)
+    make_kepost_tree(tmp_path, sessions, n_regions=10)
+    benchmark_step(
+        "output_to_csv_with_derivatives",
+        n_sessions,
+        output_to_csv_with_derivatives,
+        tmp_path / "sessions_with_derivatives.csv",
+        bids_path=tmp_path / "bids",
+        derivatives_path=tmp_path / KEPOST_DIRECTORY.parent,
+    )
+
+
+def tensor_queries() -> list[dict]:
+    return [
+        {
+            "reconstruction_software": software,
+            "measure": measure,
+            "atlas": atlas,
+            "den": density,
+            "division": f"{division}networks",
+        }
+        for software, measures in TENSOR_MEASURES.items()
+        for measure in measures
+        for atlas, density, division in ATLASES
+    ]
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_procedure_get(benchmark_step, tmp_path: Path, n_sessions: int):
+    make_kepost_tree(tmp_path, cohort(n_sessions), n_regions=10, with_procedures=True)
+    procedures = list(Procedure.objects.with_outputs())
+    queries = tensor_queries()
+
+    def get_all():
+        return [procedure.get(query) for procedure in procedures for query in queries]
+
+    paths = benchmark_step("Procedure.get", n_sessions, get_all)
+    assert all(paths)
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_parse_session(benchmark_step, tmp_path: Path, n_sessions: int):
+    pytest.importorskip("bids")
+    pytest.importorskip("kepost")
+    from plasticityhub.utils.management.static.procedures.utils import parse_session
+
+    sessions = cohort(n_sessions)
+    make_kepost_tree(tmp_path, sessions, n_regions=10)
+    directories = sorted((tmp_path / KEPOST_DIRECTORY).glob("sub-*/ses-*"))
+    benchmark_step(
+        "parse_session",
+        n_sessions,
+        lambda: [parse_session(directory) for directory in directories],
+    )
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_populate_kepost_procedures(benchmark_step, tmp_path: Path, n_sessions: int):
+    pytest.importorskip("bids")
+    pytest.importorskip("kepost")
+    from plasticityhub.utils.management.commands.populate_procedures import (
+        populate_kepost_procedures,
+    )
+
+    make_kepost_tree(tmp_path, cohort(n_sessions), n_regions=10)
+    changed = benchmark_step(
+        "populate_kepost_procedures",
+        n_sessions,
+        populate_kepost_procedures,
+        tmp_path,
+    )
+    assert len(changed) == n_sessions
+
+
+@pytest.mark.parametrize("n_sessions", SIZES)
+def test_aggregate_tensor_results(benchmark_step, tmp_path: Path, n_sessions: int):
+    pytest.importorskip("kepost")
+    from plasticityhub.utils.management.commands.aggregate_kepost_parcellations import (
+        aggregate_tensor_results,
+        load_kepost_procedures,
+    )
+
+    make_kepost_tree(
+        tmp_path / "qnap", cohort(n_sessions), n_regions=10, with_procedures=True
+    )
+    benchmark_step(
+        "aggregate_tensor_results",
+        n_sessions,
+        aggregate_tensor_results,
+        load_kepost_procedures(),
+        tmp_path / "aggregated",
+        True,  # noqa: FBT003
+    )
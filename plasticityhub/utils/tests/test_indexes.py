@@ -0,0 +1,47 @@
+import datetime
+
+import pytest
+from django.db.models.fields.json import KT
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+
+
+@pytest.mark.parametrize(
+    ("queryset", "index"),
+    [
+        (lambda: Subject.objects.filter(subject_code="0001"), "subject_code_idx"),
+        (
+            lambda: Subject.objects.filter(
+                date_of_birth=datetime.date(1990, 1, 1), sex="M"
+            ),
+            "subject_dob_sex_idx",
+        ),
+        (
+            lambda: Session.objects.filter(date=datetime.date(2024, 1, 1)),
+            "session_date_idx",
+        ),
+        (lambda: Session.objects.order_by("timestamp"), "session_timestamp_idx"),
+        (
+            lambda: Session.objects.filter(subject_id__in=[1, 2]).order_by(
+                "subject", "timestamp"
+            ),
+            "session_subject_timestamp_idx",
+        ),
+        (
+            lambda: Procedure.objects.filter(name="kepost"),
+            "procedure_name_session_idx",
+        ),
+        (
+            lambda: QuestionnaireResponse.objects.alias(
+                qtimestamp=KT("full_response__QTimeStamp")
+            ).filter(subject_id=1, qtimestamp="01/05/2024"),
+            "questionnaire_subject_time_idx",
+        ),
+    ],
+)
+def test_hot_lookups_use_an_index(query_plan, queryset, index):
+    plan = query_plan(queryset())
+    assert index in plan
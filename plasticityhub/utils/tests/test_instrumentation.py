@@ -0,0 +1,120 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.instrumentation import Instrumentation
+from plasticityhub.utils.management.commands import (
+    refresh_session_fields,
+    update_database,
+)
+from plasticityhub.utils.pipeline import Stage, StageGraph
+from plasticityhub.utils.sources import GoogleSheetSource, SheetSnapshotCache
+from plasticityhub.utils.tests.synthetic import make_cohort, make_sheets
+
+pytestmark = pytest.mark.django_db
+
+# the exported sessions and their questionnaire data are loaded in bulk
+OUTPUT_TO_CSV_QUERY_BUDGET = 3
+
+
+def test_stages_are_recorded_in_worker_threads():
+    instrumentation = Instrumentation("test")
+
+    def count_subjects(upstream):
+        Subject.objects.count()
+
+    graph = StageGraph(
+        [Stage("first", count_subjects), Stage("second", count_subjects)]
+    )
+    with instrumentation.run():
+        graph.run(instrumentation=instrumentation)
+        Subject.objects.exists()
+    report = instrumentation.report
+    assert [report.stage(name).queries for name in ["first", "second"]] == [1, 1]
+    assert report.queries == 3  # noqa: PLR2004
+    assert report.peak_rss > 0
+
+
+def test_failed_stages_are_recorded():
+    instrumentation = Instrumentation("test")
+    with pytest.raises(ValueError), instrumentation.stage("failing"):  # noqa: PT011
+        Subject.objects.count()
+        raise ValueError
+    assert instrumentation.report.stage("failing").queries == 1
+
+
+def test_reports_are_written(tmp_path: Path, monkeypatch):
+    make_cohort(n_subjects=2, with_behavioral=False)
+    monkeypatch.setattr(
+        refresh_session_fields.Command, "instrumentation_dir", str(tmp_path)
+    )
+    command = refresh_session_fields.Command()
+    call_command(command, stdout=StringIO())
+    (path,) = tmp_path.glob("refresh_session_fields-*.json")
+    report = json.loads(path.read_text())
+    assert report["command"] == "refresh_session_fields"
+    assert report["queries"] == command.report.queries > 0
+
+
+def run_update_database(tmp_path: Path, n_subjects: int):
+    sheets = make_sheets(n_subjects)
+    SheetSnapshotCache(tmp_path / "snapshots").write(
+        GoogleSheetSource("crf"), sheets.crf, revision="1"
+    )
+    mapped_rawdata_path = tmp_path / "mapped_rawdata.json"
+    mapped_rawdata_path.write_text(json.dumps({}))
+    command = update_database.Command()
+    call_command(
+        command,
+        sheet_key="crf",
+        mapped_rawdata_path=str(mapped_rawdata_path),
+        snapshot_dir=str(tmp_path / "snapshots"),
+        offline=True,
+        stdout=StringIO(),
+    )
+    return command.report
+
+
+def test_update_database_export_query_budget(tmp_path: Path, monkeypatch):
+    # the exports are written to (and delivered from) the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(update_database.Command, "rsync_destination", None)
+    monkeypatch.setattr(update_database.Command, "export_dir", None)
+    small = run_update_database(tmp_path, n_subjects=2)
+    large = run_update_database(tmp_path, n_subjects=8)
+    for report in [small, large]:
+        assert report.stage("output_to_csv").queries <= OUTPUT_TO_CSV_QUERY_BUDGET
+    assert small.stage("output_to_csv").queries == large.stage("output_to_csv").queries
+
+
+def test_refresh_session_fields_query_budget():
+    make_cohort(n_subjects=2, with_behavioral=False)
+    small = refresh_session_fields.Command()
+    call_command(small, stdout=StringIO())
+    make_cohort(n_subjects=8, with_behavioral=False)
+    large = refresh_session_fields.Command()
+    call_command(large, stdout=StringIO())
+    assert small.report.queries == large.report.queries
+
+
+def test_kepost_procedures_are_described_without_queries(kepost_tree: tuple):
+    pytest.importorskip("niworkflows")
+    from plasticityhub.utils.management.commands.aggregate_kepost_networks import (
+        collect_session_and_subject_details,
+    )
+    from plasticityhub.utils.management.commands.aggregate_kepost_parcellations import (
+        load_kepost_procedures,
+    )
+
+    instrumentation = Instrumentation("test")
+    with instrumentation.stage("describe"):
+        details = [
+            collect_session_and_subject_details(procedure)
+            for procedure in load_kepost_procedures()
+        ]
+    assert len(details) == len(kepost_tree[1])
+    assert instrumentation.report.stage("describe").queries == 1
@@ -0,0 +1,109 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.seca import SECAMeasurement
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+
+pytestmark = pytest.mark.django_db
+
+OUTPUTS = {"sub-1_ses-1_desc-preproc_dwi.nii.gz": {"desc": "preproc"}}
+
+
+@pytest.fixture
+def session() -> Session:
+    subject = Subject.objects.create(
+        subject_id="000000001",
+        name="Test Subject",
+        date_of_birth=datetime.date(1990, 2, 3),
+        sex="M",
+    )
+    seca_measurement = SECAMeasurement.objects.create(
+        subject=subject,
+        full_measurement={
+            "timestamp": "10/01/2024",
+            "date of birth": "03/02/1990",
+            "gender": "male",
+            "bmi": "22",
+            "weight": "70",
+            "height": "178",
+        },
+    )
+    questionnaire_response = QuestionnaireResponse.objects.create(
+        subject=subject,
+        full_response={"Questionnaire": "Yes", "QTimeStamp": "01/10/2024"},
+    )
+    session = Session.objects.create(
+        subject=subject,
+        origin_session_id="20240110_1030",
+        seca_measurement=seca_measurement,
+        questionnaire_response=questionnaire_response,
+    )
+    Procedure.objects.create(
+        name="kepost",
+        description="",
+        session=session,
+        path="",
+        status="completed",
+        outputs=OUTPUTS,
+    )
+    return session
+
+
+def test_json_columns_are_deferred_by_default(session: Session):
+    assert Procedure.objects.get().get_deferred_fields() == {"outputs"}
+    assert QuestionnaireResponse.objects.get().get_deferred_fields() == {
+        "full_response"
+    }
+    assert SECAMeasurement.objects.get().get_deferred_fields() == {"full_measurement"}
+
+
+def test_related_lookups_defer_json_columns(session: Session):
+    session = Session.objects.get(pk=session.pk)
+    assert session.seca_measurement.get_deferred_fields() == {"full_measurement"}
+    assert session.questionnaire_response.get_deferred_fields() == {"full_response"}
+    assert session.procedures.get().get_deferred_fields() == {"outputs"}
+
+
+def test_with_accessors_load_json_columns(session: Session):
+    with CaptureQueriesContext(connection) as queries:
+        procedure = Procedure.objects.with_outputs().get()
+        assert procedure.outputs == OUTPUTS
+    assert len(queries) == 1
+    response = QuestionnaireResponse.objects.with_full_response().get()
+    assert response.get_deferred_fields() == set()
+    measurement = SECAMeasurement.objects.with_full_measurement().get()
+    assert measurement.get_deferred_fields() == set()
+
+
+def test_undefer_keeps_other_deferrals(session: Session):
+    procedure = Procedure.objects.defer("path").with_outputs().get()
+    assert procedure.get_deferred_fields() == {"path"}
+    procedure = Procedure.objects.only("name").with_outputs().get()
+    assert procedure.get_deferred_fields() >= {"path", "status"}
+    assert "outputs" not in procedure.get_deferred_fields()
+
+
+def test_deferred_columns_load_on_access(session: Session):
+    procedure = Procedure.objects.get()
+    assert procedure.get({"desc": "preproc"}) == next(iter(OUTPUTS))
+    response = QuestionnaireResponse.objects.get()
+    assert response.timestamp.date() == datetime.date(2024, 1, 10)
+
+
+def test_saving_a_deferred_measurement_keeps_derived_fields(session: Session):
+    measurement = SECAMeasurement.objects.get()
+    measurement.subject_code = "0001"
+    with CaptureQueriesContext(connection) as queries:
+        measurement.save()
+    # the full measurement is neither loaded nor written
+    assert len(queries) == 1
+    assert "full_measurement" not in queries[0]["sql"]
+    measurement = SECAMeasurement.objects.get()
+    assert measurement.weight == 70  # noqa: PLR2004
+    assert measurement.date == datetime.date(2024, 1, 10)
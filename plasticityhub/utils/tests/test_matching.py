@@ -0,0 +1,32 @@
+import pandas as pd
+
+from plasticityhub.utils.matching import match_rows
+
+
+def test_match_rows():
+    df = pd.DataFrame(
+        {"code": ["a", "b", "c", "a"], "value": [1, 2, 3, 4]},
+        index=[10, 11, 12, 13],
+    )
+    keys = pd.DataFrame({"pk": [1, 2, 3], "subject_code": ["a", "b", "b"]})
+    matched, report = match_rows(df, keys, left_on=["code"], right_on=["subject_code"])
+    assert matched.index.tolist() == [10, 13]
+    assert matched["pk"].tolist() == [1, 1]
+    assert matched["value"].tolist() == [1, 4]
+    assert report.set_index("row")["reason"].to_dict() == {
+        11: "ambiguous",
+        12: "unmatched",
+    }
+    assert report.set_index("row")["n_matches"].to_dict() == {11: 2, 12: 0}
+
+
+def test_match_rows_multiple_columns():
+    df = pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "sex": ["M", "M"]})
+    keys = pd.DataFrame(
+        {"pk": [1, 2], "session_date": ["2024-01-01", "2024-01-02"], "sex": ["M", "F"]}
+    )
+    matched, report = match_rows(
+        df, keys, left_on=["date", "sex"], right_on=["session_date", "sex"]
+    )
+    assert matched["pk"].tolist() == [1]
+    assert report["row"].tolist() == [1]
@@ -0,0 +1,112 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from plasticityhub.utils.management.static.database_mapping import COLUMNS_MAPPING
+from plasticityhub.utils.normalization import REJECTION_COLUMNS, normalize
+
+
+def crf_row(**overrides) -> dict:
+    row = {
+        "Name": "jane doe",
+        "DOB": "1990-02-03",
+        "ID": "12345",
+        "Email": "",
+        "Cellular No.": "",
+        "Gender": "female",
+        "Height": "1.65",
+        "Weight": "60",
+        "Protocol": "learning",
+        "Study": "control",
+        "Group": "rest",
+        "Lab": "MRI",
+        "ScanTag": "T1",
+        "QCode": "12",
+        "ScanID": "20240110_1030",
+        "Status": "",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_normalize_converts_columns():
+    clean, rejected = normalize(
+        pd.DataFrame([crf_row()]), COLUMNS_MAPPING, key="scanid"
+    )
+    assert rejected.empty
+    assert rejected.columns.tolist() == REJECTION_COLUMNS
+    row = clean.iloc[0]
+    assert row["name"] == "Jane Doe"
+    assert row["dob"] == datetime.date(1990, 2, 3)
+    assert row["id"] == "000012345"
+    assert row["qcode"] == "0012"
+    assert row["gender"] == "F"
+    assert row["height"] == pytest.approx(165)
+    assert row["weight"] == 60  # noqa: PLR2004
+    assert row["protocol"] == "Learning"
+    assert row["scantag"] == "t1"
+    # blank cells become None, or the column's default
+    assert row["email"] is None
+    assert row["status"] == ""
+
+
+def test_normalize_keeps_heights_in_centimetres():
+    clean, _ = normalize(
+        pd.DataFrame([crf_row(Height="170"), crf_row(Height="", ScanID="2")]),
+        COLUMNS_MAPPING,
+        key="scanid",
+    )
+    assert clean["height"].tolist() == [170, None]
+
+
+def test_normalize_handles_numeric_codes():
+    clean, _ = normalize(
+        pd.DataFrame([crf_row(ID=12345.0, QCode=7)]), COLUMNS_MAPPING, key="scanid"
+    )
+    assert clean.iloc[0]["id"] == "000012345"
+    assert clean.iloc[0]["qcode"] == "0007"
+
+
+def test_normalize_rejects_invalid_rows():
+    df = pd.DataFrame(
+        [
+            crf_row(),
+            crf_row(),
+            crf_row(ScanID=""),
+            crf_row(ScanID="2", DOB="not a date", Weight="heavy"),
+            crf_row(ScanID="3", Lab=" "),
+            crf_row(ScanID="4", Name="", Gender=""),
+        ]
+    )
+    clean, rejected = normalize(df, COLUMNS_MAPPING, key="scanid")
+    assert clean.index.tolist() == [0, 5]
+    assert clean.loc[5, "name"] == "Unknown Unknown"
+    assert clean.loc[5, "gender"] == "U"
+    assert rejected[["row", "reason"]].to_dict("records") == [
+        {"row": 1, "reason": "duplicate scanid"},
+        {"row": 2, "reason": "missing scanid"},
+        {"row": 3, "reason": "invalid dob"},
+        {"row": 3, "reason": "invalid weight"},
+        {"row": 4, "reason": "missing lab"},
+    ]
+    assert rejected.loc[2, "value"] == "not a date"
+
+
+def test_normalize_skips_keys_seen_in_earlier_batches():
+    seen: set = set()
+    normalize(pd.DataFrame([crf_row()]), COLUMNS_MAPPING, key="scanid", seen=seen)
+    clean, rejected = normalize(
+        pd.DataFrame([crf_row()]), COLUMNS_MAPPING, key="scanid", seen=seen
+    )
+    assert clean.empty
+    assert rejected["reason"].tolist() == ["duplicate scanid"]
+
+
+def test_normalize_requires_columns():
+    with pytest.raises(ValueError, match="lab"):
+        normalize(
+            pd.DataFrame([crf_row()]).drop(columns="Lab"),
+            COLUMNS_MAPPING,
+            key="scanid",
+        )
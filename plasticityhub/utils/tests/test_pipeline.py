@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.utils.pipeline import (
+    ChangeSet,
+    Stage,
+    StageGraph,
+    diff_snapshots,
+    run_stages,
+)
+from plasticityhub.utils.tests.synthetic import (
+    KEPOST_DIRECTORY,
+    make_cohort,
+    make_kepost_tree,
+)
+
+
+def test_run_stages_records_timings():
+    calls = []
+    timings = run_stages(
+        [
+            [("first", lambda: calls.append("first"))],
+            [("second", lambda: calls.append("second"))],
+        ]
+    )
+    assert calls == ["first", "second"]
+    assert set(timings) == {"first", "second"}
+
+
+def test_run_stages_runs_groups_concurrently():
+    # both stages must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    timings = run_stages(
+        [[("derivatives", barrier.wait), ("questionnaires", barrier.wait)]]
+    )
+    assert set(timings) == {"derivatives", "questionnaires"}
+
+
+def _graph(calls, produced):
+    def stage(name):
+        def func(upstream):
+            calls.append(name)
+            return produced.get(name)
+
+        return func
+
+    return StageGraph(
+        [
+            Stage("ingest", stage("ingest")),
+            Stage("probe", stage("probe"), requires=["ingest"]),
+            Stage(
+                "populate",
+                stage("populate"),
+                requires=["ingest", "probe"],
+                consumes=["sessions", "derivatives"],
+            ),
+            Stage(
+                "aggregate",
+                stage("aggregate"),
+                requires=["populate"],
+                consumes=["procedures"],
+            ),
+        ]
+    )
+
+
+def test_stage_graph_levels():
+    levels = _graph([], {}).levels()
+    assert [[stage.name for stage in level] for level in levels] == [
+        ["ingest"],
+        ["probe"],
+        ["populate"],
+        ["aggregate"],
+    ]
+
+
+def test_stage_graph_skips_unchanged_stages():
+    calls: list = []
+    timings, changes, unchanged = _graph(calls, {}).run()
+    assert calls == ["ingest", "probe"]
+    assert unchanged == ["populate", "aggregate"]
+    assert not changes
+    assert set(timings) == {"ingest", "probe"}
+
+
+def test_stage_graph_propagates_changes():
+    calls: list = []
+    produced = {
+        "probe": ChangeSet(derivatives={1}),
+        "populate": ChangeSet(procedures={10}),
+    }
+    _, changes, unchanged = _graph(calls, produced).run()
+    assert calls == ["ingest", "probe", "populate", "aggregate"]
+    assert unchanged == []
+    assert changes.get("procedures") == {10}
+
+
+def test_stage_graph_full_run():
+    calls: list = []
+    _graph(calls, {}).run(full=True)
+    assert calls == ["ingest", "probe", "populate", "aggregate"]
+
+
+def test_stage_graph_rejects_cycles():
+    graph = StageGraph(
+        [
+            Stage("a", lambda upstream: None, requires=["b"]),
+            Stage("b", lambda upstream: None, requires=["a"]),
+        ]
+    )
+    with pytest.raises(ValueError, match="Cyclic"):
+        graph.levels()
+
+
+def test_diff_snapshots():
+    before = {1: ("a",), 2: ("b",)}
+    after = {1: ("a",), 2: ("c",), 3: ("d",)}
+    assert diff_snapshots(before, after) == {2, 3}
+
+
+@pytest.mark.django_db
+def test_changed_kepost_outputs(kepost_tree: tuple):
+    pytest.importorskip("bids")
+    from plasticityhub.utils.management.commands.populate_procedures import (
+        changed_kepost_outputs,
+    )
+
+    qnap_path, sessions = kepost_tree
+    assert changed_kepost_outputs(qnap_path) == set()
+    # outputs written after their procedure was parsed
+    (directory,) = (qnap_path / KEPOST_DIRECTORY).glob(
+        f"sub-*/ses-{sessions[0].session_id}"
+    )
+    os.utime(directory)
+    Procedure.objects.filter(session=sessions[1]).delete()
+    # an output rewritten in place, which leaves the directories' mtimes as is
+    (qc,) = (qnap_path / KEPOST_DIRECTORY).glob(
+        f"sub-*/ses-{sessions[2].session_id}/dwi/*_desc-snr_qc.json"
+    )
+    mtimes = [path.stat().st_mtime_ns for path in [qc.parent, qc.parent.parent]]
+    qc.write_text(json.dumps({"snr": 20.0}))
+    assert [path.stat().st_mtime_ns for path in [qc.parent, qc.parent.parent]] == mtimes
+    assert changed_kepost_outputs(qnap_path) == {
+        sessions[0].session_id,
+        sessions[1].session_id,
+        sessions[2].session_id,
+    }
+
+
+@pytest.mark.django_db
+def test_run_daily_populates_new_kepost_outputs(tmp_path: Path, monkeypatch):
+    pytest.importorskip("bids")
+    pytest.importorskip("kepost")
+    monkeypatch.chdir(tmp_path)
+    sessions = make_cohort(n_subjects=2, with_behavioral=False)
+    qnap_path = tmp_path / "qnap"
+
+    def run_daily():
+        call_command(
+            "run_daily",
+            skip=[
+                "index_rawdata",
+                "update_database",
+                "update_derivatives",
+                "update_questionnaires",
+                "update_seca",
+            ],
+            qnap_path=str(qnap_path),
+            stdout=StringIO(),
+        )
+
+    make_kepost_tree(qnap_path, sessions[:1], n_regions=10)
+    run_daily()
+    assert set(Procedure.objects.values_list("session", flat=True)) == {sessions[0].pk}
+    # a kepost output lands on the QNAP while no session changed
+    make_kepost_tree(qnap_path, sessions[1:2], n_regions=10)
+    run_daily()
+    assert set(Procedure.objects.values_list("session", flat=True)) == {
+        sessions[0].pk,
+        sessions[1].pk,
+    }
+
+
+@pytest.mark.django_db
+def test_incremental_aggregation_drops_removed_outputs(tmp_path: Path):
+    pytest.importorskip("kepost")
+    from plasticityhub.utils.management.commands.aggregate_kepost_parcellations import (
+        aggregate_results,
+    )
+
+    (session,) = make_cohort(n_subjects=1, sessions_per_subject=1)
+    make_kepost_tree(tmp_path / "qnap", [session], n_regions=10, with_procedures=True)
+    destination = tmp_path / "aggregated"
+    aggregate_results(destination, overwrite=True)
+    assert list(destination.rglob("data.pkl"))
+    # the outputs were removed and the procedure re-parsed
+    procedure = Procedure.objects.get()
+    procedure.outputs = {}
+    procedure.save()
+    aggregate_results(destination, overwrite=False, procedure_ids={procedure.pk})
+    assert not list(destination.rglob("*.pkl"))
@@ -0,0 +1,47 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from plasticityhub.utils.management.commands.profile_startup import (
+    format_import_tree,
+    local_commands,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2000 |     pandas.core
+import time:      1500 |       3500 |   pandas
+import time:       500 |       4000 | plasticityhub.behavioral.questionnaire
+"""
+
+
+def test_parse_importtime():
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+    assert list(imports["module"]) == [
+        "_io",
+        "pandas.core",
+        "pandas",
+        "plasticityhub.behavioral.questionnaire",
+    ]
+    assert list(imports["depth"]) == [1, 2, 1, 0]
+    assert imports["cumulative_us"].iloc[-1] == 4000  # noqa: PLR2004
+
+
+def test_format_import_tree_applies_threshold():
+    tree = format_import_tree(parse_importtime(IMPORTTIME_OUTPUT), threshold_ms=3)
+    assert "  pandas" in tree
+    assert "pandas.core" not in tree
+    assert "_io" not in tree
+
+
+def test_local_commands():
+    commands = local_commands()
+    assert commands["profile_startup"] == "plasticityhub.utils"
+    assert "migrate" not in commands
+
+
+def test_startup_over_budget():
+    with pytest.raises(CommandError, match="django.setup"):
+        call_command("profile_startup", "--skip_commands", "--budget", "0")
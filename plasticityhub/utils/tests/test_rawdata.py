@@ -0,0 +1,53 @@
+import json
+import os
+from pathlib import Path
+
+from plasticityhub.utils.rawdata import index_rawdata, state_path_for
+
+
+def make_sessions(root: Path, *relative_paths: str):
+    for relative_path in relative_paths:
+        (root / relative_path).mkdir(parents=True)
+
+
+def test_index_rawdata_maps_session_directories(tmp_path: Path):
+    first, second = tmp_path / "prisma", tmp_path / "skyra"
+    make_sessions(
+        first,
+        "sub-0001/20240110_1030/dicom",
+        "sub-0002/20240111_0900",
+        "sub-0002/notes",
+    )
+    make_sessions(second, "20240110_1030", "20240201_1200")
+    output = tmp_path / "mapped_rawdata.json"
+    stats = index_rawdata([first, second, tmp_path / "unmounted"], output)
+    mapping = json.loads(output.read_text())
+    assert mapping == {
+        # the first root takes precedence
+        "20240110_1030": str(first / "sub-0001" / "20240110_1030"),
+        "20240111_0900": str(first / "sub-0002" / "20240111_0900"),
+        "20240201_1200": str(second / "20240201_1200"),
+    }
+    assert stats.sessions == 3  # noqa: PLR2004
+    assert state_path_for(output).exists()
+
+
+def test_unchanged_directories_are_not_listed_again(tmp_path: Path):
+    root = tmp_path / "prisma"
+    make_sessions(root, "sub-0001/20240110_1030", "sub-0002/20240111_0900")
+    output = tmp_path / "mapped_rawdata.json"
+    assert index_rawdata([root], output).scanned == 3  # noqa: PLR2004
+
+    stats = index_rawdata([root], output)
+    assert (stats.scanned, stats.reused) == (0, 3)
+
+    make_sessions(root, "sub-0002/20240301_0800")
+    # file systems may only update mtimes every few milliseconds
+    parent = root / "sub-0002"
+    mtime = parent.stat().st_mtime_ns + 10**9
+    os.utime(parent, ns=(mtime, mtime))
+    stats = index_rawdata([root], output)
+    assert (stats.scanned, stats.reused) == (1, 2)
+    assert "20240301_0800" in json.loads(output.read_text())
+
+    assert index_rawdata([root], output, full=True).scanned == 3  # noqa: PLR2004
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from plasticityhub.utils.sinks import (
+    DriveSink,
+    Exporter,
+    ExportSink,
+    LocalDirectorySink,
+    RsyncSink,
+    configured_sinks,
+)
+
+
+class FailingSink(ExportSink):
+    def __init__(self):
+        self.attempts = 0
+
+    def key(self) -> str:
+        return "failing"
+
+    def deliver(self, path: Path):
+        self.attempts += 1
+        raise OSError
+
+
+@pytest.fixture()
+def artifact(tmp_path: Path) -> Path:
+    path = tmp_path / "sessions.csv"
+    path.write_text("session_id\n20240101_1030\n")
+    return path
+
+
+def export(state: Path, artifact: Path, sinks: list, force=False) -> list[str]:
+    exporter = Exporter(state)
+    exporter.export(artifact, sinks, force=force)
+    return [delivery.status for delivery in exporter.close()]
+
+
+def test_unchanged_files_are_not_delivered_again(tmp_path: Path, artifact: Path):
+    state = tmp_path / "state.json"
+    sink = LocalDirectorySink(tmp_path / "out")
+    assert export(state, artifact, [sink]) == ["delivered"]
+    assert (tmp_path / "out" / "sessions.csv").read_text() == artifact.read_text()
+    assert export(state, artifact, [sink]) == ["unchanged"]
+    assert export(state, artifact, [sink], force=True) == ["delivered"]
+
+    artifact.write_text("session_id\n20240102_1030\n")
+    assert export(state, artifact, [sink]) == ["delivered"]
+    assert (tmp_path / "out" / "sessions.csv").read_text() == artifact.read_text()
+
+
+def test_failed_deliveries_are_retried(tmp_path: Path, artifact: Path):
+    state = tmp_path / "state.json"
+    failing = FailingSink()
+    sink = LocalDirectorySink(tmp_path / "out")
+    exporter = Exporter(state)
+    exporter.export(artifact, [failing, sink])
+    deliveries = exporter.close()
+    assert [delivery.status for delivery in deliveries] == ["failed", "delivered"]
+    assert isinstance(deliveries[0].error, OSError)
+
+    assert export(state, artifact, [failing, sink]) == ["unchanged", "failed"]
+    assert failing.attempts == 2  # noqa: PLR2004
+
+
+def test_configured_sinks():
+    assert configured_sinks() == []
+    sinks = configured_sinks("host:/data", "out", "folder", "user.json")
+    assert [type(sink) for sink in sinks] == [RsyncSink, DriveSink, LocalDirectorySink]
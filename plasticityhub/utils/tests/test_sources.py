@@ -0,0 +1,131 @@
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.commands.update_database_from_questionnaire import (
+    update_database_from_sheet,
+)
+from plasticityhub.utils.sources import (
+    LocalSheetSource,
+    SheetSnapshotCache,
+    fetch_all,
+    load_sheet,
+)
+
+
+class CountingSource(LocalSheetSource):
+    def __init__(self, path):
+        super().__init__(path)
+        self.fetches = 0
+
+    def fetch(self) -> pd.DataFrame:
+        self.fetches += 1
+        return super().fetch()
+
+
+def write_sheet(path: Path, weight: str, mtime_ns: int):
+    pd.DataFrame(
+        {
+            "Subject Code": ["0001"],
+            "Questionnaire": ["Yes"],
+            "QTimeStamp": ["01/05/2024"],
+            "Weight (kg)": [weight],
+        }
+    ).to_csv(path, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_local_source_reads_strings(tmp_path: Path):
+    path = tmp_path / "sheet.csv"
+    write_sheet(path, "", 1_000_000_000)
+    df = LocalSheetSource(path).fetch()
+    assert df.loc[0, "Subject Code"] == "0001"
+    assert df.loc[0, "Weight (kg)"] == ""
+
+
+def test_snapshot_is_refetched_only_when_the_revision_changes(tmp_path: Path):
+    path = tmp_path / "sheet.csv"
+    write_sheet(path, "70", 1_000_000_000)
+    source = CountingSource(path)
+    load_sheet(source, tmp_path / "snapshots")
+    df = load_sheet(source, tmp_path / "snapshots")
+    assert source.fetches == 1
+    assert df.loc[0, "Weight (kg)"] == "70"
+
+    write_sheet(path, "72", 2_000_000_000)
+    df = load_sheet(source, tmp_path / "snapshots")
+    assert source.fetches == 2  # noqa: PLR2004
+    assert df.loc[0, "Weight (kg)"] == "72"
+
+
+def test_offline_reads_the_snapshot(tmp_path: Path):
+    path = tmp_path / "sheet.csv"
+    write_sheet(path, "70", 1_000_000_000)
+    source = CountingSource(path)
+    with pytest.raises(FileNotFoundError):
+        load_sheet(source, tmp_path / "snapshots", offline=True)
+    load_sheet(source, tmp_path / "snapshots")
+    path.unlink()
+    df = load_sheet(source, tmp_path / "snapshots", offline=True)
+    assert df.loc[0, "Weight (kg)"] == "70"
+    assert source.fetches == 1
+    with pytest.raises(ValueError, match="snapshot directory"):
+        load_sheet(source, offline=True)
+
+
+def test_snapshot_metadata(tmp_path: Path):
+    path = tmp_path / "sheet.csv"
+    write_sheet(path, "70", 1_000_000_000)
+    source = LocalSheetSource(path)
+    cache = SheetSnapshotCache(tmp_path / "snapshots")
+    cache.load(source)
+    _, meta = cache.read(source)
+    assert meta == {"revision": "1000000000", "rows": 1}
+
+
+@pytest.mark.django_db
+def test_ingest_from_a_local_sheet(tmp_path: Path):
+    Subject.objects.create(
+        subject_id="000000001", subject_code="0001", name="Test Subject"
+    )
+    path = tmp_path / "sheet.csv"
+    write_sheet(path, "70", 1_000_000_000)
+    report = update_database_from_sheet(
+        None,
+        None,
+        None,
+        bulk=True,
+        source=LocalSheetSource(path),
+        snapshot_dir=tmp_path / "snapshots",
+    )
+    assert report.empty
+    response = QuestionnaireResponse.objects.with_full_response().get()
+    assert response.full_response["Weight (kg)"] == "70"
+
+
+def test_fetch_all_runs_concurrently():
+    def slow(value: str):
+        time.sleep(0.2)
+        return pd.DataFrame({"value": [value]})
+
+    start = time.perf_counter()
+    frames, timings = fetch_all({"a": lambda: slow("a"), "b": lambda: slow("b")})
+    elapsed = time.perf_counter() - start
+    assert frames["a"].loc[0, "value"] == "a"
+    assert frames["b"].loc[0, "value"] == "b"
+    assert set(timings) == {"a", "b"}
+    # bounded by the slowest source, not the sum
+    assert elapsed < 0.35  # noqa: PLR2004
+
+
+def test_fetch_all_propagates_errors():
+    def fail():
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        fetch_all({"ok": pd.DataFrame, "broken": fail})
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from plasticityhub.procedures.models import Procedure
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.commands.update_database import (
+    update_database_from_frame,
+)
+from plasticityhub.utils.management.commands.update_database_from_questionnaire import (
+    update_database_from_frame as update_questionnaires_from_frame,
+)
+from plasticityhub.utils.management.commands.update_database_from_seca import (
+    update_database_from_frame as update_seca_from_frame,
+)
+from plasticityhub.utils.rawdata import index_rawdata
+from plasticityhub.utils.tests.synthetic import make_rawdata_tree, make_sheets
+
+pytestmark = pytest.mark.django_db
+
+
+def test_synthetic_cohort(synthetic_cohort: list[Session]):
+    assert len(synthetic_cohort) == 8  # noqa: PLR2004
+    assert Subject.objects.count() == 4  # noqa: PLR2004
+    subject = synthetic_cohort[0].subject
+    assert subject.questionnaire_responses.count() == 2  # noqa: PLR2004
+    assert subject.seca_measurements.count() == 2  # noqa: PLR2004
+    assert all(session.age_at_scan for session in synthetic_cohort)
+
+
+def test_kepost_tree(kepost_tree: tuple):
+    qnap_path, sessions = kepost_tree
+    procedure = Procedure.objects.with_outputs().get(session=sessions[0])
+    parcellation = procedure.get(
+        {
+            "reconstruction_software": "mrtrix3",
+            "measure": "fa",
+            "atlas": "schaefer2018",
+            "den": "100",
+            "division": "7networks",
+        }
+    )
+    assert Path(parcellation).is_relative_to(qnap_path)
+    assert len(pd.read_pickle(parcellation)) == 10  # noqa: PLR2004
+    snr = procedure.get({"reconstruction_software": "qc", "desc": "snr"})
+    assert "snr" in pd.read_json(snr, orient="index").T
+    eddy = procedure.get({"reconstruction_software": "qc", "desc": "eddy"})
+    assert "qc_mot_abs" in pd.read_csv(eddy, index_col=0)
+
+
+def test_synthetic_sheets_are_ingested(tmp_path: Path):
+    sheets = make_sheets(n_subjects=3, sessions_per_subject=2)
+    mapped_rawdata_path = tmp_path / "mapped_rawdata.json"
+    mapped_rawdata_path.write_text(json.dumps({}))
+    rejected = update_database_from_frame(sheets.crf, mapped_rawdata_path)
+    assert rejected.empty
+    assert Session.objects.count() == 6  # noqa: PLR2004
+
+    make_rawdata_tree(tmp_path / "rawdata", Session.objects.all())
+    stats = index_rawdata([tmp_path / "rawdata"], mapped_rawdata_path)
+    assert stats.sessions == 6  # noqa: PLR2004
+
+    update_questionnaires_from_frame(sheets.questionnaires, bulk=True)
+    update_seca_from_frame(sheets.seca)
+    for session in Session.objects.all():
+        assert session.questionnaire_response_id is not None
+        assert session.seca_measurement_id is not None
@@ -0,0 +1,126 @@
+import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.commands.update_database import (
+    output_to_csv,
+    resolve_subjects,
+)
+from plasticityhub.utils.management.static.database_mapping import COLUMNS_MAPPING
+from plasticityhub.utils.normalization import normalize
+from plasticityhub.utils.tests.factories import QuestionnaireResponseFactory
+from plasticityhub.utils.tests.synthetic import make_cohort
+
+pytestmark = pytest.mark.django_db
+
+
+def make_sheet(*rows: dict) -> pd.DataFrame:
+    defaults = {
+        "Name": "jane doe",
+        "DOB": "1990-02-03",
+        "ID": "1",
+        "QCode": "1",
+        "Email": "",
+        "Cellular No.": "",
+        "Gender": "F",
+        "Height": "",
+        "Weight": "",
+        "Protocol": "learning",
+        "Study": "control",
+        "Group": "rest",
+        "Lab": "MRI",
+        "ScanTag": "",
+        "ScanID": "20240110_1030",
+        "Status": "",
+    }
+    clean, rejected = normalize(
+        pd.DataFrame([{**defaults, **row} for row in rows]),
+        COLUMNS_MAPPING,
+        key="scanid",
+    )
+    assert rejected.empty
+    return clean
+
+
+def test_new_subjects_take_the_latest_values():
+    sheet = make_sheet(
+        {"ScanID": "20240301_1030", "Weight": ""},
+        {"ScanID": "20240110_1030", "Weight": "60", "Height": "1.6"},
+        {"ScanID": "20240201_1030", "Weight": "62"},
+        {"ID": "2", "ScanID": "20240105_1030"},
+    )
+    subjects = resolve_subjects(sheet)
+    assert set(subjects) == {"000000001", "000000002"}
+    subject = Subject.objects.get(subject_id="000000001")
+    # the latest non-blank weight wins
+    assert subject.weight == 62  # noqa: PLR2004
+    assert subject.height == 160  # noqa: PLR2004
+    assert subject.date_of_birth == datetime.date(1990, 2, 3)
+    assert subject.subject_code == "0001"
+
+
+def test_older_rows_only_fill_blank_attributes():
+    subject = Subject.objects.create(
+        subject_id="000000001", subject_code="0001", name="Jane Doe", weight=65
+    )
+    Session.objects.create(subject=subject, origin_session_id="20240301_1030")
+    resolve_subjects(make_sheet({"Weight": "60", "Height": "1.6"}))
+    subject.refresh_from_db()
+    assert subject.weight == 65  # noqa: PLR2004
+    assert subject.height == 160  # noqa: PLR2004
+
+    resolve_subjects(make_sheet({"ScanID": "20240401_1030", "Weight": "60"}))
+    subject.refresh_from_db()
+    assert subject.weight == 60  # noqa: PLR2004
+
+
+def test_unchanged_subjects_are_not_written():
+    resolve_subjects(make_sheet({}))
+    with CaptureQueriesContext(connection) as queries:
+        subjects = resolve_subjects(make_sheet({}))
+    assert len(queries) == 1
+    assert subjects["000000001"].pk == Subject.objects.get().pk
+
+
+def test_date_of_birth_changes_refresh_the_sessions():
+    subject = Subject.objects.create(
+        subject_id="000000001",
+        subject_code="0001",
+        name="Jane Doe",
+        date_of_birth=datetime.date(1991, 2, 3),
+    )
+    session = Session.objects.create(subject=subject, origin_session_id="20240101_1030")
+    assert session.age_at_scan < 33  # noqa: PLR2004
+    resolve_subjects(make_sheet({"ScanID": "20240101_1030"}))
+    session.refresh_from_db()
+    assert session.age_at_scan > 33  # noqa: PLR2004
+
+
+def test_questionnaire_answers_are_exported_as_stored(tmp_path: Path):
+    (session,) = make_cohort(
+        n_subjects=1, sessions_per_subject=1, with_behavioral=False
+    )
+    QuestionnaireResponseFactory(
+        subject=session.subject,
+        full_response={
+            "Questionnaire": "Yes",
+            "PHQ9": "not a number",
+            "Depression": "maybe",
+            # mapped from "No" on ingest
+            "Twins": False,
+        },
+    )
+    # a later response of the same subject is not exported
+    QuestionnaireResponseFactory(subject=session.subject, full_response={"PHQ9": 3})
+    sessions = pd.read_csv(output_to_csv(tmp_path / "sessions.csv"), dtype=str)
+    row = sessions.iloc[0]
+    assert row["phq9"] == "not a number"
+    assert row["depression"] == "maybe"
+    assert row["twins"] == "False"
+    assert pd.isna(row["anxiety"])
@@ -0,0 +1,114 @@
+import datetime
+
+import pandas as pd
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from plasticityhub.behavioral.questionnaire import QuestionnaireResponse
+from plasticityhub.behavioral.wide import WideQuestionnaireResponse
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.commands.update_database_from_questionnaire import (
+    bulk_update_database,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def session() -> Session:
+    subject = Subject.objects.create(
+        subject_id="000000001", subject_code="0001", name="Test Subject"
+    )
+    return Session.objects.create(subject=subject, origin_session_id="20240110_1030")
+
+
+def make_sheet(**overrides) -> pd.DataFrame:
+    row = {
+        "Subject Code": "0001",
+        "Questionnaire": "Yes",
+        "QTimeStamp": "01/05/2024",
+        "Weight (kg)": "70",
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def test_bulk_update_links_sessions(session: Session):
+    bulk_update_database(make_sheet())
+    session.refresh_from_db()
+    response = QuestionnaireResponse.objects.get()
+    assert session.questionnaire_response == response
+    assert session.time_between_scan_and_questionnaire.days == 5  # noqa: PLR2004
+
+
+def test_bulk_update_upserts_in_place(session: Session):
+    bulk_update_database(make_sheet())
+    response = QuestionnaireResponse.objects.get()
+    bulk_update_database(make_sheet(**{"Weight (kg)": "72"}))
+    updated = QuestionnaireResponse.objects.get()
+    assert updated.pk == response.pk
+    assert updated.full_response["Weight (kg)"] == "72"
+
+
+def test_bulk_update_removes_stale_responses_but_keeps_sessions(session: Session):
+    bulk_update_database(make_sheet())
+    bulk_update_database(make_sheet(Questionnaire="No"))
+    assert not QuestionnaireResponse.objects.exists()
+    session.refresh_from_db()
+    assert session.questionnaire_response is None
+
+
+def test_bulk_update_skips_unknown_subjects(session: Session):
+    report = bulk_update_database(make_sheet(**{"Subject Code": "9999"}))
+    assert not QuestionnaireResponse.objects.exists()
+    assert report["reason"].tolist() == ["unmatched"]
+
+
+def test_bulk_update_links_the_nearest_response(session: Session):
+    sheet = pd.concat(
+        [make_sheet(QTimeStamp="01/01/2024"), make_sheet(QTimeStamp="01/12/2024")]
+    )
+    bulk_update_database(sheet.reset_index(drop=True))
+    session.refresh_from_db()
+    assert session.questionnaire_response.full_response["QTimeStamp"] == "01/12/2024"
+    assert session.time_between_scan_and_questionnaire.days == -2  # noqa: PLR2004
+
+
+def test_bulk_update_respects_the_tolerance(session: Session):
+    bulk_update_database(make_sheet(), tolerance=datetime.timedelta(days=3))
+    session.refresh_from_db()
+    assert session.questionnaire_response is None
+    assert session.time_between_scan_and_questionnaire is None
+
+
+def test_bulk_update_refreshes_the_wide_table(session: Session):
+    bulk_update_database(make_sheet(Depression=True, Gender="F", PHQ9="not a number"))
+    wide = WideQuestionnaireResponse.objects.get()
+    assert wide.response == QuestionnaireResponse.objects.get()
+    assert wide.subject == session.subject
+    assert wide.weight == 70.0  # noqa: PLR2004
+    assert wide.depression is True
+    assert wide.sex == "F"
+    assert wide.phq9 is None
+    assert timezone.localtime(wide.timestamp).date() == datetime.date(2024, 1, 5)
+
+    bulk_update_database(make_sheet(**{"Weight (kg)": "72"}))
+    assert WideQuestionnaireResponse.objects.get().weight == 72.0  # noqa: PLR2004
+    bulk_update_database(make_sheet(Questionnaire="No"))
+    assert not WideQuestionnaireResponse.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migrations_populate_the_wide_table(session: Session):
+    bulk_update_database(make_sheet(Depression=True))
+    # responses stored before the wide table existed
+    call_command("migrate", "behavioral", "0007", verbosity=0)
+    WideQuestionnaireResponse.objects.all().delete()
+    call_command("migrate", "behavioral", verbosity=0)
+    wide = WideQuestionnaireResponse.objects.get()
+    assert wide.response == QuestionnaireResponse.objects.get()
+    assert wide.weight == 70.0  # noqa: PLR2004
+    assert wide.depression is True
+    assert wide.twins == ""
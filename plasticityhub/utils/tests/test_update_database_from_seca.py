@@ -0,0 +1,71 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from plasticityhub.behavioral.seca import SECAMeasurement
+from plasticityhub.scans.models import Session
+from plasticityhub.subjects.models import Subject
+from plasticityhub.utils.management.commands.update_database_from_seca import (
+    assign_measurements,
+    match_sessions,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def session() -> Session:
+    subject = Subject.objects.create(
+        subject_id="000000001",
+        name="Test Subject",
+        date_of_birth=datetime.date(1990, 2, 3),
+        sex="M",
+    )
+    return Session.objects.create(subject=subject, origin_session_id="20240110_1030")
+
+
+def test_match_sessions(session: Session):
+    seca_df = pd.DataFrame(
+        {
+            "timestamp": ["10/01/2024", "11/01/2024"],
+            "date of birth": ["03/02/1990", "03/02/1990"],
+            "gender": ["Male", "Male"],
+        }
+    )
+    matched, report = match_sessions(seca_df)
+    assert matched.index.tolist() == [0]
+    assert matched["session_pk"].tolist() == [session.pk]
+    assert matched["subject_pk"].tolist() == [session.subject_id]
+    assert report["reason"].tolist() == ["unmatched"]
+
+
+def make_measurement(subject: Subject, timestamp: str) -> SECAMeasurement:
+    return SECAMeasurement.objects.create(
+        subject=subject,
+        full_measurement={
+            "timestamp": timestamp,
+            "date of birth": "03/02/1990",
+            "gender": "male",
+            "bmi": "22",
+            "weight": "70",
+            "height": "178",
+        },
+    )
+
+
+def test_assign_measurements_picks_the_nearest(session: Session):
+    later = Session.objects.create(
+        subject=session.subject, origin_session_id="20240301_0900"
+    )
+    make_measurement(session.subject, "01/01/2024")
+    closest = make_measurement(session.subject, "12/01/2024")
+    latest = make_measurement(session.subject, "20/02/2024")
+    assert assign_measurements([session.subject_id]) == 2  # noqa: PLR2004
+    session.refresh_from_db()
+    later.refresh_from_db()
+    assert session.seca_measurement == closest
+    assert session.time_between_scan_and_seca == (session.timestamp - closest.timestamp)
+    assert later.seca_measurement == latest
+    # a second pass finds nothing to change
+    assert assign_measurements([session.subject_id]) == 0
@@ -0,0 +1,113 @@
+import datetime
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+from plasticityhub.utils.management.commands.update_database_from_crf_file import (
+    iter_crf_batches,
+)
+from plasticityhub.utils.workbooks import prefetch, read_workbook_batches
+
+CRF_HEADER = [
+    "Name",
+    "DOB",
+    "ID",
+    "Gender",
+    "Protocol",
+    "Study",
+    "Group",
+    "Lab",
+    "ScanTag",
+    "QCode",
+    "ScanID",
+]
+
+
+def write_workbook(path: Path, rows: list):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(CRF_HEADER)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def crf_row(scan_id, qcode=1):
+    return [
+        "jane doe",
+        datetime.datetime(1990, 2, 3),  # noqa: DTZ001
+        12345,
+        "female",
+        "learning",
+        "control",
+        "rest",
+        "MRI",
+        "T1",
+        qcode,
+        scan_id,
+    ]
+
+
+def test_read_workbook_batches(tmp_path: Path):
+    path = tmp_path / "crf.xlsx"
+    write_workbook(path, [crf_row(f"2024010{i}_1030") for i in range(5)])
+    batches = list(read_workbook_batches(path, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[1].index.tolist() == [2, 3]
+    assert batches[0].columns.tolist() == CRF_HEADER
+    # cells keep their types
+    assert batches[0].loc[0, "ID"] == 12345  # noqa: PLR2004
+    assert isinstance(batches[0].loc[0, "DOB"], datetime.datetime)
+
+
+def test_crf_batches_are_deduplicated_across_batches(tmp_path: Path):
+    path = tmp_path / "crf.xlsx"
+    write_workbook(
+        path,
+        [
+            crf_row("20240101_1030"),
+            crf_row("20240102_1030"),
+            crf_row("20240101_1030", qcode=2),
+            crf_row(None),
+        ],
+    )
+    batches = list(iter_crf_batches(path, 2))
+    rows = [row for batch, _ in batches for _, row in batch.iterrows()]
+    assert [row["scanid"] for row in rows] == ["20240101_1030", "20240102_1030"]
+    rejected = batches[1][1]
+    assert rejected["row"].tolist() == [2, 3]
+    assert rejected["reason"].tolist() == ["duplicate scanid", "missing scanid"]
+    assert rows[0]["qcode"] == "0001"
+    assert rows[0]["id"] == "000012345"
+    assert rows[0]["gender"] == "F"
+    assert rows[0]["name"] == "Jane Doe"
+
+
+def test_prefetch_keeps_order():
+    assert list(prefetch(iter(range(10)), size=2)) == list(range(10))
+
+
+def test_prefetch_reraises_producer_errors():
+    def produce():
+        yield 1
+        raise ValueError
+
+    items = prefetch(produce())
+    assert next(items) == 1
+    with pytest.raises(ValueError):  # noqa: PT011
+        next(items)
+
+
+def test_prefetch_stops_the_producer_early():
+    produced = []
+
+    def produce():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = prefetch(produce(), size=1)
+    assert next(items) == 0
+    items.close()
+    assert len(produced) < 100  # noqa: PLR2004
@@ -0,0 +1,122 @@
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import openpyxl
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 500
+_DONE = object()
+
+
+def read_workbook_batches(
+    path: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sheet_name: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the rows of an Excel worksheet in batches, without loading the whole
+    workbook into memory (openpyxl's read-only mode parses the sheet lazily).
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        The path to the workbook.
+    batch_size : int
+        The number of rows per batch.
+    sheet_name : str, optional
+        The worksheet to read (defaults to the first one).
+
+    Yields
+    ------
+    pd.DataFrame
+        The rows, with the first row of the sheet as the columns, cells typed
+        by openpyxl (e.g. dates as datetimes) and the (0-based) position of the
+        row below the header as the index.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(cell) if cell is not None else "" for cell in header]
+        batch: list = []
+        start = 0
+        for row in rows:
+            # read-only sheets may report trailing blank rows
+            if all(cell is None for cell in row):
+                continue
+            batch.append(row[: len(columns)])
+            if len(batch) == batch_size:
+                yield _to_frame(batch, columns, start)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield _to_frame(batch, columns, start)
+    finally:
+        workbook.close()
+
+
+def _to_frame(rows: list, columns: list[str], start: int) -> pd.DataFrame:
+    return pd.DataFrame.from_records(
+        rows, columns=columns, index=range(start, start + len(rows))
+    )
+
+
+def prefetch(items: Iterable, size: int = 2) -> Iterator:
+    """
+    Consume an iterable in a background thread, up to ``size`` items ahead,
+    so producing the items (e.g. parsing a workbook) overlaps with using them
+    (e.g. writing them to the database).
+
+    Parameters
+    ----------
+    items : Iterable
+        The items, produced in the background thread.
+    size : int
+        The maximal number of items produced ahead.
+
+    Yields
+    ------
+    Any
+        The items, in order. Errors raised by the producer are re-raised.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except Exception as e:  # noqa: BLE001
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # stop the producer if the consumer stopped early
+        stop.set()
+        producer.join()
@@ -6,20 +6,12 @@ from crontab import CronTab
 print("Changing directory to the project root...")
 os.chdir("/home/galkepler/Projects/plasticityhub")
 
-# update the database
-print("Updating the database...")
+# re-parse and re-aggregate every procedure, overwriting the existing ones
+# (the nightly daily.sh only handles the procedures whose sessions or kepost
+# outputs changed, and runs the ingest and exports skipped here)
+print("Re-parsing all the procedures...")
 os.system(
-    "/home/galkepler/Projects/plasticityhub/.venv/bin/python manage.py update_database"
-)
-
-# populate the procedures
-print("Populating procedures...")
-os.system(
-    "/home/galkepler/Projects/plasticityhub/.venv/bin/python manage.py populate_procedures --overwrite"
-)
-
-# aggregate kepost procedures
-print("Aggregating KePost procedures...")
-os.system(
-    "/home/galkepler/Projects/plasticityhub/.venv/bin/python manage.py aggregate_kepost_parcellations --destination /media/storage/yalab-dev/plasticityhub --metrics adc --overwrite"
+    "/home/galkepler/Projects/plasticityhub/.venv/bin/python manage.py run_daily --full --overwrite"
+    " --skip index_rawdata update_database update_derivatives update_questionnaires update_seca probe_kepost"
+    " --destination /media/storage/yalab-dev/plasticityhub"
 )